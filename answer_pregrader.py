@@ -0,0 +1,266 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script answer_pregrader.py
+==========================
+Pré-avaliação local das respostas, antes da crew do `answer_evaluator`.
+
+Respostas como "não sei", uma transcrição vazia ou um texto sem relação com a pergunta
+custavam uma avaliação completa do LLM. Aqui a resposta é comparada com a
+`correct_answer` por TF-IDF e similaridade de cosseno (NumPy), e também pela cobertura
+dos pontos chave (as frases da resposta correta) e dos termos. Só os casos claramente
+negativos recebem na hora um feedback de modelo fixo:
+
+- vazia ou "não sei": sem conteúdo para avaliar;
+- fora do tema: nenhuma relação com a pergunta nem com a resposta correta.
+
+Sobreposição de palavras não basta para dizer que uma resposta está certa: a mesma
+resposta com todas as frases negadas cobre os mesmos termos. Por isso as respostas que
+parecem fortes (cobrem quase todos os pontos chave com alta similaridade) recebem o
+veredito `strong` só como métrica e seguem para o LLM, como as ambíguas. Os limiares e a
+taxa de avaliações que dispensaram o LLM ficam em `get_pregrader_stats()`, e cada
+pré-avaliação vira um span `pre_grading` com o veredito.
+
+Configuração
+------------
+PREGRADER_ENABLED: "false" manda todas as respostas para o LLM (padrão: true)
+PREGRADER_OFF_TOPIC_SIMILARITY: similaridade máxima de uma resposta fora do tema (padrão: 0.05)
+PREGRADER_STRONG_SIMILARITY: similaridade mínima de uma resposta forte, só métrica (padrão: 0.6)
+PREGRADER_STRONG_COVERAGE: fração mínima de pontos chave cobertos numa resposta forte, só métrica (padrão: 0.8)
+PREGRADER_KEY_POINT_MATCH: fração dos termos de um ponto chave que a resposta precisa citar (padrão: 0.5)
+"""
+
+import os
+import re
+import threading
+import time
+import unicodedata
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from instrumentation import record_span
+
+# Termos são reduzidos a este prefixo: "regularização" e "regularizar" viram "regula".
+STEM_PREFIX = 6
+# Uma resposta com "não sei" e menos termos que isto ainda é só "não sei":
+MIN_CONTENT_TERMS = 3
+# Frases da resposta correta com menos termos que isto não viram pontos chave:
+MIN_KEY_POINT_TERMS = 2
+
+# Palavras vazias em português e inglês, já sem acentos:
+STOPWORDS = frozenset(
+    """
+    a o os as um uma uns umas de do da dos das em no na nos nas por pelo pela pelos pelas para pra com sem
+    que e ou nem mas se ao aos como mais menos muito muita muitos muitas seu sua seus suas ele ela eles elas
+    isso isto esse essa esses essas este esta estes estas aquele aquela ser sao era foi sera esta estao tem
+    ter ha entao tambem ja quando onde qual quais porque pois sobre entre ate eu voce nos me te lhe the of
+    and or to in is are was be been for on with it this that these those by an as at from not no yes
+    """.split()
+)
+# Marcadores de negação (sem acentos): invertem o sentido da frase e não podem ser ignorados.
+NEGATIONS = frozenset("nao nunca nem sem jamais nenhum nenhuma nada not no never none without".split())
+# Expressões de quem não sabe responder (sem acentos, em minúsculas):
+DONT_KNOW = re.compile(
+    r"\b(nao sei|nao faco ideia|nao tenho ideia|sem ideia|nao lembro|nao conheco|i don ?t know|no idea|idk)\b"
+)
+# Vereditos que dispensam o LLM (todos negativos):
+NO_LLM_VERDICTS = ("empty", "dont_know", "off_topic")
+_WORD = re.compile(r"\w+")
+_SENTENCE_END = re.compile(r"[.;:!?\n]+")
+
+
+@dataclass(frozen=True)
+class PreGraderSettings:
+    """Limiares da pré-avaliação (similaridade e coberturas vão de 0 a 1)."""
+
+    enabled: bool = True
+    off_topic_similarity: float = 0.05
+    strong_similarity: float = 0.6
+    strong_coverage: float = 0.8
+    key_point_match: float = 0.5
+
+    @classmethod
+    def from_env(cls) -> "PreGraderSettings":
+        return cls(
+            enabled=os.getenv("PREGRADER_ENABLED", "true").lower() != "false",
+            off_topic_similarity=float(os.getenv("PREGRADER_OFF_TOPIC_SIMILARITY", cls.off_topic_similarity)),
+            strong_similarity=float(os.getenv("PREGRADER_STRONG_SIMILARITY", cls.strong_similarity)),
+            strong_coverage=float(os.getenv("PREGRADER_STRONG_COVERAGE", cls.strong_coverage)),
+            key_point_match=float(os.getenv("PREGRADER_KEY_POINT_MATCH", cls.key_point_match)),
+        )
+
+
+@dataclass
+class PreGrade:
+    """Resultado da pré-avaliação; `feedback` é None quando a resposta precisa do LLM (ambígua ou forte)."""
+
+    verdict: str
+    similarity: float = 0.0
+    term_coverage: float = 0.0
+    key_point_coverage: float = 0.0
+    feedback: str | None = None
+
+
+def normalize_text(text: str) -> str:
+    """Minúsculas e sem acentos: "Regularização" == "regularizacao"."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> list[str]:
+    """Termos de conteúdo do texto, normalizados e reduzidos ao prefixo."""
+    return [word[:STEM_PREFIX] for word in _WORD.findall(normalize_text(text)) if word not in STOPWORDS]
+
+
+def key_points(correct_answer: str) -> list[str]:
+    """Frases da resposta correta com conteúdo suficiente para contarem como pontos chave."""
+    sentences = (sentence.strip() for sentence in _SENTENCE_END.split(correct_answer))
+    points = [sentence for sentence in sentences if len(tokenize(sentence)) >= MIN_KEY_POINT_TERMS]
+    return points or [correct_answer.strip()]
+
+
+def tfidf_matrix(documents: list[list[str]]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Contagens e IDF suavizado dos documentos já tokenizados.
+
+    Returns:
+        tuple: (contagens documento x termo, idf por termo)
+    """
+    vocabulary: dict[str, int] = {}
+    rows, columns = [], []
+    for row, terms in enumerate(documents):
+        for term in terms:
+            rows.append(row)
+            columns.append(vocabulary.setdefault(term, len(vocabulary)))
+    counts = np.zeros((len(documents), len(vocabulary)))
+    np.add.at(counts, (rows, columns), 1.0)
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1.0
+    return counts, idf
+
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+    norm = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(a @ b / norm) if norm else 0.0
+
+
+class PreGrader:
+    """Pontua a resposta contra a resposta correta e decide se o LLM é necessário."""
+
+    def __init__(self, settings: PreGraderSettings | None = None):
+        self.settings = settings or PreGraderSettings()
+        self._lock = threading.Lock()
+        self._verdicts = dict.fromkeys(("empty", "dont_know", "off_topic", "strong", "ambiguous"), 0)
+
+    def grade(self, question: str, user_answer: str, correct_answer: str) -> PreGrade:
+        start = time.perf_counter()
+        result = self._grade(question, user_answer, correct_answer)
+        with self._lock:
+            self._verdicts[result.verdict] += 1
+        record_span(
+            "pre_grading",
+            time.perf_counter() - start,
+            verdict=result.verdict,
+            similarity=round(result.similarity, 3),
+            key_point_coverage=round(result.key_point_coverage, 3),
+        )
+        return result
+
+    def _grade(self, question: str, user_answer: str, correct_answer: str) -> PreGrade:
+        if not self.settings.enabled:
+            return PreGrade("ambiguous")
+        points = key_points(correct_answer)
+        answer_terms = tokenize(user_answer)
+        if not answer_terms:
+            return PreGrade("empty", feedback=_no_answer_feedback(points, "Não houve resposta para avaliar."))
+        normalized = normalize_text(user_answer)
+        if DONT_KNOW.search(normalized) and len(tokenize(DONT_KNOW.sub(" ", normalized))) < MIN_CONTENT_TERMS:
+            return PreGrade(
+                "dont_know", feedback=_no_answer_feedback(points, "O candidato indicou que não sabe a resposta.")
+            )
+
+        # Documentos: os pontos chave, a pergunta e a resposta do candidato (a última linha).
+        counts, idf = tfidf_matrix([*(tokenize(point) for point in points), tokenize(question), answer_terms])
+        weights = counts * idf
+        point_weights, question_weights, answer_weights = weights[: len(points)], weights[-2], weights[-1]
+        reference = point_weights.sum(axis=0)
+        answered = counts[-1] > 0
+
+        similarity = _cosine(answer_weights, reference)
+        term_coverage = float(reference[answered].sum() / reference.sum()) if reference.any() else 0.0
+        point_totals = point_weights.sum(axis=1)
+        point_coverage = point_weights[:, answered].sum(axis=1) / np.where(point_totals > 0, point_totals, 1.0)
+        covered = point_coverage >= self.settings.key_point_match
+        key_point_coverage = float(covered.mean())
+        scores = {"similarity": similarity, "term_coverage": term_coverage, "key_point_coverage": key_point_coverage}
+
+        mentions_question = bool(question_weights[answered].any())
+        if similarity <= self.settings.off_topic_similarity and not mentions_question:
+            feedback = _no_answer_feedback(points, "A resposta não trata do tema da pergunta.")
+            return PreGrade("off_topic", **scores, feedback=feedback)
+        if key_point_coverage >= self.settings.strong_coverage and similarity >= self.settings.strong_similarity:
+            return PreGrade("strong", **scores)
+        return PreGrade("ambiguous", **scores)
+
+    def stats(self) -> dict:
+        with self._lock:
+            verdicts = dict(self._verdicts)
+        graded = sum(verdicts.values())
+        skipped = sum(verdicts[verdict] for verdict in NO_LLM_VERDICTS)
+        return {
+            "graded": graded,
+            "llm_skipped": skipped,
+            "llm_skip_rate": round(skipped / graded, 3) if graded else 0.0,
+            "verdicts": verdicts,
+            "thresholds": asdict(self.settings),
+        }
+
+    def prometheus_snapshot(self) -> str:
+        """Vereditos, taxa de dispensa do LLM e limiares no formato de texto do Prometheus."""
+        stats = self.stats()
+        lines = [
+            "# HELP interview_pregrader_verdicts_total Respostas pré-avaliadas por veredito",
+            "# TYPE interview_pregrader_verdicts_total counter",
+            *(f'interview_pregrader_verdicts_total{{verdict="{v}"}} {n}' for v, n in stats["verdicts"].items()),
+            "# HELP interview_pregrader_llm_skip_ratio Fração das respostas avaliadas sem o LLM",
+            "# TYPE interview_pregrader_llm_skip_ratio gauge",
+            f"interview_pregrader_llm_skip_ratio {stats['llm_skip_rate']:g}",
+            "# HELP interview_pregrader_threshold Limiares da pré-avaliação",
+            "# TYPE interview_pregrader_threshold gauge",
+        ]
+        for name, value in stats["thresholds"].items():
+            if name != "enabled":
+                lines.append(f'interview_pregrader_threshold{{name="{name}"}} {value:g}')
+        return "\n".join(lines) + "\n"
+
+
+def _no_answer_feedback(points: list[str], reason: str) -> str:
+    missing = "\n".join(f"   - {point}" for point in points)
+    return (
+        "1. A resposta é correta? Não\n"
+        f"2. Pontos chave faltantes:\n{missing}\n"
+        f"3. Explicação: {reason} Revise os pontos acima, que compõem a resposta esperada."
+    )
+
+
+_pre_grader: PreGrader | None = None
+_state_lock = threading.Lock()
+
+
+def get_pre_grader() -> PreGrader:
+    global _pre_grader  # noqa: PLW0603
+    with _state_lock:
+        if _pre_grader is None:
+            _pre_grader = PreGrader(PreGraderSettings.from_env())
+        return _pre_grader
+
+
+def pre_grade_answer(question: str, user_answer: str, correct_answer: str) -> PreGrade:
+    """Pré-avalia a resposta com o pré-avaliador do processo."""
+    return get_pre_grader().grade(question, user_answer, correct_answer)
+
+
+def get_pregrader_stats() -> dict:
+    return get_pre_grader().stats()
@@ -0,0 +1,137 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script audio_decoding.py
+========================
+Decodifica o áudio gravado pelo `mic_recorder` diretamente em memória.
+
+O Whisper espera um array NumPy float32 mono a 16 kHz. Em vez de gravar os bytes
+num arquivo temporário e deixar o Whisper abrir um subprocesso do FFmpeg para lê-lo
+de novo, convertemos o WAV PCM em memória com o módulo `wave` e um reamostrador
+vetorizado. O FFmpeg só é usado (via pipes, sem arquivo temporário) para formatos
+que não conseguimos decodificar aqui, como webm/ogg.
+"""
+
+import io
+import subprocess
+import wave
+
+import numpy as np
+
+# Taxa de amostragem esperada pelo Whisper (whisper.audio.SAMPLE_RATE):
+WHISPER_SAMPLE_RATE = 16000
+
+
+class UnsupportedAudioFormatError(ValueError):
+    """O áudio não é um WAV PCM que possamos decodificar sem o FFmpeg."""
+
+
+def decode_audio_bytes(audio_bytes: bytes, sample_rate: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """
+    Converte os bytes gravados num array float32 mono na taxa `sample_rate`.
+
+    Args:
+        audio_bytes: Bytes do áudio gravado (WAV PCM ou qualquer formato suportado pelo FFmpeg)
+        sample_rate: Taxa de amostragem de saída
+
+    Returns:
+        np.ndarray: Amostras float32 no intervalo [-1, 1]
+    """
+    try:
+        return _decode_wav(audio_bytes, sample_rate)
+    except UnsupportedAudioFormatError:
+        # webm/ogg/WAV float etc.: o FFmpeg continua sendo o fallback.
+        return _decode_with_ffmpeg(audio_bytes, sample_rate)
+
+
+def resample_audio(samples: np.ndarray, orig_sr: int, target_sr: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """
+    Reamostra um sinal mono de forma vetorizada.
+
+    Quando a taxa original é múltiplo inteiro da taxa de destino (48 kHz -> 16 kHz),
+    fazemos a média de blocos, que já funciona como filtro passa-baixa. Nos demais casos
+    (44,1 kHz -> 16 kHz) aplicamos uma média móvel antes da interpolação linear para
+    reduzir o aliasing.
+    """
+    samples = samples.astype(np.float32, copy=False)
+    if orig_sr == target_sr or samples.size == 0:
+        return samples
+
+    if orig_sr > target_sr and orig_sr % target_sr == 0:
+        factor = orig_sr // target_sr
+        usable = samples.size - samples.size % factor
+        return samples[:usable].reshape(-1, factor).mean(axis=1, dtype=np.float32)
+
+    if orig_sr > target_sr:
+        width = int(np.ceil(orig_sr / target_sr))
+        kernel = np.full(width, 1.0 / width, dtype=np.float32)
+        samples = np.convolve(samples, kernel, mode="same")
+
+    num_output = round(samples.size * target_sr / orig_sr)
+    positions = np.arange(num_output, dtype=np.float64) * (orig_sr / target_sr)
+    return np.interp(positions, np.arange(samples.size), samples).astype(np.float32)
+
+
+def _decode_wav(audio_bytes: bytes, sample_rate: int) -> np.ndarray:
+    if not audio_bytes.startswith(b"RIFF"):
+        raise UnsupportedAudioFormatError("O áudio não está no formato WAV")
+    try:
+        with wave.open(io.BytesIO(audio_bytes)) as wav:
+            channels = wav.getnchannels()
+            sample_width = wav.getsampwidth()
+            orig_sr = wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError) as e:
+        # O módulo `wave` só entende PCM inteiro; WAV float (formato 3) vai para o FFmpeg.
+        raise UnsupportedAudioFormatError(str(e)) from e
+
+    samples = _pcm_to_float32(frames, sample_width)
+    if channels > 1:
+        usable = samples.size - samples.size % channels
+        samples = samples[:usable].reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    return resample_audio(samples, orig_sr, sample_rate)
+
+
+def _pcm_to_float32(frames: bytes, sample_width: int) -> np.ndarray:
+    """Converte amostras PCM inteiras little-endian em float32 no intervalo [-1, 1]."""
+    match sample_width:
+        case 1:  # PCM 8 bits é sem sinal
+            return (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+        case 2:
+            return np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+        case 3:
+            usable = len(frames) - len(frames) % 3
+            raw = np.frombuffer(frames[:usable], dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+            # Monta o inteiro de 24 bits e estende o sinal deslocando para os bits mais altos.
+            values = (raw[:, 0] << 8) | (raw[:, 1] << 16) | (raw[:, 2] << 24)
+            return (values >> 8).astype(np.float32) / 8388608.0
+        case 4:
+            return np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648.0
+    raise UnsupportedAudioFormatError(f"Largura de amostra não suportada: {sample_width} bytes")
+
+
+def _decode_with_ffmpeg(audio_bytes: bytes, sample_rate: int) -> np.ndarray:
+    """Decodifica com o FFmpeg lendo do stdin e escrevendo PCM no stdout (sem arquivo temporário)."""
+    cmd = [
+        "ffmpeg",
+        "-nostdin",
+        "-threads",
+        "0",
+        "-i",
+        "pipe:0",
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-acodec",
+        "pcm_s16le",
+        "-ar",
+        str(sample_rate),
+        "pipe:1",
+    ]
+    try:
+        output = subprocess.run(cmd, input=audio_bytes, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Falha ao decodificar o áudio com o FFmpeg: {e.stderr.decode(errors='replace')}") from e
+    return np.frombuffer(output, dtype=np.int16).astype(np.float32) / 32768.0
@@ -0,0 +1,191 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script batch_evaluation.py
+==========================
+Avaliação em lote de muitos pares pergunta/resposta (reavaliar sessões gravadas,
+conjuntos de benchmark etc.).
+
+Em vez de chamar `evaluate_answer` num laço sequencial, as avaliações rodam em paralelo
+com um limite de concorrência, um limitador de requisições por minuto e novas tentativas
+com backoff exponencial quando o provedor devolve erro de rate limit. Cada avaliação
+passa pelo mesmo caminho da interface e do serviço: pré-avaliação local e cache de
+avaliações e, só então, a etapa "evaluation" de `llm_tiers.run_stage` (prazo, modelo
+reserva e cópia em paralelo). Os resultados são devolvidos em streaming, na mesma ordem
+da entrada.
+
+Run
+---
+uv run batch_evaluation.py entrada.jsonl saida.jsonl --concurrency 8 --rpm 60
+
+Cada linha de entrada é um JSON com "question", "user_answer" e "correct_answer".
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import asdict, dataclass
+
+from interview_practice_system import create_evaluation_crew, evaluate_without_llm
+from llm_tiers import run_stage_async
+
+HTTP_TOO_MANY_REQUESTS = 429
+
+
+@dataclass
+class BatchEvaluationResult:
+    """
+    Resultado de uma avaliação do lote.
+
+    `evaluation` é None quando todas as tentativas falharam; `attempts` é 0 quando a
+    avaliação veio da pré-avaliação local ou do cache, sem chamar o LLM.
+    """
+
+    index: int
+    question: str
+    user_answer: str
+    evaluation: str | None
+    error: str | None
+    seconds: float
+    attempts: int
+
+
+class RequestRateLimiter:
+    """Espaça as requisições para no máximo `requests_per_minute` (compartilhado pelas tarefas)."""
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Reconhece erros de rate limit sem depender da biblioteca do provedor (litellm, openai...).
+
+    Usa o status HTTP do erro ou o nome do tipo, não o texto da mensagem: um "429" na
+    mensagem pode ser uma contagem de tokens ou um id.
+    """
+    return getattr(error, "status_code", None) == HTTP_TOO_MANY_REQUESTS or "ratelimit" in type(error).__name__.lower()
+
+
+async def _evaluate_one(
+    index: int,
+    item: tuple[str, str, str],
+    limiter: RequestRateLimiter | None,
+    max_retries: int,
+    backoff_seconds: float,
+) -> BatchEvaluationResult:
+    question, user_answer, correct_answer = item
+    start = time.perf_counter()
+    local_evaluation = evaluate_without_llm(question, user_answer, correct_answer)
+    if local_evaluation is not None:
+        # Caso claro (vazia, "não sei", fora do tema) ou resposta quase igual já avaliada.
+        return BatchEvaluationResult(
+            index, question, user_answer, local_evaluation, None, time.perf_counter() - start, 0
+        )
+    error = None
+    for attempt in range(1, max_retries + 2):
+        if limiter is not None:
+            await limiter.acquire()
+        try:
+            # `run_stage` roda a crew numa cópia: os agentes não são seguros para uso concorrente.
+            crew = create_evaluation_crew(question, user_answer, correct_answer)
+            result = await run_stage_async("evaluation", crew, batch=True, retry=attempt)
+            return BatchEvaluationResult(
+                index, question, user_answer, result.raw, None, time.perf_counter() - start, attempt
+            )
+        except Exception as e:
+            error = e
+            if not is_rate_limit_error(e) or attempt > max_retries:
+                break
+            # Backoff exponencial com jitter para não sincronizar as novas tentativas:
+            await asyncio.sleep(backoff_seconds * 2 ** (attempt - 1) * (1 + random.random()))
+    return BatchEvaluationResult(
+        index, question, user_answer, None, f"{type(error).__name__}: {error}", time.perf_counter() - start, attempt
+    )
+
+
+async def evaluate_answers_batch(
+    items: Iterable[tuple[str, str, str]],
+    concurrency: int = 8,
+    requests_per_minute: float | None = None,
+    max_retries: int = 3,
+    backoff_seconds: float = 2.0,
+) -> AsyncIterator[BatchEvaluationResult]:
+    """
+    Avalia triplas (pergunta, resposta do usuário, resposta correta) em paralelo.
+
+    A entrada é consumida aos poucos: no máximo `2 * concurrency` avaliações ficam em
+    andamento ou aguardando a vez de serem devolvidas, então o lote pode ser arbitrariamente
+    grande. Os resultados saem na ordem da entrada assim que cada um (e os anteriores) termina.
+
+    Args:
+        items: Iterável de triplas (question, user_answer, correct_answer)
+        concurrency: Número máximo de avaliações simultâneas
+        requests_per_minute: Limite de requisições por minuto (None desativa o limitador)
+        max_retries: Novas tentativas em caso de erro de rate limit
+        backoff_seconds: Espera base do backoff exponencial
+    """
+    limiter = RequestRateLimiter(requests_per_minute) if requests_per_minute else None
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(index: int, item: tuple[str, str, str]) -> BatchEvaluationResult:
+        async with semaphore:
+            return await _evaluate_one(index, item, limiter, max_retries, backoff_seconds)
+
+    pending: deque[asyncio.Task] = deque()
+    try:
+        for index, item in enumerate(items):
+            pending.append(asyncio.create_task(run(index, item)))
+            if len(pending) >= 2 * concurrency:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        # Se o consumidor parar no meio do lote, cancela o que ainda está em andamento.
+        for task in pending:
+            task.cancel()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    def read_items() -> Iterable[tuple[str, str, str]]:
+        with open(args.input, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record["question"], record["user_answer"], record["correct_answer"]
+
+    start = time.perf_counter()
+    count = failures = 0
+    with open(args.output, "w", encoding="utf-8") as output:
+        async for result in evaluate_answers_batch(read_items(), args.concurrency, args.rpm, args.max_retries):
+            output.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+            output.flush()
+            count += 1
+            failures += result.error is not None
+    elapsed = time.perf_counter() - start
+    print(f"{count} avaliações ({failures} falhas) em {elapsed:.1f}s ({count / elapsed if elapsed else 0:.2f}/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Avaliação em lote de respostas de entrevista")
+    parser.add_argument("input", help="Arquivo JSONL com question, user_answer e correct_answer")
+    parser.add_argument("output", help="Arquivo JSONL de saída com as avaliações")
+    parser.add_argument("--concurrency", type=int, default=8, help="Avaliações simultâneas")
+    parser.add_argument("--rpm", type=float, default=None, help="Limite de requisições por minuto")
+    parser.add_argument("--max-retries", type=int, default=3, help="Novas tentativas em erros de rate limit")
+    asyncio.run(_main(parser.parse_args()))
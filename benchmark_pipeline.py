@@ -0,0 +1,223 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script benchmark_pipeline.py
+============================
+Benchmark do pipeline de entrevista sem rede e sem custo de API, para pegar regressões
+de latência.
+
+Executa o mesmo fluxo de `start_interview_practice` (preparação, avaliação, follow-up e
+avaliação do follow-up) com respostas roteirizadas no lugar de `input()`, contra o
+servidor local de `stub_llm_server.py` (LLM e busca) ou reproduzindo respostas gravadas.
+Para cada etapa informa o tempo de parede, as chamadas ao LLM e o overhead do framework
+(tempo que não foi espera pelo modelo); também mede o tempo de ponta a ponta e o pico de
+memória, e compara tudo com um baseline salvo.
+
+Run
+---
+uv run benchmark_pipeline.py --iterations 5
+uv run benchmark_pipeline.py --iterations 5 --update-baseline
+uv run benchmark_pipeline.py --replay gravacao.jsonl --latency-ms 500
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from stub_llm_server import StubLLMServer
+
+COMPANY = "Google"
+ROLE = "Cientista de Dados Junior"
+DIFFICULTY = "medium"
+# Respostas na ordem em que o fluxo as pede: pergunta principal, Enter e follow-up.
+SCRIPTED_ANSWERS = [
+    "Viés é o erro de suposições simplificadas e variância é a sensibilidade aos dados de treino.",
+    "",
+    "Usaria validação cruzada e regularização para equilibrar os dois.",
+]
+# A pesquisa da empresa roda dentro da crew de `question_preparation` e é medida com ela.
+STAGES = ("question_preparation", "evaluation", "follow_up")
+
+DEFAULT_BASELINE = Path(__file__).with_name("benchmark_baseline.json")
+# Diferenças absolutas abaixo disto são tratadas como ruído na comparação com o baseline:
+NOISE_FLOOR_SECONDS = 0.005
+NOISE_FLOOR_MB = 1.0
+
+
+def configure_environment(stub_base_url: str, cache_root: str) -> None:
+    """Aponta LLM, busca e caches para o ambiente local. Deve rodar antes de importar a aplicação."""
+    os.environ.update(
+        {
+            "OPENAI_BASE_URL": f"{stub_base_url}/v1",
+            "OPENAI_API_KEY": "stub",
+            "SERPER_BASE_URL": stub_base_url,
+            "SERPER_API_KEY": "stub",
+            "INTERVIEW_CACHE_DIR": cache_root,
+            "INTERVIEW_ENV": "production",
+            "CREWAI_DISABLE_TELEMETRY": "true",
+            "CREWAI_TRACING_ENABLED": "false",
+            "OTEL_SDK_DISABLED": "true",
+            # Toda execução repete as mesmas respostas: sem isto a avaliação sairia do cache ou
+            # do pré-avaliador e sumiria das medidas.
+            "EVALUATION_CACHE_SIZE": "0",
+            "PREGRADER_ENABLED": "false",
+        }
+    )
+    os.environ.setdefault("MODEL", "gpt-4o-mini")
+
+
+def run_flow(session_id: str, warm_caches: bool = False) -> dict:
+    """Executa uma entrevista completa e devolve os totais por etapa dessa sessão."""
+    # Imports tardios: os agentes e o LLM são criados na importação, depois de `configure_environment`.
+    from instrumentation import get_instrumentation, session_scope  # noqa: PLC0415
+    from interview_practice_system import start_interview_practice  # noqa: PLC0415
+    from research_cache import get_research_cache  # noqa: PLC0415
+    from search_cache import get_search_cache  # noqa: PLC0415
+
+    if not warm_caches:
+        get_research_cache().clear()
+        get_search_cache().clear()
+
+    answers = iter(SCRIPTED_ANSWERS)
+    start = time.perf_counter()
+    with session_scope(session_id), redirect_stdout(io.StringIO()):
+        asyncio.run(start_interview_practice(COMPANY, ROLE, DIFFICULTY, ask=lambda _prompt: next(answers)))
+    end_to_end_seconds = time.perf_counter() - start
+    return {"end_to_end_seconds": end_to_end_seconds, "stages": get_instrumentation().session_totals(session_id)}
+
+
+def summarize(runs: list[dict], latency_seconds: float, peak_memory_mb: float) -> dict:
+    """Medianas por etapa; o overhead desconta a latência simulada de cada chamada ao LLM."""
+    stages = {}
+    for stage in STAGES:
+        totals = [run["stages"][stage] for run in runs if stage in run["stages"]]
+        if not totals:
+            continue
+        seconds = statistics.median(t["seconds"] for t in totals)
+        llm_calls = statistics.median(t["llm_calls"] for t in totals)
+        stages[stage] = {
+            "seconds": round(seconds, 4),
+            "llm_calls": llm_calls,
+            "overhead_seconds": round(max(seconds - llm_calls * latency_seconds, 0.0), 4),
+            "tool_seconds": round(statistics.median(t["tool_seconds"] for t in totals), 4),
+            "prompt_tokens": statistics.median(t["prompt_tokens"] for t in totals),
+        }
+    return {
+        "iterations": len(runs),
+        "latency_ms": latency_seconds * 1000,
+        "end_to_end_seconds": round(statistics.median(run["end_to_end_seconds"] for run in runs), 4),
+        "peak_memory_mb": round(peak_memory_mb, 2),
+        "stages": stages,
+    }
+
+
+def compare_with_baseline(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Lista as métricas que pioraram mais que `tolerance` (fração) em relação ao baseline.
+
+    Uma etapa do baseline que não aparece mais nas medidas atuais também é regressão.
+    """
+    regressions = [
+        f"{stage}: etapa ausente nas medidas atuais"
+        for stage in baseline.get("stages", {})
+        if stage not in current["stages"]
+    ]
+    checks = [
+        ("end_to_end_seconds", current["end_to_end_seconds"], baseline.get("end_to_end_seconds"), NOISE_FLOOR_SECONDS),
+        ("peak_memory_mb", current["peak_memory_mb"], baseline.get("peak_memory_mb"), NOISE_FLOOR_MB),
+    ]
+    for stage, metrics in current["stages"].items():
+        previous = baseline.get("stages", {}).get(stage, {})
+        overhead = metrics["overhead_seconds"]
+        checks.append((f"{stage}.overhead_seconds", overhead, previous.get("overhead_seconds"), NOISE_FLOOR_SECONDS))
+        # Contagens são exatas: qualquer chamada a mais ao LLM é regressão.
+        checks.append((f"{stage}.llm_calls", metrics["llm_calls"], previous.get("llm_calls"), None))
+
+    for name, value, reference, noise_floor in checks:
+        if reference is None:
+            continue
+        if noise_floor is None:
+            worse = value > reference
+        else:
+            worse = value > reference * (1 + tolerance) and value - reference > noise_floor
+        if worse:
+            regressions.append(f"{name}: {reference} -> {value}")
+    return regressions
+
+
+def print_report(summary: dict, stub_stats: dict) -> None:
+    print(f"{'etapa':<22}{'tempo (s)':>12}{'overhead (s)':>14}{'LLM':>6}{'ferramentas (s)':>17}")
+    for stage, metrics in summary["stages"].items():
+        print(
+            f"{stage:<22}{metrics['seconds']:>12.4f}{metrics['overhead_seconds']:>14.4f}"
+            f"{metrics['llm_calls']:>6g}{metrics['tool_seconds']:>17.4f}"
+        )
+    print(f"\nPonta a ponta: {summary['end_to_end_seconds']:.4f}s (mediana de {summary['iterations']} execuções)")
+    print(f"Pico de memória: {summary['peak_memory_mb']:.2f} MB")
+    print(f"Servidor stub: {stub_stats}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark offline do pipeline de entrevista")
+    parser.add_argument("--iterations", type=int, default=5, help="Execuções medidas")
+    parser.add_argument("--warmup", type=int, default=1, help="Execuções descartadas (imports, inicializações)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latência simulada de cada chamada ao LLM")
+    parser.add_argument("--replay", help="JSONL de respostas gravadas (ver stub_llm_server.py --record)")
+    parser.add_argument("--warm-caches", action="store_true", help="Não limpa os caches de pesquisa e de busca")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Arquivo de baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="Grava os resultados como novo baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Piora tolerada antes de acusar regressão")
+    parser.add_argument("--output", type=Path, help="Grava o resumo em JSON")
+    args = parser.parse_args()
+
+    stub = StubLLMServer(latency_seconds=args.latency_ms / 1000, replay_path=args.replay).start()
+    cache_root = tempfile.mkdtemp(prefix="interview-benchmark-")
+    configure_environment(stub.base_url, cache_root)
+    try:
+        for i in range(args.warmup):
+            run_flow(f"warmup-{i}", args.warm_caches)
+        runs = [run_flow(f"run-{i}", args.warm_caches) for i in range(args.iterations)]
+
+        # O pico de memória é medido numa execução à parte: o tracemalloc distorce os tempos.
+        tracemalloc.start()
+        run_flow("memory", args.warm_caches)
+        peak_memory_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    finally:
+        stub.stop()
+
+    summary = summarize(runs, args.latency_ms / 1000, peak_memory_mb)
+    print_report(summary, stub.stats)
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline atualizado em {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"\nSem baseline em {args.baseline}; use --update-baseline para criar um.")
+        return 0
+
+    regressions = compare_with_baseline(summary, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+    if regressions:
+        print("\nRegressões em relação ao baseline:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print("\nSem regressões em relação ao baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
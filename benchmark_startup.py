@@ -0,0 +1,156 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script benchmark_startup.py
+===========================
+Benchmark do tempo de inicialização: importação a frio dos módulos da aplicação e tempo
+até a primeira renderização do `chatbot_ui.py`.
+
+Cada medida roda num processo Python novo (sem nada importado nem em cache na memória),
+e o resultado é a mediana de `--runs` processos. Além dos tempos, informa quais módulos
+pesados (torch, whisper, crewai_tools) já estavam carregados ao fim de cada medida: eles
+só devem entrar quando a primeira pesquisa ou a primeira transcrição precisa deles. Também
+mede a construção do primeiro agente (LLM incluído) e de uma crew de avaliação, a primeira
+e a segunda vez: da segunda em diante o agente e o modelo da crew são reaproveitados e só
+a cópia preenchida do modelo é construída.
+
+Nenhuma chamada ao LLM é feita: as chaves apontam para um endereço local fictício.
+
+Run
+---
+uv run benchmark_startup.py --runs 5
+uv run benchmark_startup.py --runs 5 --output startup.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmark_pipeline import configure_environment
+
+IMPORT_TARGETS = ("interview_practice_system", "transcription_service", "streaming_transcription", "interview_service")
+HEAVY_MODULES = ("torch", "whisper", "crewai_tools")
+# Nenhuma requisição chega a ser feita: só a construção dos clientes precisa de um endereço.
+UNUSED_BASE_URL = "http://127.0.0.1:9"
+RENDER_TIMEOUT_SECONDS = 120
+
+_PRELUDE = f"""
+import json, sys, time
+HEAVY_MODULES = {HEAVY_MODULES!r}
+def report(**measures):
+    measures["heavy_modules_loaded"] = [name for name in HEAVY_MODULES if name in sys.modules]
+    print(json.dumps(measures))
+"""
+
+_IMPORT_PROBE = """
+start = time.perf_counter()
+import {module}
+report(seconds=time.perf_counter() - start)
+"""
+
+_RENDER_PROBE = f"""
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file("chatbot_ui.py", default_timeout={RENDER_TIMEOUT_SECONDS})
+app.run()
+report(seconds=time.perf_counter() - start, exceptions=[str(e.value) for e in app.exception])
+"""
+
+_CREW_PROBE = """
+import interview_practice_system as system
+start = time.perf_counter()
+system.get_answer_evaluator()
+agent_seconds = time.perf_counter() - start
+crew_seconds = []
+for _ in range(2):
+    start = time.perf_counter()
+    system.create_evaluation_crew("Pergunta?", "Resposta.", "Resposta correta.")
+    crew_seconds.append(time.perf_counter() - start)
+report(
+    seconds=agent_seconds + crew_seconds[0],
+    first_agent_seconds=agent_seconds,
+    first_crew_seconds=crew_seconds[0],
+    next_crew_seconds=crew_seconds[1],
+)
+"""
+
+
+def run_probe(probe: str) -> dict:
+    """Executa o trecho num interpretador novo, na pasta da aplicação, e devolve as medidas."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PRELUDE + probe],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+        timeout=RENDER_TIMEOUT_SECONDS * 2,
+        check=False,
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "sem saída"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(probe: str, runs: int) -> dict:
+    """Mediana das medidas de `runs` processos; o primeiro erro interrompe a série."""
+    samples = []
+    for _ in range(runs):
+        sample = run_probe(probe)
+        if "error" in sample:
+            return sample
+        samples.append(sample)
+    summary = {
+        name: round(statistics.median(sample[name] for sample in samples), 4)
+        for name, value in samples[0].items()
+        if isinstance(value, float)
+    }
+    summary["heavy_modules_loaded"] = sorted({name for sample in samples for name in sample["heavy_modules_loaded"]})
+    if samples[0].get("exceptions"):
+        summary["exceptions"] = samples[0]["exceptions"]
+    return summary
+
+
+def print_report(summary: dict) -> None:
+    print(f"{'medida':<40}{'tempo (s)':>12}  módulos pesados carregados")
+    for name, metrics in summary["measures"].items():
+        if "error" in metrics:
+            print(f"{name:<40}{'erro':>12}  {metrics['error']}")
+            continue
+        heavy = ", ".join(metrics["heavy_modules_loaded"]) or "nenhum"
+        print(f"{name:<40}{metrics['seconds']:>12.4f}  {heavy}")
+        for detail in ("first_agent_seconds", "first_crew_seconds", "next_crew_seconds"):
+            if detail in metrics:
+                print(f"  {detail:<38}{metrics[detail]:>12.4f}")
+        for exception in metrics.get("exceptions", []):
+            print(f"  exceção na renderização: {exception}")
+    print(f"\nMediana de {summary['runs']} processos por medida.")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização da aplicação")
+    parser.add_argument("--runs", type=int, default=5, help="Processos medidos por medida")
+    parser.add_argument("--output", type=Path, help="Grava o resumo em JSON")
+    args = parser.parse_args()
+
+    # Os processos filhos herdam o ambiente: chaves e caches locais, sem telemetria.
+    configure_environment(UNUSED_BASE_URL, tempfile.mkdtemp(prefix="interview-startup-"))
+
+    measures = {
+        f"import {module}": measure(_IMPORT_PROBE.format(module=module), args.runs) for module in IMPORT_TARGETS
+    }
+    measures["primeira renderização (chatbot_ui)"] = measure(_RENDER_PROBE, args.runs)
+    measures["primeiro agente + crew de avaliação"] = measure(_CREW_PROBE, args.runs)
+
+    summary = {"runs": args.runs, "measures": measures}
+    print_report(summary)
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return 1 if any("error" in metrics for metrics in measures.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
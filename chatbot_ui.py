@@ -19,22 +19,40 @@ NOTA
 O App está funcional, mas falta alguns pequenos ajustes para melhorar
 a experiência do usuário.
 """
-import asyncio
-import os
-import tempfile
+import sys
+import time
+import uuid
 
 import streamlit as st
-import whisper  # https://pypi.org/project/openai-whisper/
 from streamlit_mic_recorder import mic_recorder
 
+from answer_pregrader import get_pregrader_stats
+from audio_decoding import WHISPER_SAMPLE_RATE
+from evaluation_cache import get_evaluation_cache
+from instrumentation import get_instrumentation, record_span, set_session_id
 from interview_practice_system import (
-    evaluate_answer,
-    generate_follow_up_question,
-    initialize_preparation_crew,
+    evaluate_without_llm,
+    prepare_question,
+    stream_evaluation,
+    stream_follow_up_question,
 )
+from llm_tiers import StageDeadlineError, get_tiering_stats
+from question_pool import get_question_pool
+from research_cache import get_research_cache
+from research_compaction import get_compaction_stats
+from session_async import SessionEventLoop
+from session_log import MESSAGE_ROLES, get_session_log
+from streaming_transcription import StreamingTranscriber
+from transcription_service import TranscriptionQueueFullError, get_transcription_pool
 
 st.title("🤗 Entrevista Simulada com IA 🤗")
 
+# Mensagens do chat mantidas em memória e desenhadas a cada rerun; as anteriores ficam no
+# registro da sessão e voltam uma página por vez:
+CHAT_TAIL_MESSAGES = 20
+CHAT_PAGE_MESSAGES = 20
+DIFFICULTIES = ["Fácil", "Médio", "Difícil"]
+
 # Inicializa o estado da sessão:
 if "messages" not in st.session_state:
     st.session_state.messages = []
@@ -42,16 +60,70 @@ if "messages" not in st.session_state:
     st.session_state.current_question = None
     st.session_state.current_answer = None
     st.session_state.evaluation = None
-    st.session_state.preparation_crew = None
     st.session_state.follow_up_question = None
     st.session_state.is_generating_follow_up = False
+    st.session_state.seen_questions = set()
+    # Loop asyncio da sessão: sobrevive aos reruns e permite sobrepor avaliação e follow-up
+    st.session_state.event_loop = SessionEventLoop()
+    st.session_state.follow_up_job = None
+    st.session_state.follow_up_stream = None
+    st.session_state.follow_up_for = None
+    st.session_state.chat_window = CHAT_TAIL_MESSAGES
+    st.session_state.question_shown_at = None
+    st.session_state.interview_config = ("Google", "Cientista de Dados Junior", "Médio")
+    # A sessão fica na URL (?session=...): recarregar a página, mesmo após reiniciar o servidor,
+    # retoma a entrevista a partir do registro.
+    st.session_state.session_id = st.query_params.get("session") or uuid.uuid4().hex
+    snapshot = get_session_log().restore(st.session_state.session_id)
+    if snapshot is not None:
+        st.session_state.interview_started = True
+        st.session_state.current_question = snapshot.current_question
+        st.session_state.correct_answer = snapshot.correct_answer
+        st.session_state.seen_questions = snapshot.seen_questions
+        st.session_state.messages = get_session_log().messages(st.session_state.session_id, CHAT_TAIL_MESSAGES)
+        st.session_state.interview_config = (snapshot.company_name, snapshot.role, snapshot.difficulty)
+        st.toast(f"Entrevista retomada ({snapshot.message_count} mensagens).")
+    st.query_params["session"] = st.session_state.session_id
+
+# Os spans de instrumentação criados neste rerun pertencem a esta sessão:
+set_session_id(st.session_state.session_id)
+
+
+def add_message(kind, content, seconds=None, **data):
+    """
+    Registra o evento no log da sessão e acrescenta a mensagem ao fim do chat.
+
+    Args:
+        kind: Tipo do evento ("question", "answer", "evaluation" ou "follow_up")
+        content: Texto da mensagem
+        seconds: Tempo que a etapa levou, se houver
+        **data: Dados extras do evento (ex.: a resposta correta de uma pergunta)
+    """
+    seq = get_session_log().append(st.session_state.session_id, kind, content, seconds, **data)
+    st.session_state.messages.append({"seq": seq, "role": MESSAGE_ROLES[kind], "content": content})
+    # Só a janela final fica em memória; o restante continua no registro:
+    del st.session_state.messages[: -st.session_state.chat_window]
+
+
+def show_token_stream(stream):
+    """
+    Mostra o texto de um `CrewTokenStream` à medida que é gerado.
+
+    O texto é redesenhado inteiro a cada trecho (em vez de acrescentado com `st.write_stream`),
+    para que a resposta de uma chamada ao LLM descartada (ex.: nova tentativa do agente) suma da tela.
+    """
+    placeholder = st.empty()
+    for text in stream.visible_text():
+        placeholder.markdown(text)
+
 
 # Sidebar para configuração da entrevista:
 with st.sidebar:
     st.header("Configuração da Entrevista")
-    company_name = st.text_input("Nome da Empresa desejada", "Google")
-    role = st.text_input("Cargo desejado", "Cientista de Dados Junior")
-    difficulty = st.selectbox("Nível de Dificuldade", ["Fácil", "Médio", "Difícil"], index=1)
+    default_company, default_role, default_difficulty = st.session_state.interview_config
+    company_name = st.text_input("Nome da Empresa desejada", default_company)
+    role = st.text_input("Cargo desejado", default_role)
+    difficulty = st.selectbox("Nível de Dificuldade", DIFFICULTIES, index=DIFFICULTIES.index(default_difficulty))
 
     st.divider()
     st.subheader("🎤 Configurações de Áudio")
@@ -78,21 +150,93 @@ with st.sidebar:
         """
     )
 
+    # O pool de transcrição vive durante todo o processo do servidor e é compartilhado
+    # entre sessões e reruns: cada worker carrega o modelo do disco uma única vez.
+    transcription_pool = get_transcription_pool(whisper_model)
+    if st.checkbox("Pré-carregar modelo Whisper", value=True, help="Carrega o modelo em segundo plano ao iniciar"):
+        if st.session_state.get("preloaded_whisper_model") != whisper_model:
+            transcription_pool.preload(whisper_model)
+            st.session_state.preloaded_whisper_model = whisper_model
+
+    streaming_transcription = st.toggle(
+        "Transcrição incremental (streaming)",
+        value=True,
+        help="Transcreve cada trecho de fala em paralelo e mostra o texto parcial",
+    )
+
+    with st.expander("📈 Estatísticas do Whisper"):
+        st.json(transcription_pool.stats())
+
+    with st.expander("🗂️ Cache de pesquisa da empresa"):
+        research_cache = get_research_cache()
+        st.json(research_cache.stats())
+        if st.button("Refazer pesquisa desta empresa"):
+            removed = research_cache.invalidate(company_name, role, difficulty)
+            st.caption(f"{removed} pesquisa(s) removida(s) do cache.")
+        st.caption("Compactação da pesquisa (tokens estimados)")
+        st.json(get_compaction_stats())
+        st.caption("Buscas na web (Serper)")
+        # O search_cache (e o crewai_tools) só é importado quando a primeira pesquisa cria a ferramenta:
+        search_cache = sys.modules.get("search_cache")
+        if search_cache is None:
+            st.caption("Nenhuma busca neste processo.")
+        else:
+            st.json(search_cache.get_search_stats())
+
+    with st.expander("🧮 Avaliação sem LLM"):
+        st.caption("Pré-avaliação local")
+        st.json(get_pregrader_stats())
+        st.caption("Cache de avaliações (respostas quase iguais)")
+        st.json(get_evaluation_cache().stats())
+
+    with st.expander("⏱️ Tempo por etapa"):
+        instrumentation = get_instrumentation()
+        st.caption("Esta sessão")
+        st.json(instrumentation.session_totals(st.session_state.session_id))
+        st.caption("Prazos, cópias em paralelo e modelo reserva por etapa")
+        st.json(get_tiering_stats())
+        st.caption("Processo (formato Prometheus)")
+        st.code(instrumentation.prometheus_snapshot(), language="text")
+
+    with st.expander("📚 Banco de perguntas"):
+        st.json(get_question_pool().stats())
+
+    with st.expander("🗒️ Registro da sessão"):
+        st.caption(f"Sessão `{st.session_state.session_id}` (retome abrindo a URL com `?session=` deste id)")
+        st.json(get_session_log().session_summary(st.session_state.session_id))
+        st.caption("Todas as sessões registradas")
+        st.json(get_session_log().stats())
+
     if st.button("Iniciar Entrevista Simulada"):
         st.session_state.interview_started = True
+        # Cada entrevista é uma nova sessão no registro:
+        st.session_state.session_id = uuid.uuid4().hex
+        st.query_params["session"] = st.session_state.session_id
+        get_session_log().append(
+            st.session_state.session_id, "start", company_name=company_name, role=role, difficulty=difficulty
+        )
+        st.session_state.interview_config = (company_name, role, difficulty)
+        st.session_state.chat_window = CHAT_TAIL_MESSAGES
         st.session_state.messages = []
         st.session_state.current_question = None
         st.session_state.current_answer = None
         st.session_state.evaluation = None
         st.session_state.follow_up_question = None
         st.session_state.is_generating_follow_up = False
-
-        # Inicializa a equipe de preparação:
-        st.session_state.preparation_crew = initialize_preparation_crew(company_name, role, difficulty)
+        st.session_state.follow_up_job = None
+        st.session_state.follow_up_stream = None
+        st.session_state.follow_up_for = None
         st.rerun()
 
-# Exibe as mensagens do chat:
-for msg in st.session_state.messages:
+# Exibe as mensagens do chat (só a janela final; as anteriores são lidas do registro sob demanda):
+messages = st.session_state.messages
+if messages and get_session_log().has_older(st.session_state.session_id, messages[0]["seq"]):
+    if st.button("⬆️ Carregar mensagens anteriores"):
+        older = get_session_log().messages(st.session_state.session_id, CHAT_PAGE_MESSAGES, messages[0]["seq"])
+        st.session_state.messages = older + messages
+        st.session_state.chat_window += len(older)
+        st.rerun()
+for msg in messages:
     with st.chat_message(msg["role"]):
         st.markdown(msg["content"])
 
@@ -104,17 +248,49 @@ if not st.session_state.interview_started:
     )
 # Se não temos uma pergunta atual, inicia a entrevista:
 elif st.session_state.current_question is None:
-    with st.spinner("🤖 Preparando sua pergunta de entrevista..."):
-        # Executa a crew de preparação para obter a pergunta e a resposta correta:
-        preparation_result = st.session_state.preparation_crew.kickoff()
-
-        # Armazena a pergunta e a resposta correta:
-        st.session_state.current_question = preparation_result.pydantic.question
-        st.session_state.correct_answer = preparation_result.pydantic.correct_answer
-
-        # Adiciona a pergunta ao chat:
-        st.session_state.messages.append({"role": "assistant", "content": st.session_state.current_question})
-        st.rerun()
+    # Usa uma pergunta pré-gerada do banco; só roda a crew de preparação se não houver nenhuma pronta:
+    preparation_started_at = time.perf_counter()
+    question_pair = get_question_pool().take(company_name, role, difficulty, seen=st.session_state.seen_questions)
+    question_source = "pool"
+    if question_pair is None:
+        question_source = "crew"
+        with st.spinner("🤖 Preparando sua pergunta de entrevista..."):
+            # Executa a crew de preparação para obter a pergunta e a resposta correta:
+            try:
+                question_pair = prepare_question(company_name, role, difficulty)
+            except StageDeadlineError as e:
+                # Sem pergunta atual, o próximo rerun tenta a preparação de novo:
+                st.error(f"⏱️ {e} Tente novamente.")
+                st.button("Tentar novamente")
+                st.stop()
+
+    # Armazena a pergunta e a resposta correta:
+    st.session_state.current_question = question_pair.question
+    st.session_state.correct_answer = question_pair.correct_answer
+    st.session_state.seen_questions.add(question_pair.question)
+
+    # Adiciona a pergunta ao chat:
+    add_message(
+        "question",
+        st.session_state.current_question,
+        time.perf_counter() - preparation_started_at,
+        correct_answer=question_pair.correct_answer,
+        source=question_source,
+    )
+    st.session_state.question_shown_at = time.time()
+    st.rerun()
+
+# Começa a gerar o follow-up assim que a pergunta aparece, enquanto o usuário ainda responde:
+if st.session_state.interview_started and st.session_state.follow_up_for != st.session_state.current_question:
+    st.session_state.follow_up_for = st.session_state.current_question
+    # Em streaming: se ainda não estiver pronto quando for exibido, o texto aparece enquanto é gerado.
+    st.session_state.follow_up_stream = stream_follow_up_question(
+        question=st.session_state.current_question,
+        company_name=company_name,
+        role=role,
+        difficulty=difficulty.lower(),
+    )
+    st.session_state.follow_up_job = st.session_state.event_loop.submit(st.session_state.follow_up_stream.run())
 
 # Obtém a entrada do usuário:
 st.write("Escolha seu método de entrada:")
@@ -122,61 +298,97 @@ input_method = st.radio("Método de Entrada", ["Texto", "Voz"], horizontal=True,
 
 user_input = None  # Inicializa o user_input
 
+# Tamanho dos blocos de áudio entregues ao transcritor incremental (1 s):
+STREAMING_BLOCK_SAMPLES = WHISPER_SAMPLE_RATE
+
+
+def show_audio_error(error: Exception) -> None:
+    """Mostra ao usuário o erro ocorrido ao processar o áudio."""
+    if isinstance(error, FileNotFoundError) and "ffmpeg" in str(error):
+        st.error(
+            """
+            ❌ **Erro: FFmpeg não encontrado!**
+            O FFmpeg é necessário para processar áudio em formatos diferentes de WAV.
+            **Solução:** Execute no terminal:
+            ```bash
+            sudo apt update && sudo apt install -y ffmpeg
+            ```
+            Depois reinicie a aplicação Streamlit.
+            """
+        )
+    elif isinstance(error, FileNotFoundError):
+        st.error(f"Arquivo não encontrado: {error!s}")
+    elif isinstance(error, TranscriptionQueueFullError):
+        st.warning(f"⏳ {error!s}")
+    else:
+        st.error(f"Ocorreu um erro ao processar o áudio: {error!s}")
+
 
-def convert_speech_to_text(audio_bytes, model_name="base"):
+def convert_speech_to_text(audio_bytes, model_name="base", streaming=True):
     """
-    Converte áudio em texto usando Whisper.
+    Envia o áudio para o pool de transcrição sem bloquear o script do Streamlit.
+
+    No modo streaming o áudio é entregue em blocos a um `StreamingTranscriber`: cada
+    trecho de fala concluído vai para o pool assim que é detectado, os trechos são
+    transcritos em paralelo e o texto parcial pode ser exibido enquanto o resto termina.
+    A decodificação, a detecção de fala e o envio dos trechos rodam em segundo plano: o script
+    não espera por eles nem por vaga na fila.
 
     Args:
         audio_bytes: Bytes do áudio gravado
         model_name: Nome do modelo Whisper (tiny, base, small, medium, large)
+        streaming: Se True, transcreve o áudio de forma incremental
 
     Returns:
-        str: Texto transcrito ou None se houver erro
+        Future | StreamingTranscriber: Transcrição em andamento ou None se houver erro
     """
+    pool = get_transcription_pool(model_name)
     try:
-        # Cria um arquivo temporário para armazenar o áudio:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-            temp_audio.write(audio_bytes)
-            temp_audio_path = temp_audio.name
+        if not streaming:
+            return pool.submit(audio_bytes, model_name)
 
-        try:
-            # Carrega o modelo Whisper (isso irá baixar o modelo na primeira execução)
-            # Na primeira vez que usar um modelo, ele será baixado (~100MB-3GB)
-            model = whisper.load_model(model_name)
-
-            # Transcreve o áudio especificando português brasileiro
-            # language='pt' força o reconhecimento em português
-            # fp16=False é necessário para CPU (a maioria dos computadores)
-            result = model.transcribe(
-                temp_audio_path,
-                language="pt",  # Português (Brasil/Portugal)
-                fp16=False,  # Desabilita FP16 (necessário para CPU)
-                verbose=False,  # Não mostra progresso detalhado
-            )
-            return result["text"]
-        finally:
-            # Limpa o arquivo temporário
-            os.unlink(temp_audio_path)
-
-    except FileNotFoundError as e:
-        if "ffmpeg" in str(e):
-            st.error(
-                """
-                ❌ **Erro: FFmpeg não encontrado!**
-                O Whisper precisa do FFmpeg para processar áudio.
-                **Solução:** Execute no terminal:
-                ```bash
-                sudo apt update && sudo apt install -y ffmpeg
-                ```
-                Depois reinicie a aplicação Streamlit.
-                """
-            )
-        else:
-            st.error(f"Arquivo não encontrado: {e!s}")
+        # Decodificação, detecção de fala e envio dos trechos rodam numa thread do transcritor:
+        transcriber = StreamingTranscriber(pool, model_name)
+        transcriber.feed_recording(audio_bytes, block_samples=STREAMING_BLOCK_SAMPLES)
+        return transcriber
+    except Exception as e:
+        show_audio_error(e)
         return None
+
+
+def read_transcription(job, started_at=None):
+    """
+    Lê o resultado de uma transcrição concluída.
+
+    Args:
+        job: Transcrição retornada por `convert_speech_to_text`
+        started_at: `time.perf_counter()` do envio do áudio, para registrar o tempo da etapa
+
+    Returns:
+        str: Texto transcrito ou None se houver erro
+    """
+    seconds = time.perf_counter() - started_at if started_at is not None else 0.0
+    try:
+        result = job.result()
+        record_span(
+            "transcription",
+            seconds,
+            audio_seconds=result.original_seconds,
+            speech_seconds=result.speech_seconds,
+            transcribe_seconds=result.transcribe_seconds,
+        )
+        st.caption(
+            f"✂️ Silêncio removido: {result.dropped_seconds:.1f}s de {result.original_seconds:.1f}s "
+            f"({result.dropped_ratio:.0%} do áudio) · transcrição em {result.transcribe_seconds:.1f}s"
+        )
+        # Fila cheia no fim da gravação: fica o texto dos trechos já transcritos.
+        if isinstance(job, StreamingTranscriber) and job.error is not None:
+            show_audio_error(job.error)
+            st.caption(f"⚠️ Os últimos {job.untranscribed_seconds:.1f}s de áudio não foram transcritos.")
+        return result.text or None
     except Exception as e:
-        st.error(f"Ocorreu um erro ao processar o áudio: {e!s}")
+        record_span("transcription", seconds, error=f"{type(e).__name__}: {e}")
+        show_audio_error(e)
         return None
 
 
@@ -206,6 +418,7 @@ else:
         stop_prompt="⏹️ Parar gravação",
         just_once=True,
         use_container_width=True,
+        format="wav",  # WAV PCM é decodificado em memória, sem FFmpeg
         key="voice_recorder",
     )
 
@@ -213,55 +426,104 @@ else:
         # Debug: mostra que o áudio foi capturado
         st.write(f"📊 Áudio capturado: {len(audio['bytes'])} bytes")
 
-        with st.spinner(f"🔄 Convertendo áudio para texto usando modelo '{whisper_model}'..."):
-            # Converte os bytes do áudio para texto usando o modelo selecionado
-            user_input = convert_speech_to_text(audio["bytes"], model_name=whisper_model)
+        # Envia o áudio para o pool; o resultado é consultado nos próximos reruns
+        st.session_state.transcription_started_at = time.perf_counter()
+        st.session_state.transcription_job = convert_speech_to_text(
+            audio["bytes"], model_name=whisper_model, streaming=streaming_transcription
+        )
+
+    transcription_job = st.session_state.get("transcription_job")
+    if transcription_job is not None:
+        if transcription_job.done():
+            st.session_state.transcription_job = None
+            user_input = read_transcription(transcription_job, st.session_state.get("transcription_started_at"))
             if user_input:
                 st.success(f"✅ Reconhecido: {user_input}")
             else:
                 st.error("❌ Não foi possível reconhecer a fala. Por favor, tente novamente.")
+        else:
+            # Mostra ao vivo os trechos já transcritos (modo streaming):
+            if isinstance(transcription_job, StreamingTranscriber) and (partial := transcription_job.partial_text()):
+                st.markdown(f"📝 _{partial}_ ...")
+            # A transcrição roda fora desta thread: só aguardamos um pouco e consultamos de novo
+            with st.spinner(f"🔄 Convertendo áudio para texto usando modelo '{whisper_model}'..."):
+                time.sleep(0.3)
+            st.rerun()
+
     # Debug: indica quando o botão de gravação foi clicado mas não há áudio
-    elif st.session_state.get("show_audio_warning", False):
+    if transcription_job is None and st.session_state.get("show_audio_warning", False):
         st.warning("⏳ Aguardando gravação... Clique em 'Iniciar gravação' e fale no microfone.")
 
 if user_input is not None:
-    # Adiciona a resposta do usuário às mensagens:
-    st.session_state.messages.append({"role": "user", "content": user_input})
+    # Tempo desde que a pergunta apareceu (a resposta só vai para o registro depois de avaliada):
+    shown_at = st.session_state.question_shown_at
+    answer_seconds = time.time() - shown_at if shown_at is not None else None
 
     # Armazena a resposta do usuário:
     st.session_state.current_answer = user_input
 
-    # Mostra a mensagem de pensamento:
-    with st.spinner("🤖 Avaliando sua resposta..."):
-        # Avalia a resposta do usuário:
-        evaluation = evaluate_answer(
+    with st.chat_message("user"):
+        st.markdown(user_input)
+
+    # Respostas vazias, "não sei", fora do tema ou quase iguais a uma resposta
+    # já avaliada para a mesma pergunta são avaliadas na hora:
+    evaluation_started_at = time.perf_counter()
+    local_evaluation = evaluate_without_llm(
+        question=st.session_state.current_question,
+        user_answer=user_input,
+        correct_answer=st.session_state.correct_answer,
+    )
+    evaluation_job = None
+    if local_evaluation is None:
+        # Avalia a resposta no loop da sessão, em paralelo com o follow-up já em andamento, e
+        # mostra a avaliação token a token enquanto ela é gerada:
+        evaluation_stream = stream_evaluation(
             question=st.session_state.current_question,
             user_answer=user_input,
             correct_answer=st.session_state.correct_answer,
         )
+        evaluation_job = st.session_state.event_loop.submit(evaluation_stream.run())
+        with st.chat_message("assistant"):
+            show_token_stream(evaluation_stream)
+    else:
+        with st.chat_message("assistant"):
+            st.markdown(local_evaluation)
+
+    # Mostra a mensagem de pensamento (se o provedor não fizer streaming, espera aqui):
+    with st.spinner("🤖 Avaliando sua resposta..."):
+        try:
+            evaluation = evaluation_job.result().raw if evaluation_job is not None else local_evaluation
+        except StageDeadlineError as e:
+            # A pergunta continua em aberto: a mesma resposta pode ser enviada de novo.
+            st.error(f"⏱️ {e} Envie sua resposta novamente para tentar de novo.")
+            st.stop()
+
+        # Só com a avaliação pronta a resposta entra no registro: reenvios após um prazo estourado
+        # não deixam respostas repetidas na sessão.
+        add_message("answer", user_input, answer_seconds, method=input_method)
+        add_message(
+            "evaluation",
+            evaluation,
+            time.perf_counter() - evaluation_started_at,
+            source="llm" if evaluation_job is not None else "local",
+        )
 
-        # Adiciona a avaliação às mensagens:
-        st.session_state.messages.append({"role": "assistant", "content": evaluation})
-
-        # Gera uma pergunta de follow-up se não estiver gerando uma pergunta de follow-up:
+        # Usa a pergunta de follow-up gerada desde que a pergunta apareceu:
         if not st.session_state.is_generating_follow_up:
             st.session_state.is_generating_follow_up = True
             try:
-                # Gera uma pergunta de follow-up:
-                follow_up_result = asyncio.run(
-                    generate_follow_up_question(
-                        question=st.session_state.current_question,
-                        company_name=company_name,
-                        role=role,
-                        difficulty=difficulty.lower(),
-                    )
-                )
+                # Normalmente já está pronta; senão, mostra o restante enquanto é gerado:
+                if not st.session_state.follow_up_job.done():
+                    with st.chat_message("assistant"):
+                        show_token_stream(st.session_state.follow_up_stream)
+                follow_up_result = st.session_state.follow_up_job.result().pydantic
 
                 # Armazena a pergunta de follow-up:
                 st.session_state.follow_up_question = follow_up_result
 
                 # Adiciona a pergunta de follow-up às mensagens:
-                st.session_state.messages.append({"role": "assistant", "content": follow_up_result.question})
+                add_message("follow_up", follow_up_result.question, correct_answer=follow_up_result.correct_answer)
+                st.session_state.question_shown_at = time.time()
 
                 # Configura para a pergunta de follow-up:
                 st.session_state.current_question = follow_up_result.question
@@ -0,0 +1,177 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script evaluation_cache.py
+==========================
+Cache de avaliações para respostas quase idênticas à mesma pergunta.
+
+Com as perguntas saindo do banco compartilhado, muitos candidatos dão respostas
+praticamente iguais à mesma pergunta, e cada uma pagava uma avaliação completa do LLM.
+Aqui cada avaliação fica guardada pela pergunta (com sua resposta correta) e pela
+resposta do candidato. Uma nova resposta só recebe a avaliação guardada quando:
+
+- tem exatamente os mesmos termos de conteúdo e marcadores de negação, na mesma ordem
+  (a assinatura da resposta): trocar dois conceitos de lugar ou acrescentar um "não"
+  muda a resposta e, portanto, a avaliação;
+- e o vetor de palavras e pares de palavras (hashing para um vetor NumPy de tamanho fixo
+  e norma 1) tem similaridade de cosseno acima do limiar com o da resposta avaliada.
+
+Na prática só se reaproveitam respostas que diferem em pontuação, acentos, maiúsculas e
+palavras vazias, como as mesmas frases digitadas ou transcritas de outro jeito. As
+entradas ficam em memória com descarte LRU.
+
+Configuração
+------------
+EVALUATION_CACHE_SIZE: avaliações mantidas em memória (padrão: 2048; 0 desativa)
+EVALUATION_CACHE_SIMILARITY: similaridade mínima para reaproveitar uma avaliação (padrão: 0.97)
+"""
+
+import hashlib
+import itertools
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from answer_pregrader import NEGATIONS, STEM_PREFIX, STOPWORDS, normalize_text
+
+DEFAULT_CAPACITY = 2048
+DEFAULT_SIMILARITY = 0.97
+# Dimensão dos vetores de resposta (colisões de hash são raras nas respostas curtas):
+VECTOR_DIMENSIONS = 4096
+
+_WORD = re.compile(r"\w+")
+
+
+def question_key(question: str, correct_answer: str) -> str:
+    """A mesma pergunta com outra resposta correta pode merecer outra avaliação."""
+    text = "\n".join(" ".join(normalize_text(part).split()) for part in (question, correct_answer))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def answer_signature(user_answer: str) -> str:
+    """Hash dos termos de conteúdo e das negações da resposta, na ordem em que aparecem."""
+    words = _WORD.findall(normalize_text(user_answer))
+    terms = [word if word in NEGATIONS else word[:STEM_PREFIX] for word in words if word not in STOPWORDS - NEGATIONS]
+    return hashlib.sha256(" ".join(terms).encode()).hexdigest()
+
+
+def answer_vector(user_answer: str, dimensions: int = VECTOR_DIMENSIONS) -> np.ndarray | None:
+    """Vetor de palavras e pares de palavras da resposta (None se não houver palavras)."""
+    words = _WORD.findall(normalize_text(user_answer))
+    if not words:
+        return None
+    features = [*words, *(f"{a} {b}" for a, b in itertools.pairwise(words))]
+    vector = np.zeros(dimensions)
+    np.add.at(vector, [zlib.crc32(feature.encode()) % dimensions for feature in features], 1.0)
+    # TF sublinear: uma palavra repetida não domina a resposta.
+    vector = np.log1p(vector)
+    return vector / np.linalg.norm(vector)
+
+
+class EvaluationCache:
+    """Avaliações por pergunta e resposta, com busca por similaridade e descarte LRU."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, similarity_threshold: float = DEFAULT_SIMILARITY):
+        self.capacity = capacity
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        # Ordem de uso de todas as entradas (a primeira é a próxima a sair) e índice por pergunta:
+        self._lru: OrderedDict[tuple[str, int], None] = OrderedDict()
+        self._by_question: dict[str, dict[int, tuple[str, np.ndarray, str]]] = {}
+        self._next_id = 0
+        self._stats = {"exact_hits": 0, "similar_hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, question: str, correct_answer: str, user_answer: str) -> str | None:
+        """Avaliação de uma resposta igual ou quase igual já avaliada, ou None."""
+        if self.capacity <= 0:
+            return None
+        vector = answer_vector(user_answer)
+        signature = answer_signature(user_answer)
+        key = question_key(question, correct_answer)
+        with self._lock:
+            entries = self._by_question.get(key, {})
+            ids = [i for i, entry in entries.items() if entry[0] == signature]
+            if vector is None or not ids:
+                self._stats["misses"] += 1
+                return None
+            similarities = np.stack([entries[i][1] for i in ids]) @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.similarity_threshold:
+                self._stats["misses"] += 1
+                return None
+            self._stats["exact_hits" if similarities[best] >= 1 - 1e-9 else "similar_hits"] += 1
+            self._lru.move_to_end((key, ids[best]))
+            return entries[ids[best]][2]
+
+    def put(self, question: str, correct_answer: str, user_answer: str, evaluation: str) -> None:
+        vector = answer_vector(user_answer)
+        if vector is None or self.capacity <= 0:
+            return
+        signature = answer_signature(user_answer)
+        key = question_key(question, correct_answer)
+        with self._lock:
+            entries = self._by_question.setdefault(key, {})
+            entries[self._next_id] = (signature, vector, evaluation)
+            self._lru[(key, self._next_id)] = None
+            self._next_id += 1
+            while len(self._lru) > self.capacity:
+                old_key, old_id = self._lru.popitem(last=False)[0]
+                del self._by_question[old_key][old_id]
+                if not self._by_question[old_key]:
+                    del self._by_question[old_key]
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self._by_question.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._lru)
+        lookups = stats["exact_hits"] + stats["similar_hits"] + stats["misses"]
+        hits = stats["exact_hits"] + stats["similar_hits"]
+        stats["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        stats["similar_hit_rate"] = round(stats["similar_hits"] / lookups, 3) if lookups else 0.0
+        stats["similarity_threshold"] = self.similarity_threshold
+        return stats
+
+    def prometheus_snapshot(self) -> str:
+        """Consultas por resultado e taxa de acerto no formato de texto do Prometheus."""
+        stats = self.stats()
+        lines = [
+            "# HELP interview_evaluation_cache_lookups_total Consultas ao cache de avaliações por resultado",
+            "# TYPE interview_evaluation_cache_lookups_total counter",
+            *(
+                f'interview_evaluation_cache_lookups_total{{result="{result}"}} {stats[key]}'
+                for result, key in (("exact_hit", "exact_hits"), ("similar_hit", "similar_hits"), ("miss", "misses"))
+            ),
+            "# HELP interview_evaluation_cache_hit_ratio Fração das consultas servidas pelo cache",
+            "# TYPE interview_evaluation_cache_hit_ratio gauge",
+            f"interview_evaluation_cache_hit_ratio {stats['hit_rate']:g}",
+            "# HELP interview_evaluation_cache_entries Avaliações em memória",
+            "# TYPE interview_evaluation_cache_entries gauge",
+            f"interview_evaluation_cache_entries {stats['entries']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+_cache: EvaluationCache | None = None
+_state_lock = threading.Lock()
+
+
+def get_evaluation_cache() -> EvaluationCache:
+    global _cache  # noqa: PLW0603
+    with _state_lock:
+        if _cache is None:
+            _cache = EvaluationCache(
+                capacity=int(os.getenv("EVALUATION_CACHE_SIZE", DEFAULT_CAPACITY)),
+                similarity_threshold=float(os.getenv("EVALUATION_CACHE_SIMILARITY", DEFAULT_SIMILARITY)),
+            )
+        return _cache
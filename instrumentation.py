@@ -0,0 +1,253 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script instrumentation.py
+=========================
+Instrumentação das etapas da entrevista: pesquisa, preparação da pergunta, avaliação,
+follow-up e transcrição.
+
+Cada etapa vira um span com tempo de parede, número de chamadas ao LLM, tokens de prompt
+e de resposta e tempo gasto em ferramentas (buscas na web), associado à sessão em que
+ocorreu. Os spans são gravados em JSONL e agregados por etapa e por sessão, e os
+agregados podem ser exportados em texto no formato do Prometheus.
+
+Os tokens vêm do `UsageMetrics` da crew. Como o CrewAI acumula o uso por LLM (inclusive
+entre cópias dos agentes), cada span registra a diferença entre antes e depois do kickoff;
+crews simultâneas com os mesmos agentes podem dividir essa contagem entre si.
+
+Configuração
+------------
+INSTRUMENTATION_SPANS_PATH: arquivo JSONL dos spans (padrão: .cache/spans.jsonl; vazio desativa)
+
+Run
+---
+uv run instrumentation.py .cache/spans.jsonl  # snapshot Prometheus a partir de um arquivo de spans
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from research_cache import cache_dir
+
+# Sessões mantidas nos agregados por sessão (as mais antigas são descartadas):
+MAX_TRACKED_SESSIONS = 1000
+
+# Campos somados nos agregados por etapa e por sessão:
+COUNTERS = (
+    "seconds",
+    "llm_calls",
+    "prompt_tokens",
+    "completion_tokens",
+    "cached_prompt_tokens",
+    "tool_calls",
+    "tool_seconds",
+)
+
+_session_id: ContextVar[str | None] = ContextVar("interview_session_id", default=None)
+_current_span: ContextVar["Span | None"] = ContextVar("interview_current_span", default=None)
+
+
+@dataclass
+class Span:
+    """Uma execução de uma etapa."""
+
+    stage: str
+    session_id: str | None
+    started_at: float
+    seconds: float = 0.0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    tool_calls: int = 0
+    tool_seconds: float = 0.0
+    error: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+def _empty_totals() -> dict[str, float]:
+    return dict.fromkeys(("count", "errors", *COUNTERS), 0)
+
+
+class Instrumentation:
+    """Recebe os spans, grava-os em JSONL e mantém os agregados por etapa e por sessão."""
+
+    def __init__(self, spans_path: Path | str | None = None):
+        self.spans_path = Path(spans_path) if spans_path else None
+        self._lock = threading.Lock()
+        self._file = None
+        self._by_stage: defaultdict[str, dict[str, float]] = defaultdict(_empty_totals)
+        self._by_session: OrderedDict[str, defaultdict[str, dict[str, float]]] = OrderedDict()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            _accumulate(self._by_stage[span.stage], span)
+            if span.session_id is not None:
+                session = self._by_session.setdefault(span.session_id, defaultdict(_empty_totals))
+                self._by_session.move_to_end(span.session_id)
+                _accumulate(session[span.stage], span)
+                while len(self._by_session) > MAX_TRACKED_SESSIONS:
+                    self._by_session.popitem(last=False)
+            if self.spans_path is not None:
+                if self._file is None:
+                    self._file = self.spans_path.open("a", encoding="utf-8")
+                self._file.write(json.dumps(asdict(span), ensure_ascii=False, default=str) + "\n")
+                self._file.flush()
+
+    def stage_totals(self) -> dict[str, dict[str, float]]:
+        """Totais por etapa desde o início do processo."""
+        with self._lock:
+            return {stage: dict(totals) for stage, totals in self._by_stage.items()}
+
+    def session_totals(self, session_id: str) -> dict[str, dict[str, float]]:
+        """Totais por etapa de uma sessão."""
+        with self._lock:
+            return {stage: dict(totals) for stage, totals in self._by_session.get(session_id, {}).items()}
+
+    def prometheus_snapshot(self) -> str:
+        return format_prometheus(self.stage_totals())
+
+
+def _accumulate(totals: dict[str, float], span: Span) -> None:
+    totals["count"] += 1
+    totals["errors"] += span.error is not None
+    for name in COUNTERS:
+        totals[name] += getattr(span, name)
+
+
+def format_prometheus(stage_totals: dict[str, dict[str, float]]) -> str:
+    """Formata os totais por etapa no formato de exposição de texto do Prometheus."""
+    metrics = [
+        ("interview_stage_duration_seconds", "summary", "Tempo de parede das etapas", None),
+        ("interview_stage_errors_total", "counter", "Execuções de etapa que terminaram em erro", "errors"),
+        ("interview_llm_calls_total", "counter", "Chamadas ao LLM", "llm_calls"),
+        ("interview_prompt_tokens_total", "counter", "Tokens de prompt", "prompt_tokens"),
+        ("interview_cached_prompt_tokens_total", "counter", "Tokens de prompt em cache", "cached_prompt_tokens"),
+        ("interview_completion_tokens_total", "counter", "Tokens de resposta", "completion_tokens"),
+        ("interview_tool_calls_total", "counter", "Chamadas a ferramentas", "tool_calls"),
+        ("interview_tool_seconds_total", "counter", "Tempo gasto em ferramentas", "tool_seconds"),
+    ]
+    lines = []
+    for name, kind, help_text, key in metrics:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for stage, totals in sorted(stage_totals.items()):
+            labels = f'{{stage="{stage}"}}'
+            if key is None:
+                lines.append(f"{name}_sum{labels} {totals['seconds']:.6f}")
+                lines.append(f"{name}_count{labels} {int(totals['count'])}")
+            else:
+                lines.append(f"{name}{labels} {totals[key]:g}")
+    return "\n".join(lines) + "\n"
+
+
+def load_stage_totals(spans: Iterable[dict[str, Any]]) -> dict[str, dict[str, float]]:
+    """Refaz os totais por etapa a partir de spans gravados (ex.: de outro processo)."""
+    instrumentation = Instrumentation()
+    for record in spans:
+        instrumentation.record(Span(**record))
+    return instrumentation.stage_totals()
+
+
+_instrumentation: Instrumentation | None = None
+_instrumentation_lock = threading.Lock()
+
+
+def get_instrumentation() -> Instrumentation:
+    """Retorna o coletor de spans único do processo."""
+    global _instrumentation  # noqa: PLW0603
+    with _instrumentation_lock:
+        if _instrumentation is None:
+            spans_path = os.getenv("INSTRUMENTATION_SPANS_PATH", str(cache_dir() / "spans.jsonl"))
+            _instrumentation = Instrumentation(spans_path or None)
+        return _instrumentation
+
+
+@contextmanager
+def session_scope(session_id: str | None) -> Iterator[None]:
+    """Associa à sessão os spans criados dentro do bloco (inclusive em threads e tarefas filhas)."""
+    token = _session_id.set(session_id)
+    try:
+        yield
+    finally:
+        _session_id.reset(token)
+
+
+def set_session_id(session_id: str | None) -> None:
+    """Associa à sessão os spans criados daqui em diante no contexto atual (um rerun do Streamlit)."""
+    _session_id.set(session_id)
+
+
+@contextmanager
+def span(stage: str, **attributes: Any) -> Iterator[Span]:
+    """Mede uma etapa; o span fica disponível para receber tokens e tempo de ferramentas."""
+    current = Span(stage, _session_id.get(), time.time(), attributes=attributes)
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.seconds = time.perf_counter() - start
+        _current_span.reset(token)
+        get_instrumentation().record(current)
+
+
+def record_span(stage: str, seconds: float, error: str | None = None, **attributes: Any) -> None:
+    """Registra uma etapa medida fora de um bloco `span` (ex.: trabalho feito em outro processo)."""
+    started_at = time.time() - seconds
+    get_instrumentation().record(
+        Span(stage, _session_id.get(), started_at, seconds=seconds, error=error, attributes=attributes)
+    )
+
+
+def record_tool_call(seconds: float) -> None:
+    """Soma uma chamada de ferramenta ao span ativo, se houver."""
+    current = _current_span.get()
+    if current is not None:
+        current.tool_calls += 1
+        current.tool_seconds += seconds
+
+
+def _add_usage(current: Span, before: Any, after: Any) -> None:
+    if after is None:
+        return
+    current.llm_calls += after.successful_requests - before.successful_requests
+    current.prompt_tokens += after.prompt_tokens - before.prompt_tokens
+    current.completion_tokens += after.completion_tokens - before.completion_tokens
+    current.cached_prompt_tokens += after.cached_prompt_tokens - before.cached_prompt_tokens
+
+
+def run_crew(stage: str, crew: Any, **attributes: Any) -> Any:
+    """`crew.kickoff()` instrumentado como a etapa `stage`."""
+    with span(stage, **attributes) as current:
+        before = crew.calculate_usage_metrics()
+        result = crew.kickoff()
+        _add_usage(current, before, result.token_usage)
+        return result
+
+
+async def run_crew_async(stage: str, crew: Any, **attributes: Any) -> Any:
+    """`crew.kickoff_async()` instrumentado como a etapa `stage`."""
+    with span(stage, **attributes) as current:
+        before = crew.calculate_usage_metrics()
+        result = await crew.kickoff_async()
+        _add_usage(current, before, result.token_usage)
+        return result
+
+
+if __name__ == "__main__":
+    with open(sys.argv[1], encoding="utf-8") as file:
+        print(format_prometheus(load_stage_totals(json.loads(line) for line in file if line.strip())), end="")
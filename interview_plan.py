@@ -0,0 +1,131 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script interview_plan.py
+========================
+Plano de entrevista com várias rodadas gerado num único pipeline.
+
+A empresa é pesquisada uma única vez (reaproveitando o cache de pesquisa) e, em seguida,
+as N perguntas são preparadas em paralelo, cada uma com um tema e uma dificuldade
+diferentes. O follow-up de cada rodada começa assim que a pergunta principal dela fica
+pronta, sem esperar as demais rodadas.
+
+Run
+---
+uv run interview_plan.py
+"""
+
+import asyncio
+
+from pydantic import BaseModel, Field
+
+from interview_practice_system import (
+    QuestionAnswerPair,
+    create_follow_up_crew,
+    create_question_preparation_crew,
+    evaluate_answer,
+    research_company,
+)
+from llm_tiers import run_stage_async
+
+DEFAULT_TOPICS = [
+    "fundamentos teóricos do cargo",
+    "resolução de um problema prático",
+    "pilha técnica usada pela empresa",
+    "projeto de sistemas e arquitetura",
+    "boas práticas, qualidade e colaboração",
+]
+
+# Rodadas preparadas ao mesmo tempo (cada uma faz duas chamadas ao LLM em sequência):
+MAX_PARALLEL_ROUNDS = 4
+
+# Níveis conhecidos, do mais fácil ao mais difícil (a interface usa português, o CLI inglês):
+DIFFICULTY_LEVELS = [["fácil", "médio", "difícil"], ["easy", "medium", "hard"]]
+
+
+class InterviewRound(BaseModel):
+    """Uma rodada do plano: pergunta principal e seu follow-up pré-gerado."""
+
+    topic: str = Field(..., description="Tema da rodada")
+    difficulty: str = Field(..., description="Nível de dificuldade da pergunta principal")
+    question: QuestionAnswerPair = Field(..., description="Pergunta principal e sua resposta correta")
+    follow_up: QuestionAnswerPair = Field(..., description="Pergunta de follow-up e sua resposta correta")
+
+
+def mix_difficulties(difficulty: str, num_questions: int) -> list[str]:
+    """
+    Distribui as dificuldades em torno do nível escolhido, da rodada mais fácil para a mais difícil.
+
+    Ex.: "médio" com 4 perguntas -> ["fácil", "médio", "médio", "difícil"]. Níveis desconhecidos
+    são repetidos em todas as rodadas.
+    """
+    for levels in DIFFICULTY_LEVELS:
+        if difficulty.casefold() in levels:
+            base = levels.index(difficulty.casefold())
+            offsets = [0, 1, -1]
+            indexes = [min(max(base + offsets[i % len(offsets)], 0), len(levels) - 1) for i in range(num_questions)]
+            return [levels[index] for index in sorted(indexes)]
+    return [difficulty] * num_questions
+
+
+async def generate_interview_plan(
+    company_name: str,
+    role: str,
+    difficulty: str = "médio",
+    num_questions: int = 3,
+    topics: list[str] | None = None,
+) -> list[InterviewRound]:
+    """
+    Gera um plano de entrevista com `num_questions` rodadas.
+
+    Args:
+        company_name: Nome da empresa
+        role: Cargo desejado
+        difficulty: Dificuldade de referência; as rodadas variam em torno dela
+        num_questions: Número de rodadas
+        topics: Temas das rodadas (usados em ciclo); por padrão `DEFAULT_TOPICS`
+
+    Returns:
+        list[InterviewRound]: Rodadas na ordem em que devem ser feitas
+    """
+    topics = topics or DEFAULT_TOPICS
+    research_summary = await research_company(company_name, role, difficulty)
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_ROUNDS)
+
+    async def prepare_round(topic: str, round_difficulty: str) -> InterviewRound:
+        async with semaphore:
+            # `run_stage` roda cada crew numa cópia: os agentes não são seguros para uso concorrente.
+            preparation_crew = create_question_preparation_crew(round_difficulty, research_summary, topic)
+            question = (await run_stage_async("question_preparation", preparation_crew, topic=topic)).pydantic
+            follow_up_crew = create_follow_up_crew(question.question, company_name, role, round_difficulty)
+            follow_up = (await run_stage_async("follow_up", follow_up_crew, topic=topic)).pydantic
+        return InterviewRound(topic=topic, difficulty=round_difficulty, question=question, follow_up=follow_up)
+
+    return await asyncio.gather(
+        *(
+            prepare_round(topics[i % len(topics)], round_difficulty)
+            for i, round_difficulty in enumerate(mix_difficulties(difficulty, num_questions))
+        )
+    )
+
+
+async def start_interview_plan_practice(company_name: str, role: str, difficulty: str = "easy", num_questions: int = 3):
+    """Prática de entrevista no terminal com todas as rodadas geradas de antemão."""
+    plan = await generate_interview_plan(company_name, role, difficulty, num_questions)
+    for number, interview_round in enumerate(plan, start=1):
+        questions = (("Pergunta", interview_round.question), ("Pergunta de Follow-up", interview_round.follow_up))
+        for label, pair in questions:
+            print(f"\nRodada {number}/{len(plan)} ({interview_round.topic}, {interview_round.difficulty})")
+            print(f"{label}:")
+            print(pair.question)
+            user_answer = input("\nSua resposta: ")
+            print("\nAvaliação:")
+            print(evaluate_answer(pair.question, user_answer, pair.correct_answer))
+
+
+if __name__ == "__main__":
+    company = "Google"
+    role = "Cientista de Dados Junior"
+    print(f"Gerando plano de entrevista para o cargo de {role} na empresa {company}...")
+    asyncio.run(start_interview_plan_practice(company, role))
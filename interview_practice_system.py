@@ -14,11 +14,33 @@ uv run interview_practice_system.py
 """
 
 import asyncio
+import functools
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, TypeVar
 
 from crewai import Agent, Crew, Process, Task
-from crewai_tools import SerperDevTool
+from crewai.tasks.task_output import TaskOutput
 from pydantic import BaseModel, Field
 
+from answer_pregrader import pre_grade_answer
+from evaluation_cache import get_evaluation_cache
+from llm_tiers import agent_llm, run_stage, run_stage_async
+from research_cache import get_research_cache
+from research_compaction import CompanyResearchFacts, fit_to_budget, get_token_budget, record_compaction
+from token_streaming import CrewTokenStream, JsonFieldFilter
+
+if TYPE_CHECKING:
+    from search_cache import CachedSerperDevTool
+
+T = TypeVar("T")
+
+# Campo de um modelo de crew, por exemplo `{user_answer}`:
+_TEMPLATE_FIELD = re.compile(r"\{(\w+)\}")
+
 
 class QuestionAnswerPair(BaseModel):
     """Schema para a pergunta e sua resposta correta."""
@@ -27,59 +49,113 @@ class QuestionAnswerPair(BaseModel):
     correct_answer: str = Field(..., description="A resposta correta para a pergunta")
 
 
-# Inicializa a ferramenta de busca:
-search_tool = SerperDevTool()
+# Em produção (INTERVIEW_ENV=production) o log detalhado dos agentes no console fica desligado:
+VERBOSE = os.getenv("INTERVIEW_ENV", "development") != "production"
+
+
+def _build_once(build: Callable[[], T]) -> Callable[[], T]:
+    """Constrói o objeto no primeiro uso e o reaproveita em todas as chamadas seguintes (thread-safe)."""
+    lock = threading.Lock()
+    built: list[T] = []
+
+    @functools.wraps(build)
+    def get() -> T:
+        with lock:
+            if not built:
+                built.append(build())
+            return built[0]
+
+    return get
+
+
+# Ferramentas, LLMs e agentes são criados no primeiro uso: uma sessão só de avaliação não
+# constrói o pesquisador nem importa o `crewai_tools`.
+@_build_once
+def get_search_tool() -> "CachedSerperDevTool":
+    """Search tool with an on-disk cache and coalescing of concurrent identical searches."""
+    from search_cache import CachedSerperDevTool  # noqa: PLC0415  (importa o crewai_tools, que é pesado)
+
+    return CachedSerperDevTool()
+
 
 # Primeira Crew: Preparação da Pergunta
 # Cria o agente de pesquisa da empresa
-company_researcher = Agent(
-    role="Especialista em Pesquisa de Empresa",
-    goal="Coletar informações sobre a empresa e criar perguntas de entrevista com respostas",
-    backstory="""Você é um especialista em pesquisar empresas e criar perguntas de entrevista técnicas.
-    Você tem conhecimento profundo das práticas de contratação da indústria de tecnologia e pode criar
-    perguntas relevantes que testam tanto conhecimento teórico quanto habilidades práticas.""",
-    tools=[search_tool],
-    verbose=True,
-)
-
-
-question_preparer = Agent(
-    role="Preparador de Perguntas e Respostas",
-    goal="Preparar perguntas e respostas completas com respostas modeladas",
-    backstory="""Você é um entrevistador técnico experiente que sabe como criar
-    perguntas desafiadoras, mas justas, e fornecer respostas detalhadas modeladas.
-    Você entende como avaliar diferentes níveis de habilidade e criar perguntas que
-    testam tanto conhecimento teórico quanto habilidades de resolução de problemas práticas.""",
-    verbose=True,
-)
+@_build_once
+def get_company_researcher() -> Agent:
+    return Agent(
+        role="Especialista em Pesquisa de Empresa",
+        goal="Coletar informações sobre a empresa e criar perguntas de entrevista com respostas",
+        backstory="""Você é um especialista em pesquisar empresas e criar perguntas de entrevista técnicas.
+        Você tem conhecimento profundo das práticas de contratação da indústria de tecnologia e pode criar
+        perguntas relevantes que testam tanto conhecimento teórico quanto habilidades práticas.""",
+        tools=[get_search_tool()],
+        llm=agent_llm("company_researcher"),
+        verbose=VERBOSE,
+    )
+
+
+# Cria o agente que reduz a pesquisa aos fatos úteis para a entrevista (sem ferramentas):
+@_build_once
+def get_research_compactor() -> Agent:
+    return Agent(
+        role="Analista de Pesquisa de Entrevistas",
+        goal="Extrair da pesquisa da empresa apenas os fatos úteis para preparar perguntas de entrevista",
+        backstory="""Você é um analista objetivo que transforma relatórios longos em listas curtas de fatos.
+        Você sabe o que importa para uma entrevista técnica: a pilha técnica, o formato do processo
+        e os temas que costumam ser cobrados.""",
+        llm=agent_llm("research_compactor"),
+        verbose=VERBOSE,
+    )
+
+
+@_build_once
+def get_question_preparer() -> Agent:
+    return Agent(
+        role="Preparador de Perguntas e Respostas",
+        goal="Preparar perguntas e respostas completas com respostas modeladas",
+        backstory="""Você é um entrevistador técnico experiente que sabe como criar
+        perguntas desafiadoras, mas justas, e fornecer respostas detalhadas modeladas.
+        Você entende como avaliar diferentes níveis de habilidade e criar perguntas que
+        testam tanto conhecimento teórico quanto habilidades de resolução de problemas práticas.""",
+        llm=agent_llm("question_preparer"),
+        verbose=VERBOSE,
+    )
 
 
 # Segunda Crew: Avaliação da Resposta
 # Cria o agente de avaliação da resposta:
-answer_evaluator = Agent(
-    role="Avaliador de Respostas",
-    goal="Avaliar se a resposta dada é correta para a pergunta",
-    backstory="""Você é um entrevistador técnico experiente que avalia respostas
-    contra a solução esperada. Você sabe como identificar se uma resposta é
-    técnicamente correta e completa.""",
-    verbose=True,
-)
+@_build_once
+def get_answer_evaluator() -> Agent:
+    return Agent(
+        role="Avaliador de Respostas",
+        goal="Avaliar se a resposta dada é correta para a pergunta",
+        backstory="""Você é um entrevistador técnico experiente que avalia respostas
+        contra a solução esperada. Você sabe como identificar se uma resposta é
+        técnicamente correta e completa.""",
+        llm=agent_llm("answer_evaluator"),
+        verbose=VERBOSE,
+    )
 
 
 # Cria o agente de pergunta de follow-up:
-follow_up_questioner = Agent(
-    role="Especialista em Perguntas de Follow-up",
-    goal="Criar perguntas de follow-up relevantes com base no contexto",
-    backstory="""Você é um entrevistador técnico experiente que sabe como criar
-    perguntas de follow-up significativas que exploram mais profundamente o conhecimento
-    e compreensão do candidato. Você pode criar perguntas que sejam baseadas em respostas
-    anteriores e testem diferentes aspectos da expertise técnica do candidato.""",
-    verbose=True,
-)
+@_build_once
+def get_follow_up_questioner() -> Agent:
+    return Agent(
+        role="Especialista em Perguntas de Follow-up",
+        goal="Criar perguntas de follow-up relevantes com base no contexto",
+        backstory="""Você é um entrevistador técnico experiente que sabe como criar
+        perguntas de follow-up significativas que exploram mais profundamente o conhecimento
+        e compreensão do candidato. Você pode criar perguntas que sejam baseadas em respostas
+        anteriores e testem diferentes aspectos da expertise técnica do candidato.""",
+        llm=agent_llm("follow_up_questioner"),
+        verbose=VERBOSE,
+    )
 
 
 # Cria as tarefas para a primeira crew:
-def create_company_research_task(company_name: str, role: str, difficulty: str) -> Task:
+def create_company_research_task(
+    company_name: str, role: str, difficulty: str, callback: Callable[[TaskOutput], None] | None = None
+) -> Task:
     return Task(
         description=f"""Pesquise {company_name} e colete informações sobre:
         1. Seu processo de entrevista técnica
@@ -88,26 +164,52 @@ def create_company_research_task(company_name: str, role: str, difficulty: str)
         Forneça um resumo de suas descobertas.""",
         expected_output="""Um resumo das descobertas sobre os requisitos técnicos da empresa e seu
                            processo de entrevista técnica""",
-        agent=company_researcher,
+        agent=get_company_researcher(),
+        callback=callback,
     )
 
 
-def create_question_preparation_task(difficulty: str) -> Task:
+def create_research_compaction_task(
+    research_task: Task, token_budget: int, callback: Callable[[TaskOutput], None] | None = None
+) -> Task:
+    return Task(
+        description=f"""Extraia da pesquisa da empresa somente os fatos úteis para preparar perguntas de entrevista:
+        1. Pilha técnica (linguagens, ferramentas e plataformas)
+        2. Formato da entrevista técnica (etapas e tipo de avaliação)
+        3. Temas típicos das perguntas para o cargo
+        Cada item deve ter poucas palavras. Ignore história, cultura e notícias da empresa.
+        O total não deve passar de {token_budget} tokens.""",
+        expected_output="""Listas curtas com a pilha técnica, o formato da entrevista e os temas típicos""",
+        output_pydantic=CompanyResearchFacts,
+        agent=get_research_compactor(),
+        context=[research_task],
+        callback=callback,
+    )
+
+
+def create_question_preparation_task(
+    difficulty: str, research_summary: str | None = None, topic: str | None = None
+) -> Task:
+    # Com a pesquisa já em cache, ela entra direto na descrição (não há tarefa anterior como contexto):
+    research_context = f"\n        Pesquisa da empresa:\n        {research_summary}" if research_summary else ""
+    topic_context = f"\n        O tema da pergunta deve ser: {topic}." if topic else ""
     return Task(
         description=f"""Baseado na pesquisa da empresa, crie:
         1. Uma pergunta técnica no nível de dificuldade {difficulty} que testa tanto teoria quanto prática
         2. Uma resposta modelada que cubra todos os pontos chave
         3. Pontos chave para serem buscados nas respostas do candidato
         A pergunta deve ser apropriada para o nível de dificuldade {difficulty} - desafiadora, mas justa,
-        e a resposta deve ser detalhada.""",
+        e a resposta deve ser detalhada.{topic_context}{research_context}""",
         expected_output="""Uma pergunta e sua resposta correta""",
         output_pydantic=QuestionAnswerPair,
-        agent=question_preparer,
+        agent=get_question_preparer(),
     )
 
 
 # Cria a tarefa para a segunda crew:
-def create_evaluation_task(question: str, user_answer: str, correct_answer: str) -> Task:
+def create_evaluation_task(
+    question: str, user_answer: str, correct_answer: str, callback: Callable[[TaskOutput], None] | None = None
+) -> Task:
     return Task(
         description=f"""Avalie se a resposta dada é correta para a pergunta:
         Pergunta: {question}
@@ -118,7 +220,8 @@ def create_evaluation_task(question: str, user_answer: str, correct_answer: str)
         2. Pontos chave que foram corretos ou faltantes
         3. Uma explicação breve de por que a resposta é correta ou incorreta""",
         expected_output="""Uma avaliação de se a resposta é correta para a pergunta com feedback""",
-        agent=answer_evaluator,
+        agent=get_answer_evaluator(),
+        callback=callback,
     )
 
 
@@ -138,46 +241,65 @@ def create_follow_up_question_task(question: str, company_name: str, role: str,
         técnica e as habilidades de resolução de problemas do candidato.""",
         expected_output="""Uma pergunta de follow-up que seja baseada na pergunta original""",
         output_pydantic=QuestionAnswerPair,
-        agent=follow_up_questioner,
+        agent=get_follow_up_questioner(),
     )
 
 
-def create_follow_up_crew(question: str, company_name: str, role: str, difficulty: str) -> Crew:
-    """Inicializa a crew responsável por criar perguntas de follow-up."""
-    crew = Crew(
-        agents=[follow_up_questioner],
-        tasks=[
-            create_follow_up_question_task(question, company_name, role, difficulty),
-        ],
+def _fill_crew_template(template: Crew, **values: str) -> Crew:
+    """
+    Copia uma crew modelo e preenche os campos `{nome}` das descrições das tarefas.
+
+    O preenchimento é feito numa única passada, e não com `kickoff(inputs=...)`: a interpolação
+    do CrewAI troca um campo de cada vez, então um `{correct_answer}` escrito na resposta do
+    candidato seria depois substituído pela resposta correta.
+    """
+    crew = template.copy()
+    for task in crew.tasks:
+        task.description = _TEMPLATE_FIELD.sub(lambda match: values[match.group(1)], task.description)
+    return crew
+
+
+# As crews de avaliação e de follow-up são montadas uma única vez, com campos no lugar dos
+# textos de cada chamada; cada chamada usa uma cópia preenchida.
+@_build_once
+def get_follow_up_crew_template() -> Crew:
+    return Crew(
+        agents=[get_follow_up_questioner()],
+        tasks=[create_follow_up_question_task("{question}", "{company_name}", "{role}", "{difficulty}")],
         process=Process.sequential,
-        verbose=True,
+        verbose=VERBOSE,
+    )
+
+
+def create_follow_up_crew(question: str, company_name: str, role: str, difficulty: str) -> Crew:
+    """Inicializa a crew responsável por criar perguntas de follow-up (uma cópia preenchida do modelo)."""
+    return _fill_crew_template(
+        get_follow_up_crew_template(),
+        question=question,
+        company_name=company_name,
+        role=role,
+        difficulty=difficulty,
     )
-    return crew
 
 
 async def generate_follow_up_question(
     question: str, company_name: str, role: str, difficulty: str
 ) -> QuestionAnswerPair:
     """Gera uma pergunta de follow-up assincronamente."""
-    result = await create_follow_up_crew(question, company_name, role, difficulty).kickoff_async()
+    result = await run_stage_async("follow_up", create_follow_up_crew(question, company_name, role, difficulty))
     return result.pydantic
 
 
 # Função para iniciar a prática de entrevista:
-async def start_interview_practice(company_name: str, role: str, difficulty: str = "easy"):
-    # Primeira Crew: Preparar a pergunta e a resposta
-    preparation_crew = Crew(
-        agents=[company_researcher, question_preparer],
-        tasks=[
-            create_company_research_task(company_name, role, difficulty),
-            create_question_preparation_task(difficulty),
-        ],
-        process=Process.sequential,
-        verbose=True,
-    )
+async def start_interview_practice(
+    company_name: str, role: str, difficulty: str = "easy", ask: Callable[[str], str] = input
+):
+    # `ask` lê as respostas do usuário (no benchmark, respostas roteirizadas no lugar de `input`)
+    # Primeira Crew: Preparar a pergunta e a resposta (reaproveita a pesquisa em cache)
+    preparation_crew = initialize_preparation_crew(company_name, role, difficulty)
 
     # Executa a primeira crew para obter a pergunta e a resposta modelada
-    preparation_result = preparation_crew.kickoff()
+    preparation_result = run_stage("question_preparation", preparation_crew)
 
     # Gera uma pergunta de follow-up logo após a preparação (assincronamente)
 
@@ -193,28 +315,18 @@ async def start_interview_practice(company_name: str, role: str, difficulty: str
     # Imprime a pergunta principal e obtém a resposta do usuário:
     print("\nPergunta:")
     print(preparation_result.pydantic.question)
-    user_answer = input("\nSua resposta: ")
+    user_answer = ask("\nSua resposta: ")
 
-    # Segunda Crew: Avaliar a resposta
-    evaluation_crew = Crew(
-        agents=[answer_evaluator],
-        tasks=[
-            create_evaluation_task(
-                question=preparation_result.pydantic.question,
-                user_answer=user_answer,
-                correct_answer=preparation_result.pydantic.correct_answer,
-            )
-        ],
-        process=Process.sequential,
-        verbose=True,
+    # Segunda Crew: Avaliar a resposta (respostas triviais são avaliadas localmente)
+    evaluation_result = evaluate_answer(
+        question=preparation_result.pydantic.question,
+        user_answer=user_answer,
+        correct_answer=preparation_result.pydantic.correct_answer,
     )
-
-    # Executa a segunda crew e obtém a avaliação:
-    evaluation_result = evaluation_crew.kickoff()
     print("\nAvaliação:")
     print(evaluation_result)
 
-    input("\nPressione Enter para continuar para a pergunta de follow-up...")
+    ask("\nPressione Enter para continuar para a pergunta de follow-up...")
 
     # Obtém a pergunta de follow-up (deve estar pronta agora):
     follow_up_question_result = await follow_up_question_task
@@ -222,63 +334,168 @@ async def start_interview_practice(company_name: str, role: str, difficulty: str
     # Mostra a pergunta de follow-up pré-gerada:
     print("\nPergunta de Follow-up:")
     print(follow_up_question_result.question)
-    follow_up_answer = input("\nSua resposta para a pergunta de follow-up: ")
+    follow_up_answer = ask("\nSua resposta para a pergunta de follow-up: ")
 
     # Avalia a resposta de follow-up:
-    follow_up_evaluation_crew = Crew(
-        agents=[answer_evaluator],
-        tasks=[
-            create_evaluation_task(
-                question=follow_up_question_result.question,
-                user_answer=follow_up_answer,
-                correct_answer=follow_up_question_result.correct_answer,
-            )
-        ],
-        process=Process.sequential,
-        verbose=True,
+    follow_up_evaluation = evaluate_answer(
+        question=follow_up_question_result.question,
+        user_answer=follow_up_answer,
+        correct_answer=follow_up_question_result.correct_answer,
     )
-
-    # Executa a avaliação de follow-up:
-    follow_up_evaluation = follow_up_evaluation_crew.kickoff()
     print("\nAvaliação de Follow-up:")
     print(follow_up_evaluation)
 
 
-if __name__ == "__main__":
-    company = "Google"
-    role = "Cientista de Dados Junior"
-    print(f"Iniciando prática de entrevista mock para o cargo de {role} na empresa {company}...")
-    asyncio.run(start_interview_practice(company, role))
-
-
 # -------------------------------------------------------------------------------------
 # Para o aplicativo Streamlit
 # -------------------------------------------------------------------------------------
 def initialize_preparation_crew(company_name: str, role: str, difficulty: str) -> Crew:
-    """Initialize the crew responsible for preparing interview questions."""
+    """Initialize the crew responsible for preparing interview questions.
+
+    When the company research is cached, the crew skips straight to question preparation.
+    Otherwise the research is compacted to the token budget and only the compact facts
+    reach the question preparer; they are cached as soon as the compaction finishes.
+    """
+    research_summary = get_research_cache().get(company_name, role, difficulty)
+    if research_summary is not None:
+        return create_question_preparation_crew(difficulty, research_summary)
+
+    research_tasks = create_compacted_research_tasks(company_name, role, difficulty)
+    preparation_task = create_question_preparation_task(difficulty)
+    # Sem contexto explícito o processo sequencial passaria também o resumo completo da pesquisa:
+    preparation_task.context = [research_tasks[-1]]
     return Crew(
-        agents=[company_researcher, question_preparer],
-        tasks=[
-            create_company_research_task(company_name, role, difficulty),
-            create_question_preparation_task(difficulty),
-        ],
+        agents=[get_company_researcher(), get_research_compactor(), get_question_preparer()],
+        tasks=[*research_tasks, preparation_task],
         process=Process.sequential,
-        verbose=True,
+        verbose=VERBOSE,
     )
 
 
-def evaluate_answer(question: str, user_answer: str, correct_answer: str) -> str:
-    """Create and execute the evaluation crew to assess the user's answer."""
-    evaluation_crew = Crew(
-        agents=[answer_evaluator],
+def create_compacted_research_tasks(company_name: str, role: str, difficulty: str) -> list[Task]:
+    """Create the research task followed by its compaction, which caches and reports the compact summary."""
+    research_cache = get_research_cache()
+    token_budget = get_token_budget()
+    # Preenchido pelo callback da pesquisa; não usa `research_task.output` porque `Crew.copy()` troca as tarefas:
+    research = {"summary": "", "finished_at": time.perf_counter()}
+
+    def keep_research(output: TaskOutput) -> None:
+        research.update(summary=output.raw, finished_at=time.perf_counter())
+
+    research_task = create_company_research_task(company_name, role, difficulty, callback=keep_research)
+
+    def compact_research(output: TaskOutput) -> None:
+        if isinstance(output.pydantic, CompanyResearchFacts):
+            output.pydantic = fit_to_budget(output.pydantic, token_budget)
+            # A tarefa seguinte e o resultado da crew leem esta mesma saída:
+            output.raw = output.pydantic.render()
+        research_cache.put(company_name, role, difficulty, output.raw)
+        record_compaction(research["summary"], output.raw, time.perf_counter() - research["finished_at"])
+
+    return [research_task, create_research_compaction_task(research_task, token_budget, callback=compact_research)]
+
+
+async def research_company(company_name: str, role: str, difficulty: str) -> str:
+    """Return the compact company research, running the research crew only on a cache miss."""
+    research_summary = get_research_cache().get(company_name, role, difficulty)
+    if research_summary is None:
+        research_crew = Crew(
+            agents=[get_company_researcher(), get_research_compactor()],
+            tasks=create_compacted_research_tasks(company_name, role, difficulty),
+            process=Process.sequential,
+            verbose=VERBOSE,
+        )
+        research_summary = (await run_stage_async("research", research_crew)).raw
+    return research_summary
+
+
+def create_question_preparation_crew(difficulty: str, research_summary: str, topic: str | None = None) -> Crew:
+    """Initialize a crew that prepares one question from an already available research summary."""
+    return Crew(
+        agents=[get_question_preparer()],
+        tasks=[create_question_preparation_task(difficulty, research_summary=research_summary, topic=topic)],
+        process=Process.sequential,
+        verbose=VERBOSE,
+    )
+
+
+def prepare_question(company_name: str, role: str, difficulty: str) -> QuestionAnswerPair:
+    """Run the preparation crew and return the generated question with its model answer."""
+    return run_stage("question_preparation", initialize_preparation_crew(company_name, role, difficulty)).pydantic
+
+
+@_build_once
+def get_evaluation_crew_template() -> Crew:
+    return Crew(
+        agents=[get_answer_evaluator()],
         tasks=[
             create_evaluation_task(
-                question=question,
-                user_answer=user_answer,
-                correct_answer=correct_answer,
+                question="{question}", user_answer="{user_answer}", correct_answer="{correct_answer}"
             )
         ],
         process=Process.sequential,
-        verbose=True,
+        verbose=VERBOSE,
+    )
+
+
+def create_evaluation_crew(question: str, user_answer: str, correct_answer: str) -> Crew:
+    """Initialize the crew responsible for evaluating the user's answer (a filled copy of the template).
+
+    Every evaluation the crew (or a copy of it) produces is stored in the evaluation cache,
+    so near-duplicate answers to the same question can reuse it.
+    """
+
+    def cache_evaluation(output: TaskOutput) -> None:
+        get_evaluation_cache().put(question, correct_answer, user_answer, output.raw)
+
+    crew = _fill_crew_template(
+        get_evaluation_crew_template(),
+        question=question,
+        user_answer=user_answer,
+        correct_answer=correct_answer,
     )
-    return evaluation_crew.kickoff()
+    crew.tasks[0].callback = cache_evaluation
+    return crew
+
+
+def evaluate_without_llm(question: str, user_answer: str, correct_answer: str) -> str | None:
+    """Return an evaluation that needs no LLM call (a definite pre-grade or a cached near-duplicate), or None."""
+    pre_grade = pre_grade_answer(question, user_answer, correct_answer)
+    if pre_grade.feedback is not None:
+        return pre_grade.feedback
+    return get_evaluation_cache().get(question, correct_answer, user_answer)
+
+
+def evaluate_answer(question: str, user_answer: str, correct_answer: str) -> str:
+    """Assess the user's answer, running the evaluation crew only when no local evaluation is available."""
+    evaluation = evaluate_without_llm(question, user_answer, correct_answer)
+    if evaluation is not None:
+        return evaluation
+    return run_stage("evaluation", create_evaluation_crew(question, user_answer, correct_answer)).raw
+
+
+async def evaluate_answer_async(question: str, user_answer: str, correct_answer: str) -> str:
+    """Evaluate the user's answer without blocking the event loop, so it can overlap other crews."""
+    evaluation = evaluate_without_llm(question, user_answer, correct_answer)
+    if evaluation is not None:
+        return evaluation
+    result = await run_stage_async("evaluation", create_evaluation_crew(question, user_answer, correct_answer))
+    return result.raw
+
+
+def stream_evaluation(question: str, user_answer: str, correct_answer: str) -> CrewTokenStream:
+    """Streaming variant of the evaluation crew (call `evaluate_without_llm` first, as `evaluate_answer` does)."""
+    return CrewTokenStream("evaluation", create_evaluation_crew(question, user_answer, correct_answer))
+
+
+def stream_follow_up_question(question: str, company_name: str, role: str, difficulty: str) -> CrewTokenStream:
+    """Streaming variant of `generate_follow_up_question`: streams the follow-up question text."""
+    crew = create_follow_up_crew(question, company_name, role, difficulty)
+    return CrewTokenStream("follow_up", crew, JsonFieldFilter("question"))
+
+
+if __name__ == "__main__":
+    company = "Google"
+    role = "Cientista de Dados Junior"
+    print(f"Iniciando prática de entrevista mock para o cargo de {role} na empresa {company}...")
+    asyncio.run(start_interview_practice(company, role))
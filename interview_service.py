@@ -0,0 +1,366 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script interview_service.py
+===========================
+Serviço HTTP assíncrono de entrevistas simuladas, sem interface.
+
+No CLI cada usuário bloqueia em `input()` e no Streamlit cada sessão prende uma thread de
+script enquanto o `kickoff()` roda. Aqui um único loop asyncio atende centenas de sessões:
+as crews rodam com um limite global de chamadas simultâneas ao LLM, as perguntas saem
+do banco de perguntas e da pesquisa em cache compartilhados, e o estado de cada sessão
+fica num registro JSON compacto em SQLite (não na memória de uma interface), então o
+processo pode reiniciar sem perder as sessões. O limite vale por tentativa de cada etapa:
+a cópia em paralelo, o modelo reserva e as tentativas que perderam o prazo mas ainda
+estão chamando o LLM também ocupam vagas. As sessões inativas além do TTL são removidas
+periodicamente, junto com o que o serviço guardava delas em memória.
+
+Fluxo de uma sessão: pergunta principal -> resposta -> avaliação -> pergunta de
+follow-up -> resposta -> avaliação -> nova pergunta principal... O follow-up começa a ser
+gerado assim que a pergunta principal é entregue, e a próxima pergunta principal assim
+que o follow-up é respondido.
+
+Endpoints
+---------
+POST   /sessions                  {"company", "role", "difficulty"} -> {"session_id"}
+GET    /sessions/{id}             estado da sessão (sem as respostas corretas)
+GET    /sessions/{id}/question    próxima pergunta (espera a geração, se preciso)
+POST   /sessions/{id}/answer      {"answer"} -> {"evaluation"}
+DELETE /sessions/{id}             encerra a sessão
+GET    /metrics                   métricas por etapa, da pré-avaliação e do cache de avaliações
+
+Run
+---
+uv run interview_service.py --port 8080 --llm-concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+from answer_pregrader import get_pre_grader
+from evaluation_cache import get_evaluation_cache
+from instrumentation import get_instrumentation, session_scope
+from interview_practice_system import (
+    QuestionAnswerPair,
+    create_evaluation_crew,
+    create_follow_up_crew,
+    evaluate_without_llm,
+    initialize_preparation_crew,
+)
+from llm_tiers import StageDeadlineError, run_stage_async
+from question_pool import get_question_pool
+from research_cache import cache_dir
+
+# Sessões sem atividade por mais tempo que isto são removidas do registro:
+SESSION_TTL_SECONDS = 24 * 3600
+PURGE_INTERVAL_SECONDS = 3600
+
+
+class UnknownSessionError(KeyError):
+    """A sessão não existe (ou já expirou)."""
+
+
+class InvalidSessionStateError(RuntimeError):
+    """A operação não cabe no momento da sessão (ex.: responder sem pergunta em aberto)."""
+
+
+class SessionStore:
+    """Estado das sessões como JSON compacto em SQLite."""
+
+    def __init__(self, path: Path | str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, session_id: str) -> dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            raise UnknownSessionError(session_id)
+        return json.loads(row[0])
+
+    def put(self, session_id: str, state: dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                (session_id, json.dumps(state, ensure_ascii=False, separators=(",", ":")), time.time()),
+            )
+            self._conn.commit()
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self._conn.commit()
+
+    def purge(self, max_idle_seconds: float = SESSION_TTL_SECONDS) -> list[str]:
+        """Remove as sessões inativas há mais de `max_idle_seconds` e retorna os ids removidos."""
+        with self._lock:
+            rows = self._conn.execute(
+                "DELETE FROM sessions WHERE updated_at < ? RETURNING id", (time.time() - max_idle_seconds,)
+            ).fetchall()
+            self._conn.commit()
+        return [session_id for (session_id,) in rows]
+
+
+class InterviewService:
+    """Orquestra as sessões sobre as crews de `interview_practice_system`."""
+
+    def __init__(self, store: SessionStore, llm_concurrency: int = 8):
+        self.store = store
+        # Vagas ocupadas por tentativa (inclusive cópias e tentativas órfãs), nas threads de `run_stage`:
+        self._llm_slots = threading.BoundedSemaphore(llm_concurrency)
+        self._loop = asyncio.get_running_loop()
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Gerações por (sessão, tipo), em andamento ou já concluídas: a tarefa só sai daqui quando
+        # a pergunta gerada é entregue (ou a sessão termina), para não gerar a mesma pergunta duas vezes.
+        self._jobs: dict[tuple[str, str], asyncio.Task] = {}
+
+    async def start_session(self, company_name: str, role: str, difficulty: str) -> str:
+        session_id = uuid.uuid4().hex
+        state = {
+            "company": company_name,
+            "role": role,
+            "difficulty": difficulty,
+            "question": None,
+            "seen": [],
+            "history": [],
+        }
+        self.store.put(session_id, state)
+        self._background(session_id, "main", self._prepare_main_question(session_id, state))
+        return session_id
+
+    def describe(self, session_id: str) -> dict[str, Any]:
+        """Estado público da sessão (sem as respostas corretas)."""
+        state = self.store.get(session_id)
+        question = state["question"]
+        return {
+            "session_id": session_id,
+            "company": state["company"],
+            "role": state["role"],
+            "difficulty": state["difficulty"],
+            "question": None if question is None else {"text": question["question"], "kind": question["kind"]},
+            "history": [
+                {key: turn[key] for key in ("kind", "question", "answer", "evaluation")} for turn in state["history"]
+            ],
+        }
+
+    async def next_question(self, session_id: str) -> dict[str, str]:
+        """Pergunta em aberto ou, se não houver, a próxima (follow-up ou nova pergunta principal)."""
+        state = self.store.get(session_id)
+        if state["question"] is None:
+            last_kind = state["history"][-1]["kind"] if state["history"] else None
+            kind = "follow_up" if last_kind == "main" else "main"
+            pair = await self._wait_for(session_id, kind)
+            async with self._lock(session_id):
+                state = self.store.get(session_id)
+                if state["question"] is None:
+                    state["question"] = {**pair.model_dump(), "kind": kind}
+                    state["seen"].append(pair.question)
+                    self.store.put(session_id, state)
+                    self._consume(session_id, kind)
+                    if kind == "main":
+                        self._background(session_id, "follow_up", self._generate_follow_up(session_id, state))
+        return {"text": state["question"]["question"], "kind": state["question"]["kind"]}
+
+    async def submit_answer(self, session_id: str, answer: str) -> str:
+        """Avalia a resposta para a pergunta em aberto e devolve a avaliação."""
+        async with self._lock(session_id):
+            state = self.store.get(session_id)
+            question = state["question"]
+            if question is None:
+                raise InvalidSessionStateError("Não há pergunta em aberto nesta sessão.")
+            with session_scope(session_id):
+                evaluation = evaluate_without_llm(question["question"], answer, question["correct_answer"])
+            if evaluation is None:
+                crew = create_evaluation_crew(question["question"], answer, question["correct_answer"])
+                evaluation = (await self._run(session_id, "evaluation", crew)).raw
+
+            state["history"].append({**question, "answer": answer, "evaluation": evaluation})
+            state["question"] = None
+            self.store.put(session_id, state)
+        if question["kind"] == "follow_up":
+            self._background(session_id, "main", self._prepare_main_question(session_id, state))
+        return evaluation
+
+    def end_session(self, session_id: str) -> None:
+        self._forget(session_id)
+        self.store.delete(session_id)
+
+    def purge_idle(self, max_idle_seconds: float = SESSION_TTL_SECONDS) -> int:
+        """Remove as sessões inativas do registro e da memória do serviço. Retorna quantas foram removidas."""
+        purged = self.store.purge(max_idle_seconds)
+        for session_id in purged:
+            self._forget(session_id)
+        return len(purged)
+
+    async def purge_periodically(self, interval: float = PURGE_INTERVAL_SECONDS) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.purge_idle()
+
+    def _forget(self, session_id: str) -> None:
+        """Cancela as gerações da sessão e descarta o que o serviço guardava dela em memória."""
+        for kind in ("main", "follow_up"):
+            job = self._jobs.pop((session_id, kind), None)
+            if job is not None:
+                job.cancel()
+        self._locks.pop(session_id, None)
+
+    def _lock(self, session_id: str) -> asyncio.Lock:
+        return self._locks.setdefault(session_id, asyncio.Lock())
+
+    def _background(self, session_id: str, kind: str, coro: Coroutine[Any, Any, QuestionAnswerPair]) -> None:
+        with session_scope(session_id):
+            self._jobs[(session_id, kind)] = asyncio.create_task(coro)
+
+    def _consume(self, session_id: str, kind: str) -> None:
+        """Descarta a geração concluída cuja pergunta acabou de ser entregue."""
+        job = self._jobs.get((session_id, kind))
+        if job is not None and job.done():
+            del self._jobs[(session_id, kind)]
+
+    async def _wait_for(self, session_id: str, kind: str) -> QuestionAnswerPair:
+        job = self._jobs.get((session_id, kind))
+        if job is not None:
+            try:
+                # Já concluída, devolve o resultado guardado; senão espera a geração em andamento.
+                return await asyncio.shield(job)
+            except Exception:
+                # Uma geração que falhou não fica guardada: o próximo pedido tenta de novo.
+                if self._jobs.get((session_id, kind)) is job:
+                    del self._jobs[(session_id, kind)]
+                raise
+        # Sem geração em andamento (ex.: o processo reiniciou): gera agora.
+        state = self.store.get(session_id)
+        if kind == "follow_up":
+            return await self._generate_follow_up(session_id, state)
+        return await self._prepare_main_question(session_id, state)
+
+    def generate_for_pool(self, company_name: str, role: str, difficulty: str) -> QuestionAnswerPair:
+        """
+        Gerador do banco de perguntas quando ele roda dentro do serviço.
+
+        Chamado na thread do produtor; a crew roda no loop do serviço e ocupa uma das vagas
+        de `llm_concurrency`, como as crews das sessões.
+        """
+        crew = initialize_preparation_crew(company_name, role, difficulty)
+        future = asyncio.run_coroutine_threadsafe(self._run(None, "question_preparation", crew), self._loop)
+        return future.result().pydantic
+
+    async def _run(self, session_id: str | None, stage: str, crew: Any) -> Any:
+        # `run_stage` roda cada crew numa cópia (os agentes não são seguros para uso concorrente) e
+        # cada tentativa ocupa uma vaga do limite global até terminar, para não estourar o rate limit.
+        with session_scope(session_id):
+            return await run_stage_async(stage, crew, slots=self._llm_slots)
+
+    async def _prepare_main_question(self, session_id: str, state: dict[str, Any]) -> QuestionAnswerPair:
+        company_name, role, difficulty = state["company"], state["role"], state["difficulty"]
+        pair = get_question_pool().take(company_name, role, difficulty, seen=set(state["seen"]))
+        if pair is None:
+            crew = initialize_preparation_crew(company_name, role, difficulty)
+            pair = (await self._run(session_id, "question_preparation", crew)).pydantic
+        return pair
+
+    async def _generate_follow_up(self, session_id: str, state: dict[str, Any]) -> QuestionAnswerPair:
+        question = state["question"]["question"] if state["question"] else state["history"][-1]["question"]
+        crew = create_follow_up_crew(question, state["company"], state["role"], state["difficulty"])
+        return (await self._run(session_id, "follow_up", crew)).pydantic
+
+
+def create_app(service: InterviewService) -> web.Application:
+    routes = web.RouteTableDef()
+
+    @routes.post("/sessions")
+    async def start_session(request: web.Request) -> web.Response:
+        body = await request.json()
+        session_id = await service.start_session(body["company"], body["role"], body.get("difficulty", "médio"))
+        return web.json_response({"session_id": session_id}, status=201)
+
+    @routes.get("/sessions/{session_id}")
+    async def describe(request: web.Request) -> web.Response:
+        return web.json_response(service.describe(request.match_info["session_id"]))
+
+    @routes.get("/sessions/{session_id}/question")
+    async def next_question(request: web.Request) -> web.Response:
+        return web.json_response(await service.next_question(request.match_info["session_id"]))
+
+    @routes.post("/sessions/{session_id}/answer")
+    async def submit_answer(request: web.Request) -> web.Response:
+        body = await request.json()
+        evaluation = await service.submit_answer(request.match_info["session_id"], body["answer"])
+        return web.json_response({"evaluation": evaluation})
+
+    @routes.delete("/sessions/{session_id}")
+    async def end_session(request: web.Request) -> web.Response:
+        service.end_session(request.match_info["session_id"])
+        return web.Response(status=204)
+
+    @routes.get("/metrics")
+    async def metrics(_: web.Request) -> web.Response:
+        snapshot = (
+            get_instrumentation().prometheus_snapshot()
+            + get_pre_grader().prometheus_snapshot()
+            + get_evaluation_cache().prometheus_snapshot()
+        )
+        return web.Response(text=snapshot, content_type="text/plain")
+
+    @web.middleware
+    async def errors(request: web.Request, handler: Any) -> web.StreamResponse:
+        try:
+            return await handler(request)
+        except UnknownSessionError as e:
+            raise web.HTTPNotFound(text=f"Sessão desconhecida: {e.args[0]}") from e
+        except InvalidSessionStateError as e:
+            raise web.HTTPConflict(text=str(e)) from e
+        except StageDeadlineError as e:
+            raise web.HTTPGatewayTimeout(text=str(e)) from e
+        except (KeyError, json.JSONDecodeError) as e:
+            raise web.HTTPBadRequest(text=f"Requisição inválida: {e!s}") from e
+
+    app = web.Application(middlewares=[errors])
+    app.add_routes(routes)
+    return app
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    # Cada etapa espera vaga e acompanha suas tentativas numa thread do executor padrão (as
+    # tentativas rodam em threads próprias): cabem as que executam e uma fila do mesmo tamanho.
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=args.llm_concurrency * 2 + 4))
+    store = SessionStore(cache_dir() / "sessions.sqlite3")
+    store.purge()
+    service = InterviewService(store, args.llm_concurrency)
+    purging = asyncio.create_task(service.purge_periodically())
+    # As perguntas pré-geradas também passam pelo limite de crews simultâneas do serviço:
+    get_question_pool().generate = service.generate_for_pool
+    runner = web.AppRunner(create_app(service))
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    print(f"Serviço de entrevistas em http://{args.host}:{args.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        purging.cancel()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço HTTP assíncrono de entrevistas simuladas")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--llm-concurrency", type=int, default=8, help="Crews executando ao mesmo tempo")
+    asyncio.run(_serve(parser.parse_args()))
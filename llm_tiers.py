@@ -0,0 +1,297 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script llm_tiers.py
+===================
+LLM por agente, prazos por etapa, requisições duplicadas (hedging) e modelo reserva.
+
+Todos os agentes usavam o mesmo LLM padrão sem timeout, e uma única resposta lenta
+travava a sessão. Aqui:
+
+- cada agente tem seu modelo e seu timeout por chamada (ex.: avaliações curtas num
+  modelo menor e mais rápido);
+- cada etapa tem um prazo; quando ele estoura, a etapa é refeita uma vez com o modelo
+  reserva (mais barato), com metade do prazo. Sem modelo reserva, a etapa falha com
+  `StageDeadlineError`. A latência de uma etapa fica limitada a ~1,5x o prazo;
+- nas etapas curtas (avaliação e follow-up), se a execução passa do percentil
+  `HEDGE_PERCENTILE` das latências recentes da etapa, uma cópia da crew é disparada em
+  paralelo e vale a que terminar primeiro.
+
+Cada tentativa roda numa thread própria e numa cópia da crew (`Crew.copy()` copia também
+os agentes): os agentes do processo são compartilhados e a execução altera o estado deles
+(`agent_executor`, `crew`), então duas execuções sobre os mesmos agentes disputariam esse
+estado. A tentativa que perde não pode ser interrompida: ela termina em segundo plano (o
+timeout por chamada do LLM limita quanto ainda gasta) e o resultado é descartado.
+
+Quem limita as chamadas simultâneas ao LLM (ex.: o `interview_service.py`) passa um
+semáforo em `slots`: cada tentativa ocupa uma vaga até a thread dela terminar, inclusive
+a que perdeu a corrida ou passou do prazo. A cópia em paralelo só é disparada se houver
+vaga livre naquele momento.
+
+Configuração
+------------
+LLM_MODEL_<AGENTE>: modelo do agente, ex.: LLM_MODEL_ANSWER_EVALUATOR=gpt-4o-mini (padrão: MODEL)
+LLM_TIMEOUT_<AGENTE>: timeout de cada chamada do agente em segundos (padrão em AGENT_TIMEOUT_SECONDS)
+LLM_FALLBACK_MODEL: modelo reserva usado quando a etapa estoura o prazo (padrão: nenhum)
+<ETAPA>_DEADLINE_SECONDS: prazo da etapa, ex.: EVALUATION_DEADLINE_SECONDS=45 (padrão em STAGE_DEADLINE_SECONDS)
+HEDGED_STAGES: etapas com requisição duplicada, separadas por vírgula (padrão: evaluation,follow_up)
+HEDGE_PERCENTILE: percentil da latência recente a partir do qual a cópia é disparada (padrão: 95)
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any
+
+import numpy as np
+from crewai import LLM, Crew
+
+from instrumentation import run_crew
+
+# Mesmo padrão do CrewAI quando MODEL não está definido:
+DEFAULT_MODEL = "gpt-4.1-mini"
+
+AGENT_TIMEOUT_SECONDS = {
+    "company_researcher": 60.0,
+    "research_compactor": 30.0,
+    "question_preparer": 60.0,
+    "answer_evaluator": 30.0,
+    "follow_up_questioner": 45.0,
+}
+STAGE_DEADLINE_SECONDS = {
+    "research": 240.0,
+    "question_preparation": 300.0,
+    "evaluation": 60.0,
+    "follow_up": 90.0,
+}
+DEFAULT_TIMEOUT_SECONDS = 60.0
+DEFAULT_DEADLINE_SECONDS = 300.0
+# O modelo reserva recebe esta fração do prazo da etapa:
+FALLBACK_DEADLINE_FRACTION = 0.5
+
+# Latências recentes por etapa usadas no percentil do hedging:
+LATENCY_WINDOW = 200
+MIN_HEDGE_SAMPLES = 20
+
+
+class StageDeadlineError(TimeoutError):
+    """A etapa não terminou no prazo (nem com o modelo reserva)."""
+
+
+def _env_name(name: str) -> str:
+    return name.upper().replace("-", "_")
+
+
+def agent_llm(agent: str) -> LLM:
+    """LLM do agente, com o modelo e o timeout por chamada configurados para ele."""
+    model = (
+        os.getenv(f"LLM_MODEL_{_env_name(agent)}")
+        or os.getenv("MODEL")
+        or os.getenv("MODEL_NAME")
+        or os.getenv("OPENAI_MODEL_NAME")
+        or DEFAULT_MODEL
+    )
+    default_timeout = AGENT_TIMEOUT_SECONDS.get(agent, DEFAULT_TIMEOUT_SECONDS)
+    timeout = float(os.getenv(f"LLM_TIMEOUT_{_env_name(agent)}", default_timeout))
+    base_url = os.getenv("BASE_URL") or os.getenv("OPENAI_API_BASE") or os.getenv("OPENAI_BASE_URL")
+    return LLM(model=model, timeout=timeout, base_url=base_url)
+
+
+def stage_deadline(stage: str) -> float:
+    return float(
+        os.getenv(f"{_env_name(stage)}_DEADLINE_SECONDS", STAGE_DEADLINE_SECONDS.get(stage, DEFAULT_DEADLINE_SECONDS))
+    )
+
+
+def _fallback_copy(crew: Crew) -> Crew | None:
+    """Cópia da crew com os agentes no modelo reserva (mantendo o timeout de cada um), ou None."""
+    model = os.getenv("LLM_FALLBACK_MODEL")
+    if not model:
+        return None
+    crew = crew.copy()
+    base_url = os.getenv("BASE_URL") or os.getenv("OPENAI_API_BASE") or os.getenv("OPENAI_BASE_URL")
+    for agent in crew.agents:
+        agent.llm = LLM(model=model, timeout=getattr(agent.llm, "timeout", None), base_url=base_url)
+    return crew
+
+
+class _StageLatencies:
+    """Latências recentes por etapa e contadores de hedging e de modelo reserva."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seconds: defaultdict[str, deque[float]] = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self._counters: defaultdict[str, dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(("runs", "hedges", "hedge_wins", "hedges_skipped", "fallbacks", "deadline_errors"), 0)
+        )
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._seconds[stage].append(seconds)
+
+    def count(self, stage: str, counter: str) -> None:
+        with self._lock:
+            self._counters[stage][counter] += 1
+
+    def hedge_delay(self, stage: str) -> float | None:
+        """Espera antes de disparar a cópia: o percentil configurado das latências recentes."""
+        with self._lock:
+            samples = list(self._seconds[stage])
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return None
+        return float(np.percentile(samples, float(os.getenv("HEDGE_PERCENTILE", "95"))))
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            stats = {stage: dict(counters) for stage, counters in self._counters.items()}
+            for stage, samples in self._seconds.items():
+                if samples:
+                    p50, p99 = (round(float(q), 3) for q in np.percentile(list(samples), [50, 99]))
+                    stats.setdefault(stage, {}).update(p50_seconds=p50, p99_seconds=p99)
+        return stats
+
+
+_latencies = _StageLatencies()
+
+
+def get_tiering_stats() -> dict[str, dict[str, float]]:
+    """
+    Por etapa: execuções, cópias disparadas, vencedoras e puladas por falta de vaga, usos do modelo reserva,
+    prazos estourados e p50/p99.
+    """
+    return _latencies.stats()
+
+
+def _start_attempt(
+    stage: str, crew: Crew, attributes: dict[str, Any], slots: threading.Semaphore | None = None
+) -> Future:
+    """
+    Roda a crew numa thread daemon, no contexto de quem chamou (sessão e span).
+
+    Se `slots` é dado, quem chama já ocupou uma vaga; ela é devolvida quando a thread termina.
+    """
+    future: Future = Future()
+    context = contextvars.copy_context()
+
+    def target() -> None:
+        try:
+            future.set_result(context.run(run_crew, stage, crew, **attributes))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            if slots is not None:
+                slots.release()
+
+    threading.Thread(target=target, name=f"{stage}-attempt", daemon=True).start()
+    return future
+
+
+def is_timeout_error(error: BaseException) -> bool:
+    """Reconhece timeouts sem depender da biblioteca do provedor (openai, litellm, httpx...)."""
+    return isinstance(error, TimeoutError) or "timeout" in type(error).__name__.lower()
+
+
+def _race(  # noqa: PLR0913, PLR0917
+    stage: str,
+    crew: Crew,
+    deadline: float,
+    hedge: bool,
+    attributes: dict[str, Any],
+    slots: threading.Semaphore | None = None,
+) -> Any:
+    """Primeiro resultado entre a crew e, se ela demorar, outra cópia; TimeoutError ao fim do prazo."""
+    # A espera por vaga não conta no prazo: é fila, não lentidão do modelo.
+    if slots is not None:
+        slots.acquire()
+    end = time.monotonic() + deadline
+    hedge_delay = _latencies.hedge_delay(stage) if hedge else None
+    hedge_at = None if hedge_delay is None else time.monotonic() + hedge_delay
+    # A cópia é feita antes: copiar a crew enquanto ela roda levaria saídas parciais das tarefas.
+    hedge_crew = None if hedge_delay is None else crew.copy()
+    primary = _start_attempt(stage, crew, {**attributes, "attempt": "primary"}, slots)
+    pending = {primary}
+    while True:
+        wake_at = end if hedge_at is None else min(hedge_at, end)
+        done, pending = wait(pending, timeout=max(wake_at - time.monotonic(), 0.0), return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is not primary:
+                    _latencies.count(stage, "hedge_wins")
+                return future.result()
+        # Um erro só encerra a corrida se não houver outra tentativa em andamento:
+        if done and not pending:
+            error = next(iter(done)).exception()
+            if is_timeout_error(error):
+                raise TimeoutError from error
+            raise error
+        if time.monotonic() >= end:
+            raise TimeoutError
+        if hedge_at is not None and time.monotonic() >= hedge_at:
+            if slots is None or slots.acquire(blocking=False):
+                _latencies.count(stage, "hedges")
+                pending.add(_start_attempt(stage, hedge_crew, {**attributes, "attempt": "hedge"}, slots))
+            else:
+                # Sem vaga livre a cópia só disputaria o LLM com as outras sessões.
+                _latencies.count(stage, "hedges_skipped")
+            hedge_at = None
+
+
+def run_stage(
+    stage: str,
+    crew: Crew,
+    hedge: bool | None = None,
+    copy_crew: bool = True,
+    slots: threading.Semaphore | None = None,
+    **attributes: Any,
+) -> Any:
+    """
+    `crew.kickoff()` com prazo, cópia em paralelo nas etapas lentas e modelo reserva.
+
+    Args:
+        stage: Etapa (define o prazo e entra no span)
+        crew: Crew a executar (a tentativa principal roda numa cópia dela)
+        hedge: Dispara uma cópia depois do percentil configurado (padrão: conforme HEDGED_STAGES)
+        copy_crew: False quando a crew já tem agentes exclusivos e precisa rodar ela mesma
+            (ex.: o streaming, que acompanha os ids das tarefas)
+        slots: Vagas de chamadas simultâneas ao LLM; cada tentativa ocupa uma até terminar de fato
+        **attributes: Atributos extras dos spans
+    """
+    if hedge is None:
+        hedge = stage in os.getenv("HEDGED_STAGES", "evaluation,follow_up").split(",")
+    deadline = stage_deadline(stage)
+    _latencies.count(stage, "runs")
+    start = time.perf_counter()
+    try:
+        primary_crew = crew.copy() if copy_crew else crew
+        result = _race(stage, primary_crew, deadline, hedge, attributes, slots)
+    except TimeoutError:
+        fallback = _fallback_copy(crew)
+        if fallback is None:
+            _latencies.count(stage, "deadline_errors")
+            raise StageDeadlineError(f"A etapa {stage} passou do prazo de {deadline:.0f}s.") from None
+        _latencies.count(stage, "fallbacks")
+        try:
+            fallback_deadline = deadline * FALLBACK_DEADLINE_FRACTION
+            return _race(stage, fallback, fallback_deadline, False, {**attributes, "tier": "fallback"}, slots)
+        except TimeoutError:
+            _latencies.count(stage, "deadline_errors")
+            raise StageDeadlineError(f"A etapa {stage} passou do prazo também com o modelo reserva.") from None
+    _latencies.record(stage, time.perf_counter() - start)
+    return result
+
+
+async def run_stage_async(
+    stage: str,
+    crew: Crew,
+    hedge: bool | None = None,
+    copy_crew: bool = True,
+    slots: threading.Semaphore | None = None,
+    **attributes: Any,
+) -> Any:
+    """`run_stage` sem bloquear o event loop (a espera por vaga em `slots` também roda fora dele)."""
+    return await asyncio.to_thread(run_stage, stage, crew, hedge, copy_crew, slots, **attributes)
@@ -0,0 +1,231 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script load_test.py
+===================
+Teste de carga com N sessões de entrevista simultâneas, para descobrir onde a aplicação
+satura quando uma turma inteira de candidatos pratica ao mesmo tempo.
+
+Cada sessão simulada faz o mesmo que a interface: prepara a pergunta, começa o follow-up
+em paralelo, (opcionalmente) transcreve um áudio sintético pelo pool do Whisper, avalia a
+resposta e espera o follow-up. O LLM e a busca são os do `stub_llm_server.py`, com
+latência configurável. A concorrência sobe em degraus e, para cada degrau, o relatório
+mostra p50/p95/p99 por etapa, sessões por minuto e erros, e aponta o joelho: o primeiro
+degrau em que a latência cresce ou a vazão deixa de acompanhar a concorrência, isto é,
+onde as sessões começam a esperar em fila.
+
+Run
+---
+uv run load_test.py --levels 1,2,4,8,16 --latency-ms 800 --jitter-ms 200
+uv run load_test.py --levels 1,4,16 --audio-seconds 8 --whisper-model tiny
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import sys
+import tempfile
+import time
+import wave
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+
+from benchmark_pipeline import COMPANY, DIFFICULTY, ROLE, SCRIPTED_ANSWERS, configure_environment
+from stub_llm_server import StubLLMServer
+
+STAGES = ("preparation", "transcription", "evaluation", "follow_up", "session")
+# Critérios do joelho em relação ao degrau de concorrência 1:
+KNEE_LATENCY_GROWTH = 1.25
+KNEE_MIN_EFFICIENCY = 0.8
+# Áudio sintético: frases de 2 s seguidas de 1 s de pausa.
+PHRASE_SECONDS = 2.0
+SPEECH_CYCLE_SECONDS = 3.0
+
+
+def synthetic_speech(seconds: float, sample_rate: int = 16000, seed: int = 0) -> bytes:
+    """WAV PCM 16-bit com rajadas tonais moduladas e pausas, imitando a cadência da fala."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voice = np.sin(phase) + 0.3 * np.sin(3 * phase)
+    # Sílabas de ~4 Hz e uma pausa depois de cada frase:
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * ((t % SPEECH_CYCLE_SECONDS) < PHRASE_SECONDS)
+    audio = 0.3 * voice * envelope + 0.003 * rng.standard_normal(t.size)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes((np.clip(audio, -1, 1) * 32767).astype(np.int16).tobytes())
+    return buffer.getvalue()
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Percentil pelo método do posto mais próximo."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+async def simulate_session(session_id: str, audio: bytes | None, whisper_model: str) -> dict[str, float]:
+    """Uma entrevista completa; devolve o tempo de cada etapa (inclui a espera em filas)."""
+    # Imports tardios: os agentes e o LLM são criados na importação, depois de `configure_environment`.
+    from instrumentation import session_scope  # noqa: PLC0415
+    from interview_practice_system import (  # noqa: PLC0415
+        evaluate_answer_async,
+        generate_follow_up_question,
+        prepare_question,
+    )
+
+    timings = {}
+    session_start = time.perf_counter()
+    with session_scope(session_id):
+        start = time.perf_counter()
+        # A interface chama a preparação de forma síncrona na thread da sessão:
+        pair = await asyncio.to_thread(prepare_question, COMPANY, ROLE, DIFFICULTY)
+        timings["preparation"] = time.perf_counter() - start
+
+        follow_up_start = time.perf_counter()
+        follow_up = asyncio.create_task(generate_follow_up_question(pair.question, COMPANY, ROLE, DIFFICULTY))
+
+        if audio is not None:
+            from transcription_service import get_transcription_pool  # noqa: PLC0415
+
+            start = time.perf_counter()
+            pool = get_transcription_pool(whisper_model)
+            job = await asyncio.to_thread(pool.submit, audio, whisper_model, 60.0)
+            await asyncio.wrap_future(job)
+            timings["transcription"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        # Cada sessão dá uma resposta diferente, como candidatos reais:
+        answer = f"{SCRIPTED_ANSWERS[0]} Exemplo da sessão {session_id}."
+        await evaluate_answer_async(pair.question, answer, pair.correct_answer)
+        timings["evaluation"] = time.perf_counter() - start
+
+        await follow_up
+        timings["follow_up"] = time.perf_counter() - follow_up_start
+    timings["session"] = time.perf_counter() - session_start
+    return timings
+
+
+async def run_level(concurrency: int, sessions: int, audio: bytes | None, whisper_model: str) -> dict:
+    """Roda `sessions` sessões com no máximo `concurrency` simultâneas (carga em malha fechada)."""
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: defaultdict[str, list[float]] = defaultdict(list)
+    errors: defaultdict[str, int] = defaultdict(int)
+
+    async def run(index: int) -> None:
+        async with semaphore:
+            try:
+                timings = await simulate_session(f"load-{concurrency}-{index}", audio, whisper_model)
+            except Exception as e:
+                errors[type(e).__name__] += 1
+                return
+            for stage, seconds in timings.items():
+                samples[stage].append(seconds)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    completed = len(samples["session"])
+    return {
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "completed": completed,
+        "errors": dict(errors),
+        "elapsed_seconds": round(elapsed, 2),
+        "sessions_per_minute": round(completed / elapsed * 60, 2) if elapsed else 0.0,
+        "stages": {
+            stage: {f"p{p}": round(percentile(samples[stage], p), 3) for p in (50, 95, 99)}
+            for stage in STAGES
+            if samples[stage]
+        },
+    }
+
+
+def find_knee(levels: list[dict]) -> int | None:
+    """
+    Primeiro degrau em que as sessões passam a esperar em fila.
+
+    É o primeiro degrau cuja latência mediana da sessão cresce mais de 25% sobre o degrau
+    de concorrência mais baixa, ou cuja vazão por sessão simultânea cai abaixo de 80% da
+    vazão desse degrau.
+    """
+    reference = levels[0]
+    if not reference["completed"]:
+        return None
+    base_latency = reference["stages"]["session"]["p50"]
+    base_throughput = reference["sessions_per_minute"] / reference["concurrency"]
+    for level in levels[1:]:
+        if not level["completed"]:
+            return level["concurrency"]
+        latency_growth = level["stages"]["session"]["p50"] / base_latency
+        efficiency = level["sessions_per_minute"] / level["concurrency"] / base_throughput
+        if latency_growth > KNEE_LATENCY_GROWTH or efficiency < KNEE_MIN_EFFICIENCY:
+            return level["concurrency"]
+    return None
+
+
+def print_level(level: dict) -> None:
+    print(
+        f"\nConcorrência {level['concurrency']}: {level['completed']}/{level['sessions']} sessões em "
+        f"{level['elapsed_seconds']}s ({level['sessions_per_minute']} sessões/min), erros: {level['errors'] or 0}"
+    )
+    print(f"  {'etapa':<15}{'p50 (s)':>10}{'p95 (s)':>10}{'p99 (s)':>10}")
+    for stage, quantiles in level["stages"].items():
+        print(f"  {stage:<15}{quantiles['p50']:>10.3f}{quantiles['p95']:>10.3f}{quantiles['p99']:>10.3f}")
+
+
+async def _main(args: argparse.Namespace) -> int:
+    levels = [int(level) for level in args.levels.split(",")]
+    stub = StubLLMServer(latency_seconds=args.latency_ms / 1000, jitter_seconds=args.jitter_ms / 1000).start()
+    configure_environment(stub.base_url, tempfile.mkdtemp(prefix="interview-load-"))
+    # Na interface cada sessão tem sua thread; aqui o pool de threads não pode ser o gargalo:
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=max(levels) * 4))
+    audio = synthetic_speech(args.audio_seconds) if args.audio_seconds > 0 else None
+
+    results = []
+    try:
+        with redirect_stdout(io.StringIO()):
+            # Aquecimento: imports, criação dos agentes e, com áudio, carga do modelo Whisper.
+            await simulate_session("load-warmup", audio, args.whisper_model)
+        for concurrency in levels:
+            sessions = max(concurrency * args.sessions_per_slot, args.min_sessions)
+            with redirect_stdout(io.StringIO()):
+                level = await run_level(concurrency, sessions, audio, args.whisper_model)
+            results.append(level)
+            print_level(level)
+    finally:
+        stub.stop()
+
+    knee = find_knee(results)
+    if knee is None:
+        print("\nNenhum joelho encontrado: a vazão acompanhou a concorrência em todos os degraus.")
+    else:
+        print(f"\nJoelho em concorrência {knee}: a partir daqui as sessões começam a esperar em fila.")
+    if args.output:
+        report = {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "knee": knee, "levels": results}
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste de carga com sessões de entrevista simultâneas")
+    parser.add_argument("--levels", default="1,2,4,8,16", help="Degraus de concorrência, separados por vírgula")
+    parser.add_argument("--sessions-per-slot", type=int, default=3, help="Sessões por sessão simultânea em cada degrau")
+    parser.add_argument("--min-sessions", type=int, default=5, help="Mínimo de sessões por degrau")
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Latência simulada de cada chamada ao LLM")
+    parser.add_argument("--jitter-ms", type=float, default=200.0, help="Variação aleatória da latência")
+    parser.add_argument("--audio-seconds", type=float, default=0.0, help="Duração do áudio sintético (0 desativa)")
+    parser.add_argument("--whisper-model", default="tiny", help="Modelo Whisper usado com --audio-seconds")
+    parser.add_argument("--output", type=Path, help="Grava o relatório em JSON")
+    sys.exit(asyncio.run(_main(parser.parse_args())))
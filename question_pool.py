@@ -0,0 +1,297 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script question_pool.py
+=======================
+Banco de perguntas pré-geradas (`QuestionAnswerPair`) por (empresa, cargo, dificuldade).
+
+Ao clicar em "Iniciar Entrevista Simulada" o usuário esperava a crew de preparação
+inteira. Aqui um produtor em segundo plano mantém as chaves mais procuradas abastecidas
+até uma profundidade alvo, e cada pergunta é entregue uma única vez. Só quando o banco
+está vazio para a chave a pergunta é gerada na hora. O banco fica em SQLite e sobrevive
+a reinícios, assim como a lista de chaves populares.
+
+Só são reabastecidas as chaves procuradas mais de uma vez: uma combinação pedida uma
+única vez não gasta chamadas ao LLM. Quando todas as perguntas prontas de uma chave já
+foram vistas pela sessão, o produtor gera perguntas além da profundidade alvo até a
+falta ser coberta, e perguntas repetidas não entram no banco. Uma chave cuja geração
+falhou ou repetiu uma pergunta fica de fora por um tempo, sem travar as demais. Como toda etapa, a crew de
+preparação do produtor roda numa cópia com agentes próprios (ver `llm_tiers.run_stage`):
+os agentes compartilhados do processo podem estar em uso por uma preparação ao vivo.
+
+Configuração
+------------
+QUESTION_POOL_DEPTH: perguntas mantidas prontas por chave (padrão: 3)
+QUESTION_POOL_KEYS: quantas chaves populares são reabastecidas (padrão: 10)
+QUESTION_POOL_MIN_REQUESTS: procuras a partir das quais uma chave é reabastecida (padrão: 2)
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Collection
+from pathlib import Path
+
+from interview_practice_system import QuestionAnswerPair, initialize_preparation_crew
+from llm_tiers import run_stage
+from research_cache import cache_dir, normalize_key
+
+logger = logging.getLogger(__name__)
+
+# Janela usada para medir a taxa de reabastecimento:
+REFILL_RATE_WINDOW_SECONDS = 15 * 60
+# Espera após uma falha (ou uma pergunta repetida) antes de tentar de novo a mesma chave:
+ERROR_BACKOFF_SECONDS = 60.0
+
+QuestionGenerator = Callable[[str, str, str], QuestionAnswerPair]
+
+
+def generate_pooled_question(company_name: str, role: str, difficulty: str) -> QuestionAnswerPair:
+    """Gerador padrão do produtor (a crew roda numa cópia, sem disputar os agentes da preparação ao vivo)."""
+    crew = initialize_preparation_crew(company_name, role, difficulty)
+    return run_stage("question_preparation", crew, pooled=True).pydantic
+
+
+class QuestionPool:
+    """Perguntas prontas por chave, com um worker que reabastece as chaves populares."""
+
+    def __init__(
+        self,
+        path: Path | str,
+        generate: QuestionGenerator,
+        target_depth: int = 3,
+        max_popular_keys: int = 10,
+        min_requests: int = 2,
+    ):
+        self.generate = generate
+        self.target_depth = target_depth
+        self.max_popular_keys = max_popular_keys
+        self.min_requests = min_requests
+        # Perguntas a gerar além da profundidade alvo, por chave: faltas de quem já viu todas as prontas.
+        self._shortfall: dict[tuple[str, ...], int] = {}
+        # Até quando (time.monotonic) cada chave fica fora do reabastecimento após uma falha:
+        self._backoff_until: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopped = False
+        self._worker: threading.Thread | None = None
+        self._hits = 0
+        self._misses = 0
+        self._generated = 0
+        self._generation_seconds = 0.0
+        self._recent_generations: deque[float] = deque()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS questions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                company TEXT NOT NULL,
+                role TEXT NOT NULL,
+                difficulty TEXT NOT NULL,
+                question TEXT NOT NULL,
+                correct_answer TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS questions_by_key ON questions (company, role, difficulty);
+            CREATE TABLE IF NOT EXISTS demand (
+                company TEXT NOT NULL,
+                role TEXT NOT NULL,
+                difficulty TEXT NOT NULL,
+                display_company TEXT NOT NULL,
+                display_role TEXT NOT NULL,
+                display_difficulty TEXT NOT NULL,
+                requests INTEGER NOT NULL DEFAULT 0,
+                last_requested REAL NOT NULL,
+                PRIMARY KEY (company, role, difficulty)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def take(
+        self, company_name: str, role: str, difficulty: str, seen: Collection[str] = ()
+    ) -> QuestionAnswerPair | None:
+        """
+        Retira do banco a pergunta mais antiga ainda não vista para a chave.
+
+        Registra a procura pela chave (tornando-a popular) e acorda o produtor. Retorna
+        None quando não há pergunta pronta; nesse caso a pergunta deve ser gerada na hora.
+        """
+        key = normalize_key(company_name, role, difficulty)
+        with self._lock:
+            self._record_demand(key, tuple(" ".join(part.split()) for part in (company_name, role, difficulty)))
+            rows = self._conn.execute(
+                "SELECT id, question, correct_answer FROM questions"
+                " WHERE company = ? AND role = ? AND difficulty = ? ORDER BY id",
+                key,
+            ).fetchall()
+            row = next((row for row in rows if row[1] not in seen), None)
+            if row is None:
+                self._misses += 1
+                if rows:
+                    # Há perguntas prontas, mas a sessão já viu todas: sem isto o banco ficaria "cheio" para sempre.
+                    self._shortfall[key] = min(self._shortfall.get(key, 0) + 1, self.target_depth)
+            else:
+                self._hits += 1
+                self._conn.execute("DELETE FROM questions WHERE id = ?", (row[0],))
+            self._conn.commit()
+            self._wakeup.notify()
+        if row is None:
+            return None
+        return QuestionAnswerPair(question=row[1], correct_answer=row[2])
+
+    def add(self, company_name: str, role: str, difficulty: str, pair: QuestionAnswerPair) -> bool:
+        """Guarda a pergunta, a menos que ela já esteja no banco para a chave. Retorna se foi guardada."""
+        key = normalize_key(company_name, role, difficulty)
+        with self._lock:
+            duplicate = self._conn.execute(
+                "SELECT 1 FROM questions WHERE company = ? AND role = ? AND difficulty = ? AND question = ?",
+                (*key, pair.question),
+            ).fetchone()
+            if duplicate is not None:
+                return False
+            self._conn.execute(
+                "INSERT INTO questions (company, role, difficulty, question, correct_answer, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, pair.question, pair.correct_answer, time.time()),
+            )
+            self._conn.commit()
+            if self._shortfall.get(key):
+                self._shortfall[key] -= 1
+            return True
+
+    def depth(self, company_name: str, role: str, difficulty: str) -> int:
+        with self._lock:
+            return self._depth(normalize_key(company_name, role, difficulty))
+
+    def start(self) -> None:
+        """Inicia o produtor em segundo plano (idempotente)."""
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._stopped = False
+            self._worker = threading.Thread(target=self._refill_loop, name="question-pool-refill", daemon=True)
+            self._worker.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped = True
+            self._wakeup.notify_all()
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.join()
+
+    def stats(self) -> dict:
+        """Acertos/falhas, profundidade das chaves populares e taxa de reabastecimento."""
+        with self._lock:
+            self._trim_recent_generations()
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+                "generated": self._generated,
+                "refill_per_minute": round(len(self._recent_generations) / (REFILL_RATE_WINDOW_SECONDS / 60), 2),
+                "avg_generation_seconds": (
+                    round(self._generation_seconds / self._generated, 2) if self._generated else None
+                ),
+                "target_depth": self.target_depth,
+                "depth": {" / ".join(display): self._depth(key) for key, display in self._popular_keys()},
+            }
+
+    def _refill_loop(self) -> None:
+        while True:
+            with self._lock:
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                underfilled = [
+                    (key, display)
+                    for key, display in self._popular_keys()
+                    if self._depth(key) < self.target_depth + self._shortfall.get(key, 0)
+                ]
+                target = next(((key, display) for key, display in underfilled if not self._backing_off(key, now)), None)
+                if target is None:
+                    # Tudo abastecido (ou só chaves esperando após uma falha): dorme até alguém retirar
+                    # uma pergunta ou até a primeira espera acabar.
+                    deadlines = [self._backoff_until[key] for key, _ in underfilled if key in self._backoff_until]
+                    self._wakeup.wait(timeout=min(deadlines) - now if deadlines else None)
+                    continue
+
+            key, (company_name, role, difficulty) = target
+            start = time.perf_counter()
+            try:
+                pair = self.generate(company_name, role, difficulty)
+            except Exception:
+                logger.exception("Falha ao pré-gerar pergunta para %s / %s / %s", company_name, role, difficulty)
+                with self._lock:
+                    self._backoff_until[key] = time.monotonic() + ERROR_BACKOFF_SECONDS
+                continue
+
+            added = self.add(company_name, role, difficulty, pair)
+            with self._lock:
+                self._generated += 1
+                self._generation_seconds += time.perf_counter() - start
+                self._recent_generations.append(time.time())
+                if added:
+                    self._backoff_until.pop(key, None)
+                else:
+                    # O LLM repetiu uma pergunta já pronta: espera antes de gastar outra chamada na chave.
+                    self._backoff_until[key] = time.monotonic() + ERROR_BACKOFF_SECONDS
+
+    def _backing_off(self, key: tuple[str, ...], now: float) -> bool:
+        until = self._backoff_until.get(key)
+        if until is not None and until <= now:
+            del self._backoff_until[key]
+            return False
+        return until is not None
+
+    def _popular_keys(self) -> list[tuple[tuple[str, ...], tuple[str, ...]]]:
+        rows = self._conn.execute(
+            "SELECT company, role, difficulty, display_company, display_role, display_difficulty FROM demand"
+            " WHERE requests >= ? ORDER BY requests DESC, last_requested DESC LIMIT ?",
+            (self.min_requests, self.max_popular_keys),
+        ).fetchall()
+        return [(tuple(row[:3]), tuple(row[3:])) for row in rows]
+
+    def _record_demand(self, key: tuple[str, ...], display: tuple[str, ...]) -> None:
+        self._conn.execute(
+            "INSERT INTO demand VALUES (?, ?, ?, ?, ?, ?, 1, ?)"
+            " ON CONFLICT (company, role, difficulty) DO UPDATE SET requests = requests + 1,"
+            " last_requested = excluded.last_requested, display_company = excluded.display_company,"
+            " display_role = excluded.display_role, display_difficulty = excluded.display_difficulty",
+            (*key, *display, time.time()),
+        )
+
+    def _depth(self, key: tuple[str, ...]) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM questions WHERE company = ? AND role = ? AND difficulty = ?", key
+        ).fetchone()[0]
+
+    def _trim_recent_generations(self) -> None:
+        while self._recent_generations and time.time() - self._recent_generations[0] > REFILL_RATE_WINDOW_SECONDS:
+            self._recent_generations.popleft()
+
+
+_pool: QuestionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_question_pool() -> QuestionPool:
+    """Retorna o banco de perguntas único do processo, com o produtor já iniciado."""
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is None:
+            _pool = QuestionPool(
+                cache_dir() / "question_pool.sqlite3",
+                generate=generate_pooled_question,
+                target_depth=int(os.getenv("QUESTION_POOL_DEPTH", "3")),
+                max_popular_keys=int(os.getenv("QUESTION_POOL_KEYS", "10")),
+                min_requests=int(os.getenv("QUESTION_POOL_MIN_REQUESTS", "2")),
+            )
+            _pool.start()
+        return _pool
@@ -0,0 +1,132 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script research_cache.py
+========================
+Cache em disco (SQLite) do resumo (já compactado) produzido pela pesquisa da empresa.
+
+A pesquisa (buscas na web + um longo resumo do LLM) é a etapa mais cara da preparação,
+e os usuários praticam quase sempre as mesmas empresas e cargos. O resumo fica guardado
+por (empresa, cargo, dificuldade) durante um TTL; num acerto, a crew de preparação pula
+direto para a criação da pergunta.
+
+Configuração
+------------
+INTERVIEW_CACHE_DIR: diretório dos caches em disco (padrão: .cache)
+RESEARCH_CACHE_TTL_HOURS: validade de uma pesquisa em horas (padrão: 168, uma semana)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_TTL_HOURS = 168.0
+
+
+def cache_dir() -> Path:
+    """Diretório compartilhado pelos caches em disco da aplicação."""
+    path = Path(os.getenv("INTERVIEW_CACHE_DIR", ".cache"))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def normalize_key(*parts: str) -> tuple[str, ...]:
+    """Normaliza as partes da chave: "  Google " e "google" são a mesma empresa."""
+    return tuple(" ".join(part.split()).casefold() for part in parts)
+
+
+class ResearchCache:
+    """Resumos de pesquisa por (empresa, cargo, dificuldade) com TTL e estatísticas de acerto."""
+
+    def __init__(self, path: Path | str, ttl_seconds: float = DEFAULT_TTL_HOURS * 3600):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS research (
+                company TEXT NOT NULL,
+                role TEXT NOT NULL,
+                difficulty TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (company, role, difficulty)
+            )"""
+        )
+        self._conn.commit()
+
+    def get(self, company_name: str, role: str, difficulty: str) -> str | None:
+        """Retorna o resumo em cache ou None se não existir ou tiver expirado."""
+        key = normalize_key(company_name, role, difficulty)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, created_at FROM research WHERE company = ? AND role = ? AND difficulty = ?", key
+            ).fetchone()
+            if row is not None and time.time() - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM research WHERE company = ? AND role = ? AND difficulty = ?", key)
+                self._conn.commit()
+                row = None
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return row[0]
+
+    def put(self, company_name: str, role: str, difficulty: str, summary: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO research VALUES (?, ?, ?, ?, ?)",
+                (*normalize_key(company_name, role, difficulty), summary, time.time()),
+            )
+            self._conn.commit()
+
+    def invalidate(self, company_name: str, role: str | None = None, difficulty: str | None = None) -> int:
+        """Remove as pesquisas da empresa (opcionalmente só de um cargo/dificuldade). Retorna quantas."""
+        query = "DELETE FROM research WHERE company = ?"
+        params = list(normalize_key(company_name))
+        if role is not None:
+            query += " AND role = ?"
+            params.extend(normalize_key(role))
+        if difficulty is not None:
+            query += " AND difficulty = ?"
+            params.extend(normalize_key(difficulty))
+        with self._lock:
+            removed = self._conn.execute(query, params).rowcount
+            self._conn.commit()
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM research")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Acertos e falhas deste processo e quantidade de pesquisas guardadas."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM research").fetchone()[0]
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+                "entries": entries,
+                "ttl_hours": round(self.ttl_seconds / 3600, 1),
+            }
+
+
+_cache: ResearchCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_research_cache() -> ResearchCache:
+    """Retorna o cache de pesquisas único do processo."""
+    global _cache  # noqa: PLW0603
+    with _cache_lock:
+        if _cache is None:
+            ttl_hours = float(os.getenv("RESEARCH_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS))
+            _cache = ResearchCache(cache_dir() / "research.sqlite3", ttl_seconds=ttl_hours * 3600)
+        return _cache
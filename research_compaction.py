@@ -0,0 +1,98 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script research_compaction.py
+=============================
+Compactação da pesquisa da empresa antes da preparação das perguntas.
+
+O resumo livre do pesquisador entrava inteiro no prompt do preparador de perguntas (e
+em cada pergunta do plano de entrevista), embora só uma parte dele importe para a
+pergunta. A etapa de compactação extrai os fatos úteis para a entrevista (pilha técnica,
+formato da entrevista e temas típicos) num modelo estruturado e garante, localmente, que
+a versão renderizada caiba num orçamento de tokens. A cada execução registra quantos
+tokens foram economizados em relação ao resumo original.
+
+Os tokens são estimados (~4 caracteres por token), o mesmo critério para os dois textos;
+o número serve para comparar, não para faturar.
+
+Configuração
+------------
+RESEARCH_TOKEN_BUDGET: tokens máximos da pesquisa compactada (padrão: 300)
+"""
+
+import os
+import threading
+
+from pydantic import BaseModel, Field
+
+from instrumentation import record_span
+
+DEFAULT_TOKEN_BUDGET = 300
+CHARS_PER_TOKEN = 4
+
+_stats = {"runs": 0, "raw_tokens": 0, "compact_tokens": 0, "tokens_saved": 0}
+_stats_lock = threading.Lock()
+
+
+class CompanyResearchFacts(BaseModel):
+    """Fatos da pesquisa da empresa que importam para preparar as perguntas."""
+
+    tech_stack: list[str] = Field(default_factory=list, description="Linguagens, ferramentas e plataformas usadas")
+    interview_format: list[str] = Field(default_factory=list, description="Etapas e formato da entrevista técnica")
+    typical_topics: list[str] = Field(default_factory=list, description="Temas típicos das perguntas para o cargo")
+
+    def render(self) -> str:
+        """Texto compacto que entra no prompt do preparador de perguntas."""
+        sections = (
+            ("Pilha técnica", self.tech_stack),
+            ("Formato da entrevista", self.interview_format),
+            ("Temas típicos", self.typical_topics),
+        )
+        return "\n".join(f"{label}: {'; '.join(items)}" for label, items in sections if items)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def get_token_budget() -> int:
+    return int(os.getenv("RESEARCH_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET))
+
+
+def fit_to_budget(facts: CompanyResearchFacts, token_budget: int) -> CompanyResearchFacts:
+    """Descarta os últimos itens da lista mais longa até a versão renderizada caber no orçamento."""
+    fields = {name: list(getattr(facts, name)) for name in CompanyResearchFacts.model_fields}
+    fitted = CompanyResearchFacts(**fields)
+    while estimate_tokens(fitted.render()) > token_budget and any(fields.values()):
+        longest = max(fields, key=lambda name: len(fields[name]))
+        fields[longest].pop()
+        fitted = CompanyResearchFacts(**fields)
+    return fitted
+
+
+def record_compaction(raw_summary: str, compact_summary: str, seconds: float) -> None:
+    """Registra a economia de tokens de uma compactação (span `research_compaction` e totais do processo)."""
+    raw_tokens = estimate_tokens(raw_summary)
+    compact_tokens = estimate_tokens(compact_summary)
+    tokens_saved = max(raw_tokens - compact_tokens, 0)
+    with _stats_lock:
+        _stats["runs"] += 1
+        _stats["raw_tokens"] += raw_tokens
+        _stats["compact_tokens"] += compact_tokens
+        _stats["tokens_saved"] += tokens_saved
+    record_span(
+        "research_compaction",
+        seconds,
+        raw_tokens=raw_tokens,
+        compact_tokens=compact_tokens,
+        tokens_saved=tokens_saved,
+    )
+
+
+def get_compaction_stats() -> dict[str, float]:
+    """Totais do processo e fração dos tokens da pesquisa que deixou de ir para os prompts."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["saved_ratio"] = round(stats["tokens_saved"] / stats["raw_tokens"], 3) if stats["raw_tokens"] else 0.0
+    return stats
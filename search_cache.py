@@ -0,0 +1,193 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script search_cache.py
+======================
+Cache das buscas feitas pelo `company_researcher` com o `SerperDevTool`.
+
+Sessões diferentes fazem muitas buscas quase idênticas ("Google data scientist interview
+process"...) e sessões simultâneas para a mesma empresa disparam as mesmas buscas ao
+mesmo tempo. Aqui as consultas são normalizadas, pedidos idênticos em andamento são
+unificados (só um vai para a API e os demais esperam o resultado dele), as respostas
+ficam em SQLite com TTL e as requisições reaproveitam as conexões HTTP de uma sessão.
+
+Configuração
+------------
+SEARCH_CACHE_TTL_HOURS: validade de uma busca em horas (padrão: 24)
+SERPER_BASE_URL: endereço da API de busca (padrão: https://google.serper.dev; ver stub_llm_server.py)
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+import requests
+from crewai_tools import SerperDevTool
+from pydantic import Field
+from requests.adapters import HTTPAdapter
+
+from instrumentation import record_tool_call
+from research_cache import cache_dir
+
+DEFAULT_TTL_HOURS = 24.0
+# Conexões HTTP mantidas abertas para a API do Serper:
+HTTP_POOL_SIZE = 16
+
+
+def normalize_query(query: str) -> str:
+    """Normaliza a consulta: "Google  Data-Scientist interview?" == "google data scientist interview"."""
+    query = unicodedata.normalize("NFKC", query).casefold()
+    return " ".join(re.sub(r"[^\w]+", " ", query).split())
+
+
+class SearchCache:
+    """Respostas da API de busca em SQLite, com TTL."""
+
+    def __init__(self, path: Path | str, ttl_seconds: float = DEFAULT_TTL_HOURS * 3600):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS searches"
+            " (key TEXT PRIMARY KEY, results TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute("SELECT results, created_at FROM searches WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if time.time() - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM searches WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return json.loads(row[0])
+
+    def put(self, key: str, results: dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches VALUES (?, ?, ?)", (key, json.dumps(results), time.time())
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM searches")
+            self._conn.commit()
+
+
+_state_lock = threading.Lock()
+_cache: SearchCache | None = None
+_http_session: requests.Session | None = None
+_in_flight: dict[str, Future] = {}
+_stats = {"hits": 0, "misses": 0, "coalesced": 0, "api_calls": 0, "api_errors": 0}
+
+
+def get_search_cache() -> SearchCache:
+    global _cache  # noqa: PLW0603
+    with _state_lock:
+        if _cache is None:
+            ttl_hours = float(os.getenv("SEARCH_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS))
+            _cache = SearchCache(cache_dir() / "search.sqlite3", ttl_seconds=ttl_hours * 3600)
+        return _cache
+
+
+def _get_http_session() -> requests.Session:
+    """Sessão HTTP única do processo: reaproveita conexões TLS em vez de abrir uma por busca."""
+    global _http_session  # noqa: PLW0603
+    with _state_lock:
+        if _http_session is None:
+            _http_session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            _http_session.mount("https://", adapter)
+            _http_session.mount("http://", adapter)
+        return _http_session
+
+
+def _count(stat: str) -> None:
+    with _state_lock:
+        _stats[stat] += 1
+
+
+def get_search_stats() -> dict:
+    """Acertos, falhas, pedidos unificados e chamadas reais à API de busca neste processo."""
+    with _state_lock:
+        lookups = _stats["hits"] + _stats["misses"] + _stats["coalesced"]
+        saved = _stats["hits"] + _stats["coalesced"]
+        return {**_stats, "saved_ratio": round(saved / lookups, 3) if lookups else None}
+
+
+class CachedSerperDevTool(SerperDevTool):
+    """`SerperDevTool` com cache em disco, unificação de pedidos em andamento e conexões HTTP reaproveitadas."""
+
+    base_url: str = Field(default_factory=lambda: os.getenv("SERPER_BASE_URL", "https://google.serper.dev"))
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            return self._cached_request(search_query, search_type)
+        finally:
+            record_tool_call(time.perf_counter() - start)
+
+    def _cached_request(self, search_query: str, search_type: str) -> dict[str, Any]:
+        key = json.dumps(
+            [normalize_query(search_query), search_type, self.n_results, self.country, self.location, self.locale]
+        )
+        cached = get_search_cache().get(key)
+        if cached is not None:
+            _count("hits")
+            return cached
+
+        # Single-flight: o primeiro pedido para a chave faz a busca; os simultâneos esperam por ele.
+        with _state_lock:
+            in_flight = _in_flight.get(key)
+            if in_flight is None:
+                _in_flight[key] = Future()
+        if in_flight is not None:
+            _count("coalesced")
+            return in_flight.result()
+
+        _count("misses")
+        future = _in_flight[key]
+        try:
+            results = self._request(search_query, search_type)
+            get_search_cache().put(key, results)
+            future.set_result(results)
+            return results
+        except Exception as e:
+            _count("api_errors")
+            future.set_exception(e)
+            raise
+        finally:
+            with _state_lock:
+                _in_flight.pop(key, None)
+
+    def _request(self, search_query: str, search_type: str) -> dict[str, Any]:
+        """Mesmo pedido do `SerperDevTool._make_api_request`, mas pela sessão HTTP compartilhada."""
+        payload = {"q": search_query, "num": self.n_results}
+        if self.country != "":
+            payload["gl"] = self.country
+        if self.location != "":
+            payload["location"] = self.location
+        if self.locale != "":
+            payload["hl"] = self.locale
+        headers = {"X-API-KEY": os.environ["SERPER_API_KEY"], "content-type": "application/json"}
+
+        _count("api_calls")
+        response = _get_http_session().post(
+            self._get_search_url(search_type), headers=headers, json=payload, timeout=10
+        )
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            raise ValueError("Empty response from Serper API")
+        return results
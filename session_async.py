@@ -0,0 +1,55 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script session_async.py
+=======================
+Loop asyncio persistente por sessão do Streamlit.
+
+Cada rerun do Streamlit executa o script do zero, e `asyncio.run` cria e destrói um
+loop a cada chamada, o que obriga a esperar cada corrotina antes de seguir. Aqui o loop
+roda numa thread própria guardada em `st.session_state`: as corrotinas (geração do
+follow-up, avaliação) continuam rodando entre reruns e a interface só espera pelo
+resultado que ainda não ficou pronto.
+"""
+
+import asyncio
+import contextvars
+import threading
+import weakref
+from collections.abc import Coroutine
+from concurrent.futures import Future
+from typing import Any
+
+
+async def _run_in_context(coro: Coroutine[Any, Any, Any], context: contextvars.Context) -> Any:
+    # Leva para a tarefa as variáveis de contexto de quem a agendou (ex.: o id da sessão):
+    for var, value in context.items():
+        var.set(value)
+    return await coro
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+
+class SessionEventLoop:
+    """Loop asyncio numa thread daemon; é encerrado quando a sessão é descartada."""
+
+    def __init__(self, name: str = "session-loop"):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=_run_loop, args=(self._loop,), name=name, daemon=True)
+        self._thread.start()
+        # Quando o session_state da sessão é coletado, o loop é parado junto:
+        self._finalizer = weakref.finalize(self, self._loop.call_soon_threadsafe, self._loop.stop)
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        """Agenda a corrotina no loop da sessão e retorna um `concurrent.futures.Future`."""
+        return asyncio.run_coroutine_threadsafe(_run_in_context(coro, contextvars.copy_context()), self._loop)
+
+    def close(self) -> None:
+        self._finalizer()
@@ -0,0 +1,195 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script session_log.py
+=====================
+Registro durável (só de acréscimo) das sessões do `chatbot_ui.py`.
+
+As mensagens da entrevista viviam só em `st.session_state.messages`: reiniciar o
+servidor perdia a entrevista, e cada rerun redesenhava a conversa inteira. Aqui cada
+evento da sessão (início, pergunta, resposta, avaliação, follow-up) é acrescentado numa
+tabela SQLite com o número de sequência dentro da sessão, o conteúdo, os dados extras em
+JSON e o tempo que a etapa levou. A chave (sessão, sequência) é o índice que permite ler
+só o fim da conversa e buscar páginas mais antigas sob demanda, sem varrer a sessão.
+
+`restore()` refaz o estado da entrevista a partir dos eventos, para retomar a sessão
+depois de um reinício. Nada é atualizado nem apagado, exceto as sessões inativas além do
+TTL, removidas ao abrir o registro.
+
+Configuração
+------------
+INTERVIEW_CACHE_DIR: diretório do arquivo `session_log.sqlite3` (padrão: .cache)
+SESSION_LOG_TTL_DAYS: sessões sem eventos há mais tempo que isto são removidas (padrão: 30)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from research_cache import cache_dir
+
+DEFAULT_TTL_DAYS = 30.0
+
+# Eventos que aparecem no chat e o papel de cada um; os demais ("start") só guardam estado:
+MESSAGE_ROLES = {"question": "assistant", "answer": "user", "evaluation": "assistant", "follow_up": "assistant"}
+QUESTION_KINDS = ("question", "follow_up")
+_IS_MESSAGE = f"kind IN ({', '.join('?' * len(MESSAGE_ROLES))})"
+
+
+@dataclass
+class SessionSnapshot:
+    """Estado da entrevista reconstruído a partir do registro."""
+
+    company_name: str
+    role: str
+    difficulty: str
+    # Pergunta em aberto (None se a última pergunta já foi avaliada e falta a próxima):
+    current_question: str | None = None
+    correct_answer: str | None = None
+    seen_questions: set[str] = field(default_factory=set)
+    message_count: int = 0
+
+
+class SessionLog:
+    """Eventos das sessões em SQLite, só de acréscimo, lidos em janelas pelo fim."""
+
+    def __init__(self, path: Path | str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS events (
+                session_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                content TEXT NOT NULL,
+                data TEXT NOT NULL,
+                seconds REAL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (session_id, seq)
+            )"""
+        )
+        self._conn.commit()
+
+    def append(self, session_id: str, kind: str, content: str = "", seconds: float | None = None, **data: Any) -> int:
+        """Acrescenta um evento à sessão e retorna o número de sequência dele."""
+        with self._lock:
+            cursor = self._conn.execute(
+                # A sequência é calculada no próprio INSERT: o próximo número da sessão, sem corrida.
+                "INSERT INTO events SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ?, ?, ?, ?"
+                " FROM events WHERE session_id = ?",
+                (
+                    session_id,
+                    kind,
+                    content,
+                    json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+                    seconds,
+                    time.time(),
+                    session_id,
+                ),
+            )
+            seq = self._conn.execute("SELECT seq FROM events WHERE rowid = ?", (cursor.lastrowid,)).fetchone()[0]
+            self._conn.commit()
+            return seq
+
+    def messages(self, session_id: str, limit: int, before_seq: int | None = None) -> list[dict[str, Any]]:
+        """
+        As últimas `limit` mensagens do chat antes de `before_seq` (ou do fim da sessão), em ordem.
+
+        Returns:
+            list: dicts com `seq`, `role` e `content`
+        """
+        query = f"SELECT seq, kind, content FROM events WHERE session_id = ? AND {_IS_MESSAGE}"
+        params: list[Any] = [session_id, *MESSAGE_ROLES]
+        if before_seq is not None:
+            query += " AND seq < ?"
+            params.append(before_seq)
+        with self._lock:
+            rows = self._conn.execute(f"{query} ORDER BY seq DESC LIMIT ?", (*params, limit)).fetchall()
+        return [{"seq": seq, "role": MESSAGE_ROLES[kind], "content": content} for seq, kind, content in reversed(rows)]
+
+    def has_older(self, session_id: str, before_seq: int) -> bool:
+        """Se há mensagens do chat antes de `before_seq` (para oferecer a página anterior)."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT 1 FROM events WHERE session_id = ? AND {_IS_MESSAGE} AND seq < ? LIMIT 1",
+                (session_id, *MESSAGE_ROLES, before_seq),
+            ).fetchone()
+        return row is not None
+
+    def restore(self, session_id: str) -> SessionSnapshot | None:
+        """Reconstrói o estado da entrevista, ou None se a sessão não existir ou não tiver começado."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, content, data FROM events WHERE session_id = ? ORDER BY seq", (session_id,)
+            ).fetchall()
+        snapshot = None
+        for kind, content, raw_data in rows:
+            data = json.loads(raw_data)
+            if kind == "start":
+                snapshot = SessionSnapshot(data["company_name"], data["role"], data["difficulty"])
+            if snapshot is None:
+                continue
+            if kind in MESSAGE_ROLES:
+                snapshot.message_count += 1
+            if kind in QUESTION_KINDS:
+                snapshot.current_question = content
+                snapshot.correct_answer = data.get("correct_answer")
+                snapshot.seen_questions.add(content)
+            elif kind == "evaluation":
+                # O follow-up é registrado depois da avaliação; sem ele, a sessão segue com uma nova pergunta.
+                snapshot.current_question = None
+                snapshot.correct_answer = None
+        return snapshot
+
+    def session_summary(self, session_id: str) -> dict[str, dict[str, float]]:
+        """Por tipo de evento: quantidade e tempo total e médio das etapas registradas."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, COUNT(*), SUM(seconds), AVG(seconds) FROM events WHERE session_id = ? GROUP BY kind",
+                (session_id,),
+            ).fetchall()
+        return {
+            kind: {
+                "events": count,
+                "total_seconds": round(total or 0.0, 3),
+                "mean_seconds": round(mean, 3) if mean is not None else None,
+            }
+            for kind, count, total, mean in rows
+        }
+
+    def purge(self, max_idle_seconds: float) -> int:
+        """Remove as sessões cujo último evento é mais antigo que `max_idle_seconds`. Retorna os eventos removidos."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM events WHERE session_id IN"
+                " (SELECT session_id FROM events GROUP BY session_id HAVING MAX(created_at) < ?)",
+                (time.time() - max_idle_seconds,),
+            )
+            removed = cursor.rowcount
+            self._conn.commit()
+            return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            sessions, events = self._conn.execute("SELECT COUNT(DISTINCT session_id), COUNT(*) FROM events").fetchone()
+        return {"sessions": sessions, "events": events}
+
+
+_log: SessionLog | None = None
+_log_lock = threading.Lock()
+
+
+def get_session_log() -> SessionLog:
+    """Retorna o registro de sessões único do processo."""
+    global _log  # noqa: PLW0603
+    with _log_lock:
+        if _log is None:
+            _log = SessionLog(cache_dir() / "session_log.sqlite3")
+            _log.purge(float(os.getenv("SESSION_LOG_TTL_DAYS", DEFAULT_TTL_DAYS)) * 86400)
+        return _log
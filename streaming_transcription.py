@@ -0,0 +1,202 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script streaming_transcription.py
+=================================
+Transcrição incremental: o áudio chega em blocos e cada trecho de fala concluído
+(seguido de uma pausa) já é enviado ao pool de transcrição enquanto o candidato
+continua falando. Quando a gravação termina, só falta transcrever o final.
+
+Os trechos são transcritos em paralelo pelos workers do pool e o texto parcial
+(os trechos já concluídos, em ordem) pode ser exibido ao vivo. Cada transcritor mantém
+no máximo um pedido por worker no pool compartilhado; os demais trechos esperam na fila
+local dele, para que uma resposta longa não ocupe todas as vagas das outras sessões.
+
+`finish()` não bloqueia: os trechos que faltam são enviados por uma thread em segundo
+plano e, se a fila do pool continuar cheia, a transcrição termina só com o texto dos
+trechos já enviados. `feed_recording()` faz também a decodificação e a detecção de fala
+de uma gravação inteira nessa thread, fora de quem chama (ex.: o script do Streamlit).
+"""
+
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+from audio_decoding import WHISPER_SAMPLE_RATE, decode_audio_bytes
+from transcription_service import TranscriptionPool, TranscriptionQueueFullError, TranscriptionResult
+from voice_activity import DEFAULT_VAD_SETTINGS, WHISPER_WINDOW_SECONDS, VadSettings, detect_speech_segments
+
+
+class StreamingTranscriber:
+    """Recebe o áudio em blocos e transcreve em segundo plano os trechos de fala concluídos."""
+
+    def __init__(
+        self,
+        pool: TranscriptionPool,
+        model_name: str,
+        sample_rate: int = WHISPER_SAMPLE_RATE,
+        settings: VadSettings = DEFAULT_VAD_SETTINGS,
+        max_in_flight: int | None = None,
+    ):
+        self.pool = pool
+        self.model_name = model_name
+        self.sample_rate = sample_rate
+        self.settings = settings
+        # Pedidos deste transcritor no pool ao mesmo tempo (padrão: um por worker):
+        self.max_in_flight = max_in_flight or max(pool.workers, 1)
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._pending_segments: list[np.ndarray] = []
+        self._jobs: list[Future] = []
+        self._discarded_seconds = 0.0
+        self._finished = False
+        # Erro ao enviar os trechos finais (fila cheia); o texto dos trechos já enviados é mantido:
+        self.error: Exception | None = None
+        self.untranscribed_seconds = 0.0
+        # Reentrante: o callback de um pedido que já terminou roda dentro de `_submit_pending`.
+        self._lock = threading.RLock()
+        self._job_done = threading.Condition(self._lock)
+
+    def feed(self, samples: np.ndarray) -> None:
+        """Acrescenta um bloco de áudio (float32 mono) e envia os trechos de fala concluídos."""
+        with self._lock:
+            if self._finished:
+                raise RuntimeError("A gravação já foi finalizada")
+            self._buffer = np.concatenate((self._buffer, samples.astype(np.float32, copy=False)))
+            cut = self._find_cut_point()
+            if cut > 0:
+                self._pending_segments.append(self._buffer[:cut])
+                self._buffer = self._buffer[cut:]
+            self._submit_pending(timeout=0.0)
+
+    def finish(self, timeout: float = 30.0) -> None:
+        """
+        Marca o fim da gravação e envia o trecho final sem bloquear: o que não couber na fila
+        agora é enviado em segundo plano, aguardando até `timeout` segundos por vaga.
+        """
+        with self._lock:
+            self._finished = True
+            if self._buffer.size:
+                self._pending_segments.append(self._buffer)
+                self._buffer = np.zeros(0, dtype=np.float32)
+            self._submit_pending(timeout=0.0)
+            if not self._pending_segments:
+                return
+        threading.Thread(target=self._drain, args=(timeout,), name="transcription-finish", daemon=True).start()
+
+    def feed_recording(self, audio: bytes, block_samples: int = WHISPER_SAMPLE_RATE, timeout: float = 30.0) -> None:
+        """
+        Decodifica uma gravação inteira, entrega-a em blocos e finaliza, numa thread própria.
+
+        Retorna logo: o andamento é acompanhado com `done()`/`partial_text()` e um erro de
+        decodificação aparece em `error` (e em `result()`).
+        """
+
+        def run() -> None:
+            try:
+                samples = decode_audio_bytes(audio)
+                for start in range(0, samples.size, block_samples):
+                    self.feed(samples[start : start + block_samples])
+            except Exception as e:
+                with self._lock:
+                    self.error = e
+            self.finish(timeout)
+
+        threading.Thread(target=run, name="transcription-feed", daemon=True).start()
+
+    def partial_text(self) -> str:
+        """Texto dos trechos já transcritos, em ordem, até o primeiro ainda em andamento."""
+        texts = []
+        for job in self._jobs_snapshot():
+            if not job.done() or job.exception() is not None:
+                break
+            texts.append(job.result().text)
+        return " ".join(text for text in texts if text)
+
+    def done(self) -> bool:
+        with self._lock:
+            return self._finished and not self._pending_segments and all(job.done() for job in self._jobs)
+
+    def result(self) -> TranscriptionResult:
+        """
+        Junta os resultados dos trechos enviados (propaga o erro do primeiro trecho que falhou).
+
+        Se os trechos finais não puderam ser enviados (`error`), devolve o texto dos demais;
+        o erro só é propagado quando nenhum trecho chegou a ser enviado.
+        """
+        jobs = self._jobs_snapshot()
+        if self.error is not None and not jobs:
+            raise self.error
+        results = [job.result() for job in jobs]
+        return TranscriptionResult(
+            text=" ".join(result.text for result in results if result.text),
+            original_seconds=self._discarded_seconds + sum(result.original_seconds for result in results),
+            speech_seconds=sum(result.speech_seconds for result in results),
+            # Tempo de CPU somado dos trechos (que rodam em paralelo nos workers):
+            transcribe_seconds=sum(result.transcribe_seconds for result in results),
+        )
+
+    def _jobs_snapshot(self) -> list[Future]:
+        with self._lock:
+            return list(self._jobs)
+
+    def _find_cut_point(self) -> int:
+        """
+        Retorna até onde o buffer pode ser enviado: o fim do último trecho de fala seguido
+        de uma pausa longa. Sem pausa, corta ao atingir a janela do Whisper (30 s).
+        """
+        min_silence = int(self.sample_rate * self.settings.min_silence_ms / 1000)
+        segments = detect_speech_segments(self._buffer, self.sample_rate, self.settings)
+        completed = [end for _, end in segments if end + min_silence <= self._buffer.size]
+        if completed:
+            return completed[-1]
+        if not segments and self._buffer.size > min_silence:
+            # Só silêncio até agora: descarta-o, mantendo uma margem para o início da fala.
+            self._discarded_seconds += (self._buffer.size - min_silence) / self.sample_rate
+            self._buffer = self._buffer[-min_silence:]
+            return 0
+        max_samples = int(WHISPER_WINDOW_SECONDS * self.sample_rate)
+        return max_samples if self._buffer.size >= max_samples else 0
+
+    def _in_flight(self) -> int:
+        return sum(not job.done() for job in self._jobs)
+
+    def _on_job_done(self, _job: Future) -> None:
+        with self._lock:
+            self._job_done.notify_all()
+
+    def _submit_pending(self, timeout: float) -> None:
+        """Envia os trechos na ordem até o limite de pedidos; os restantes esperam o próximo bloco."""
+        while self._pending_segments and self._in_flight() < self.max_in_flight:
+            try:
+                job = self.pool.submit(self._pending_segments[0], self.model_name, timeout=timeout)
+            except TranscriptionQueueFullError:
+                return
+            job.add_done_callback(self._on_job_done)
+            self._jobs.append(job)
+            self._pending_segments.pop(0)
+
+    def _drain(self, timeout: float) -> None:
+        """
+        Envia os trechos restantes após `finish()`: espera um pedido deste transcritor terminar
+        e então até `timeout` segundos por vaga no pool, fora do lock (não trava `partial_text`).
+        """
+        while True:
+            with self._lock:
+                self._job_done.wait_for(lambda: self._in_flight() < self.max_in_flight)
+                if not self._pending_segments:
+                    return
+                segment = self._pending_segments[0]
+            try:
+                job = self.pool.submit(segment, self.model_name, timeout=timeout)
+            except Exception as e:
+                with self._lock:
+                    self.error = e
+                    self.untranscribed_seconds = sum(s.size for s in self._pending_segments) / self.sample_rate
+                    self._pending_segments.clear()
+                return
+            job.add_done_callback(self._on_job_done)
+            with self._lock:
+                self._jobs.append(job)
+                self._pending_segments.pop(0)
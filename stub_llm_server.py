@@ -0,0 +1,300 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script stub_llm_server.py
+=========================
+Servidor local que imita a API de chat da OpenAI e a API de busca do Serper, para medir
+o pipeline sem rede e sem custo.
+
+As respostas seguem o formato ReAct que os agentes do CrewAI esperam: o pesquisador
+recebe primeiro uma ação de busca e, depois da observação, a resposta final; tarefas com
+`QuestionAnswerPair` ou `CompanyResearchFacts` recebem JSON válido e as demais um texto fixo (também em streaming,
+quando o pedido usa `"stream": true`). Também é possível
+reproduzir respostas gravadas de um provedor real (`--record` + `--upstream` para gravar,
+`--replay` para reproduzir), indexadas pelo hash das mensagens.
+
+Para apontar a aplicação para o servidor:
+
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub
+    SERPER_BASE_URL=http://127.0.0.1:8765 SERPER_API_KEY=stub
+
+Run
+---
+uv run stub_llm_server.py --port 8765 --latency-ms 800 --jitter-ms 200
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+# Nome com que o SerperDevTool aparece no prompt do agente:
+SEARCH_TOOL_NAME = "Search the internet with Serper"
+
+# Respostas em streaming saem em pedaços deste tamanho:
+STREAM_PIECE_CHARS = 4
+
+SCRIPTED_RESEARCH = (
+    "A empresa conduz entrevistas técnicas em quatro etapas, com foco em estatística, "
+    "SQL, Python e aprendizado de máquina aplicado a problemas de negócio."
+)
+SCRIPTED_FACTS = {
+    "tech_stack": ["Python", "SQL", "BigQuery"],
+    "interview_format": ["triagem", "teste técnico", "entrevista comportamental"],
+    "typical_topics": ["estatística", "aprendizado de máquina", "SQL"],
+}
+SCRIPTED_QUESTION = {
+    "question": "Explique a diferença entre viés e variância e como ela afeta a escolha de um modelo.",
+    "correct_answer": (
+        "Viés é o erro por suposições simplificadas do modelo; variância é a sensibilidade a "
+        "flutuações do conjunto de treino. Modelos simples tendem a alto viés e modelos "
+        "complexos a alta variância; a escolha busca o equilíbrio, com validação cruzada e regularização."
+    ),
+}
+SCRIPTED_EVALUATION = (
+    "Pontos fortes: a resposta identifica os conceitos centrais. Pontos a melhorar: faltou "
+    "citar regularização e validação cruzada. Nota: 7/10."
+)
+SCRIPTED_SEARCH = {
+    "organic": [
+        {
+            "title": "Processo de entrevista para Cientista de Dados",
+            "link": "https://example.com/entrevista",
+            "snippet": "Etapas: triagem, teste técnico, entrevista de sistemas e entrevista comportamental.",
+            "position": 1,
+        }
+    ]
+}
+
+
+def messages_key(messages: list[dict[str, Any]]) -> str:
+    """Chave de gravação/reprodução: hash das mensagens enviadas ao LLM."""
+    return hashlib.sha256(json.dumps(messages, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+def _content(message: dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content
+
+
+def scripted_reply(messages: list[dict[str, Any]]) -> str:
+    """Resposta ReAct roteirizada para as mensagens de um agente."""
+    prompt = "\n".join(_content(message) for message in messages)
+    # Depois de usar a ferramenta o agente devolve a observação numa mensagem do assistente:
+    searched = any("Observation:" in _content(message) for message in messages if message.get("role") == "assistant")
+    if SEARCH_TOOL_NAME in prompt and not searched:
+        return (
+            "Thought: Preciso pesquisar o processo de entrevista da empresa.\n"
+            f"Action: {SEARCH_TOOL_NAME}\n"
+            'Action Input: {"search_query": "processo de entrevista cientista de dados"}'
+        )
+    if "tech_stack" in prompt:
+        answer = json.dumps(SCRIPTED_FACTS, ensure_ascii=False)
+    elif "correct_answer" in prompt:
+        answer = json.dumps(SCRIPTED_QUESTION, ensure_ascii=False)
+    elif SEARCH_TOOL_NAME in prompt:
+        answer = SCRIPTED_RESEARCH
+    else:
+        answer = SCRIPTED_EVALUATION
+    return f"Thought: I now know the final answer\nFinal Answer: {answer}"
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class StubLLMServer:
+    """Servidor HTTP numa thread daemon, com latência configurável e contadores de uso."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_seconds: float = 0.0,
+        jitter_seconds: float = 0.0,
+        replay_path: Path | str | None = None,
+    ):
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        # Intervalo entre pedaços de uma resposta em streaming (a latência vale até o primeiro):
+        self.stream_piece_seconds = 0.0
+        self.record_path: Path | None = None
+        self.upstream: str | None = None
+        self.upstream_key: str | None = None
+        self._lock = threading.Lock()
+        self._replay: dict[str, str] = {}
+        if replay_path is not None:
+            with open(replay_path, encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._replay[record["key"]] = record["content"]
+        self.stats = {"chat_requests": 0, "search_requests": 0, "replay_hits": 0, "replay_misses": 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-llm-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def record_from(self, upstream: str, api_key: str, record_path: Path | str) -> None:
+        """Encaminha as chamadas de chat ao provedor real e grava as respostas para reprodução."""
+        self.upstream = upstream.rstrip("/")
+        self.upstream_key = api_key
+        self.record_path = Path(record_path)
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _sleep(self) -> None:
+        delay = self.latency_seconds + random.uniform(-self.jitter_seconds, self.jitter_seconds)
+        if delay > 0:
+            time.sleep(delay)
+
+    def chat_completion(self, body: dict[str, Any]) -> dict[str, Any]:
+        self._count("chat_requests")
+        messages = body.get("messages", [])
+        key = messages_key(messages)
+        if self.upstream is not None:
+            return self._forward(body, key)
+
+        self._sleep()
+        if key in self._replay:
+            self._count("replay_hits")
+            content = self._replay[key]
+        else:
+            if self._replay:
+                self._count("replay_misses")
+            content = scripted_reply(messages)
+        prompt_tokens = sum(_estimate_tokens(_content(message)) for message in messages)
+        completion_tokens = _estimate_tokens(content)
+        return {
+            "id": f"chatcmpl-stub-{key[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def search(self) -> dict[str, Any]:
+        self._count("search_requests")
+        return SCRIPTED_SEARCH
+
+    def _forward(self, body: dict[str, Any], key: str) -> dict[str, Any]:
+        request = urllib.request.Request(
+            f"{self.upstream}/chat/completions",
+            data=json.dumps({**body, "stream": False}).encode(),
+            headers={"Authorization": f"Bearer {self.upstream_key}", "Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=120) as response:
+            result = json.loads(response.read())
+        with self._lock, self.record_path.open("a", encoding="utf-8") as file:
+            content = result["choices"][0]["message"]["content"]
+            file.write(json.dumps({"key": key, "content": content}, ensure_ascii=False) + "\n")
+        return result
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path.rstrip("/").endswith("/chat/completions"):
+                    payload = server.chat_completion(body)
+                    if body.get("stream"):
+                        self._send_stream(payload)
+                        return
+                elif self.path.rstrip("/") in {"/search", "/news"}:
+                    payload = server.search()
+                else:
+                    self.send_error(404)
+                    return
+                data = json.dumps(payload, ensure_ascii=False).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, payload: dict[str, Any]) -> None:
+                """Devolve a resposta como server-sent events, em pedaços de poucos caracteres."""
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                content = payload["choices"][0]["message"]["content"]
+                pieces = [content[i : i + STREAM_PIECE_CHARS] for i in range(0, len(content), STREAM_PIECE_CHARS)]
+                for index, piece in enumerate([*pieces, None]):
+                    delta = {"role": "assistant", "content": piece} if piece is not None else {}
+                    chunk = {
+                        "id": payload["id"],
+                        "object": "chat.completion.chunk",
+                        "created": payload["created"],
+                        "model": payload["model"],
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": None if piece else "stop"}],
+                    }
+                    if index and server.stream_piece_seconds:
+                        time.sleep(server.stream_piece_seconds)
+                    self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode())
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local que imita as APIs da OpenAI e do Serper")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latência de cada chamada ao LLM")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Variação aleatória da latência")
+    parser.add_argument("--piece-ms", type=float, default=0.0, help="Intervalo entre pedaços em streaming")
+    parser.add_argument("--replay", help="JSONL de respostas gravadas para reproduzir")
+    parser.add_argument("--record", help="JSONL onde gravar as respostas do provedor real")
+    parser.add_argument("--upstream", default="https://api.openai.com/v1", help="Provedor real usado com --record")
+    args = parser.parse_args()
+
+    stub = StubLLMServer(
+        port=args.port,
+        latency_seconds=args.latency_ms / 1000,
+        jitter_seconds=args.jitter_ms / 1000,
+        replay_path=args.replay,
+    )
+    stub.stream_piece_seconds = args.piece_ms / 1000
+    if args.record:
+        stub.record_from(args.upstream, os.environ["OPENAI_API_KEY"], args.record)
+    print(f"Servidor stub em {stub.base_url}/v1 (Ctrl+C para encerrar)")
+    stub.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stub.stop()
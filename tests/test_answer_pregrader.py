@@ -0,0 +1,34 @@
+"""A pré-avaliação só dispensa o LLM em casos claramente negativos."""
+
+from answer_pregrader import PreGrader
+
+QUESTION = "Explique a diferença entre viés e variância."
+CORRECT_ANSWER = (
+    "Viés é o erro causado por suposições simplificadas do modelo. "
+    "Variância é a sensibilidade do modelo a flutuações dos dados de treino."
+)
+
+
+def test_full_answer_goes_to_the_llm() -> None:
+    grade = PreGrader().grade(QUESTION, CORRECT_ANSWER, CORRECT_ANSWER)
+    assert grade.verdict == "strong"
+    assert grade.feedback is None
+
+
+def test_negated_answer_goes_to_the_llm() -> None:
+    answer = (
+        "Viés não é o erro causado por suposições simplificadas do modelo. "
+        "Variância não é a sensibilidade do modelo a flutuações dos dados de treino."
+    )
+    assert PreGrader().grade(QUESTION, answer, CORRECT_ANSWER).feedback is None
+
+
+def test_dont_know_and_empty_answers_skip_the_llm() -> None:
+    grader = PreGrader()
+    answers = (("Não sei.", "dont_know"), ("   ", "empty"))
+    for answer, verdict in answers:
+        grade = grader.grade(QUESTION, answer, CORRECT_ANSWER)
+        assert grade.verdict == verdict
+        assert grade.feedback is not None
+        assert grade.feedback.startswith("1. A resposta é correta? Não")
+    assert grader.stats()["llm_skipped"] == len(answers)
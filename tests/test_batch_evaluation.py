@@ -0,0 +1,27 @@
+"""Só erros de rate limit de verdade disparam novas tentativas no lote."""
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from batch_evaluation import is_rate_limit_error
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class ProviderError(Exception):
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def test_rate_limits_are_recognized_by_status_or_type() -> None:
+    assert is_rate_limit_error(ProviderError("Too Many Requests", status_code=429))
+    assert is_rate_limit_error(RateLimitError("slow down"))
+
+
+def test_429_in_the_message_is_not_a_rate_limit() -> None:
+    assert not is_rate_limit_error(ValueError("context has 4290 tokens, request id req_429"))
+    assert not is_rate_limit_error(ProviderError("bad request 429", status_code=400))
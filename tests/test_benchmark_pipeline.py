@@ -0,0 +1,25 @@
+"""A comparação com o baseline acusa métricas piores e etapas que sumiram."""
+
+from benchmark_pipeline import compare_with_baseline
+
+
+def _summary(**stages: dict) -> dict:
+    return {"end_to_end_seconds": 1.0, "peak_memory_mb": 50.0, "stages": stages}
+
+
+def test_same_measures_pass() -> None:
+    stage = {"overhead_seconds": 0.1, "llm_calls": 2}
+    assert compare_with_baseline(_summary(evaluation=stage), _summary(evaluation=stage), tolerance=0.2) == []
+
+
+def test_extra_llm_call_is_a_regression() -> None:
+    baseline = _summary(evaluation={"overhead_seconds": 0.1, "llm_calls": 2})
+    current = _summary(evaluation={"overhead_seconds": 0.1, "llm_calls": 3})
+    assert compare_with_baseline(current, baseline, tolerance=0.2) == ["evaluation.llm_calls: 2 -> 3"]
+
+
+def test_missing_baseline_stage_is_a_regression() -> None:
+    stage = {"overhead_seconds": 0.1, "llm_calls": 2}
+    baseline = _summary(evaluation=stage, follow_up=stage)
+    regressions = compare_with_baseline(_summary(follow_up=stage), baseline, tolerance=0.2)
+    assert regressions == ["evaluation: etapa ausente nas medidas atuais"]
@@ -0,0 +1,34 @@
+"""As crews de cada chamada são cópias preenchidas do modelo, sem reinterpretar o texto do candidato."""
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from interview_practice_system import _fill_crew_template
+
+
+class TemplateCrew:
+    """Crew modelo falsa: `copy()` devolve tarefas novas com as mesmas descrições."""
+
+    def __init__(self, *descriptions: str):
+        self.tasks = [SimpleNamespace(description=description) for description in descriptions]
+
+    def copy(self) -> "TemplateCrew":
+        return TemplateCrew(*(task.description for task in self.tasks))
+
+
+def test_fill_leaves_the_template_untouched() -> None:
+    template = TemplateCrew("Pergunta: {question}")
+    crew = _fill_crew_template(template, question="O que é overfitting?")
+
+    assert crew.tasks[0].description == "Pergunta: O que é overfitting?"
+    assert template.tasks[0].description == "Pergunta: {question}"
+
+
+def test_fields_inside_values_are_not_filled() -> None:
+    template = TemplateCrew("Resposta: {user_answer}\nResposta Correta: {correct_answer}")
+    crew = _fill_crew_template(template, user_answer="{correct_answer} \\1", correct_answer="segredo")
+
+    assert crew.tasks[0].description == "Resposta: {correct_answer} \\1\nResposta Correta: segredo"
@@ -0,0 +1,40 @@
+"""Respostas quase iguais só reaproveitam a avaliação quando dizem a mesma coisa."""
+
+import pytest
+
+from evaluation_cache import EvaluationCache
+
+QUESTION = "Explique a diferença entre viés e variância."
+CORRECT_ANSWER = "Viés é o erro de suposições simplificadas; variância é a sensibilidade aos dados de treino."
+ANSWER = (
+    "Viés é o erro de suposições simplificadas e variância é a sensibilidade aos dados de treino. "
+    "A regularização reduz a variância e tende a zerar pesos irrelevantes."
+)
+EVALUATION = "1. A resposta é correta? Sim"
+
+
+@pytest.fixture
+def cache() -> EvaluationCache:
+    cache = EvaluationCache()
+    cache.put(QUESTION, CORRECT_ANSWER, ANSWER, EVALUATION)
+    return cache
+
+
+def test_same_answer_with_other_punctuation_and_case_hits(cache: EvaluationCache) -> None:
+    answer = ANSWER.upper().replace(".", "!").replace("é", "e")
+    assert cache.get(QUESTION, CORRECT_ANSWER, answer) == EVALUATION
+
+
+@pytest.mark.parametrize(
+    "answer",
+    [
+        # Os dois conceitos trocados de lugar:
+        ANSWER.replace("Viés", "VARIANCIA").replace("variância é", "viés é").replace("VARIANCIA", "Variância"),
+        # A mesma resposta com uma negação:
+        ANSWER.replace("e tende a zerar", "e não tende a zerar"),
+        ANSWER.replace("reduz a variância", "nunca reduz a variância"),
+    ],
+)
+def test_swapped_or_negated_answer_misses(cache: EvaluationCache, answer: str) -> None:
+    assert answer != ANSWER
+    assert cache.get(QUESTION, CORRECT_ANSWER, answer) is None
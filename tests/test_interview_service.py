@@ -0,0 +1,134 @@
+"""Registro das sessões e máquina de estados do serviço (pergunta principal -> follow-up -> principal)."""
+
+import asyncio
+import itertools
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("crewai")
+
+import interview_service
+from interview_practice_system import QuestionAnswerPair
+from interview_service import (
+    InterviewService,
+    InvalidSessionStateError,
+    SessionStore,
+    UnknownSessionError,
+)
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> SessionStore:
+    return SessionStore(tmp_path / "sessions.sqlite3")
+
+
+@pytest.fixture(autouse=True)
+def local_evaluation(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(interview_service, "evaluate_without_llm", lambda question, answer, _correct: f"ok: {answer}")
+
+
+def _fake_generators(service: InterviewService) -> dict[str, int]:
+    """Troca as crews de geração por perguntas numeradas e conta as gerações de cada tipo."""
+    calls = {"main": 0, "follow_up": 0}
+    numbers = itertools.count(1)
+
+    async def prepare(_session_id: str, _state: dict) -> QuestionAnswerPair:
+        calls["main"] += 1
+        return QuestionAnswerPair(question=f"principal {next(numbers)}", correct_answer="resposta")
+
+    async def follow_up(_session_id: str, _state: dict) -> QuestionAnswerPair:
+        calls["follow_up"] += 1
+        return QuestionAnswerPair(question=f"follow-up {next(numbers)}", correct_answer="resposta")
+
+    service._prepare_main_question = prepare
+    service._generate_follow_up = follow_up
+    return calls
+
+
+def test_store_round_trip_and_delete(store: SessionStore) -> None:
+    store.put("s1", {"question": None, "seen": ["a"]})
+    assert store.get("s1") == {"question": None, "seen": ["a"]}
+    store.delete("s1")
+    with pytest.raises(UnknownSessionError):
+        store.get("s1")
+
+
+def test_store_purge_returns_removed_ids(store: SessionStore) -> None:
+    store.put("s1", {})
+    assert store.purge(max_idle_seconds=3600) == []
+    assert store.purge(max_idle_seconds=-1) == ["s1"]
+    with pytest.raises(UnknownSessionError):
+        store.get("s1")
+
+
+def test_questions_alternate_between_main_and_follow_up(store: SessionStore) -> None:
+    async def scenario() -> None:
+        service = InterviewService(store)
+        calls = _fake_generators(service)
+        session_id = await service.start_session("Google", "Cientista de Dados", "médio")
+
+        kinds = []
+        for answer in ("a", "b", "c"):
+            question = await service.next_question(session_id)
+            # Pedir de novo antes de responder devolve a mesma pergunta, sem gerar outra:
+            assert await service.next_question(session_id) == question
+            kinds.append(question["kind"])
+            assert await service.submit_answer(session_id, answer) == f"ok: {answer}"
+
+        assert kinds == ["main", "follow_up", "main"]
+        assert calls == {"main": 2, "follow_up": 1}
+        history = service.describe(session_id)["history"]
+        assert [turn["answer"] for turn in history] == ["a", "b", "c"]
+
+    asyncio.run(scenario())
+
+
+def test_answer_without_open_question_is_rejected(store: SessionStore) -> None:
+    async def scenario() -> None:
+        service = InterviewService(store)
+        _fake_generators(service)
+        session_id = await service.start_session("Google", "Cientista de Dados", "médio")
+        await service.next_question(session_id)
+        await service.submit_answer(session_id, "a")
+        with pytest.raises(InvalidSessionStateError):
+            await service.submit_answer(session_id, "de novo")
+
+    asyncio.run(scenario())
+
+
+def test_restart_without_generation_in_progress_generates_on_demand(store: SessionStore) -> None:
+    async def scenario() -> None:
+        service = InterviewService(store)
+        _fake_generators(service)
+        session_id = await service.start_session("Google", "Cientista de Dados", "médio")
+        await service.next_question(session_id)
+        await service.submit_answer(session_id, "a")
+
+        # Um novo processo não tem as gerações em segundo plano do anterior:
+        restarted = InterviewService(store)
+        calls = _fake_generators(restarted)
+        question = await restarted.next_question(session_id)
+        assert question["kind"] == "follow_up"
+        assert calls == {"main": 0, "follow_up": 1}
+
+    asyncio.run(scenario())
+
+
+def test_purge_idle_forgets_jobs_and_locks(store: SessionStore) -> None:
+    async def scenario() -> None:
+        service = InterviewService(store)
+        _fake_generators(service)
+        session_id = await service.start_session("Google", "Cientista de Dados", "médio")
+        await service.next_question(session_id)
+        assert service._jobs
+        assert service._locks
+
+        assert service.purge_idle(max_idle_seconds=-1) == 1
+        assert not service._jobs
+        assert not service._locks
+        with pytest.raises(UnknownSessionError):
+            service.describe(session_id)
+
+    asyncio.run(scenario())
@@ -0,0 +1,54 @@
+"""As tentativas de uma etapa ocupam vagas do limite de concorrência até terminarem de fato."""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from llm_tiers import StageDeadlineError, run_stage
+
+
+class SlowCrew:
+    """Crew falsa cuja execução só termina quando o teste libera."""
+
+    def __init__(self, release: threading.Event, finished: threading.Event):
+        self.release = release
+        self.finished = finished
+
+    def copy(self) -> "SlowCrew":
+        return self
+
+    def calculate_usage_metrics(self) -> None:
+        return None
+
+    def kickoff(self) -> SimpleNamespace:
+        self.release.wait()
+        self.finished.set()
+        return SimpleNamespace(raw="pronto", token_usage=None)
+
+
+def test_attempt_keeps_its_slot_after_the_deadline(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("EVALUATION_DEADLINE_SECONDS", "0.05")
+    monkeypatch.delenv("LLM_FALLBACK_MODEL", raising=False)
+    release, finished = threading.Event(), threading.Event()
+    slots = threading.BoundedSemaphore(1)
+
+    with pytest.raises(StageDeadlineError):
+        run_stage("evaluation", SlowCrew(release, finished), hedge=False, slots=slots)
+    # A tentativa órfã ainda está chamando o LLM: a vaga continua ocupada.
+    assert not slots.acquire(blocking=False)
+
+    release.set()
+    assert finished.wait(timeout=5)
+    assert slots.acquire(timeout=5)
+
+
+def test_successful_attempt_returns_its_slot() -> None:
+    release, finished = threading.Event(), threading.Event()
+    release.set()
+    slots = threading.BoundedSemaphore(1)
+
+    assert run_stage("evaluation", SlowCrew(release, finished), hedge=False, slots=slots).raw == "pronto"
+    assert slots.acquire(timeout=5)
@@ -0,0 +1,44 @@
+"""Uma chave cuja geração falha não impede o reabastecimento das outras."""
+
+import itertools
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from interview_practice_system import QuestionAnswerPair
+from question_pool import QuestionPool
+
+FAILING = ("Empresa Instável", "Cargo", "médio")
+HEALTHY = ("Google", "Cientista de Dados", "médio")
+
+
+def test_failing_key_does_not_starve_other_keys(tmp_path: Path) -> None:
+    numbers = itertools.count(1)
+    attempts = {FAILING: 0, HEALTHY: 0}
+
+    def generate(company_name: str, role: str, difficulty: str) -> QuestionAnswerPair:
+        attempts[(company_name, role, difficulty)] += 1
+        if (company_name, role, difficulty) == FAILING:
+            raise RuntimeError("provedor fora do ar")
+        return QuestionAnswerPair(question=f"pergunta {next(numbers)}", correct_answer="resposta")
+
+    pool = QuestionPool(tmp_path / "pool.sqlite3", generate, target_depth=2)
+    # A chave que falha é a mais procurada: sem espera por chave, o produtor voltaria sempre a ela.
+    for _ in range(3):
+        pool.take(*FAILING)
+    for _ in range(2):
+        pool.take(*HEALTHY)
+
+    pool.start()
+    try:
+        deadline = time.monotonic() + 5
+        while pool.depth(*HEALTHY) < pool.target_depth and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        pool.stop()
+
+    assert pool.depth(*HEALTHY) == pool.target_depth
+    assert attempts[FAILING] == 1
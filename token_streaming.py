@@ -0,0 +1,188 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script token_streaming.py
+=========================
+Streaming dos tokens das crews de avaliação e de follow-up para a interface.
+
+Com `stream=True` o LLM do CrewAI emite um `LLMStreamChunkEvent` por pedaço de texto,
+marcado com o id da tarefa que o gerou. Um único listener no barramento de eventos do
+CrewAI repassa cada pedaço para a fila do stream dono daquela tarefa; a interface
+consome a fila numa thread qualquer enquanto a crew roda no loop da sessão.
+
+Os pedaços não trazem o id da chamada ao LLM, e o `LLMCallStartedEvent` é entregue por
+um pool de threads (pode chegar depois dos primeiros pedaços da chamada). Por isso o
+início de cada chamada é marcado na fila pelo próprio LLM da cópia da crew, na thread
+da chamada e antes do primeiro pedaço dela.
+
+Os agentes respondem no formato ReAct ("Thought: ... Final Answer: ..."), então só o
+texto depois de "Final Answer:" é mostrado; para tarefas com saída JSON mostra-se só o
+valor de um campo (ex.: o texto da pergunta de follow-up).
+"""
+
+import json
+import queue
+import re
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+from crewai import Crew
+from crewai.events import crewai_event_bus
+from crewai.events.types.llm_events import LLMStreamChunkEvent
+
+from llm_tiers import run_stage_async
+
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+# Marcadores colocados na fila além dos pedaços de texto:
+_NEW_CALL = object()
+_DONE = object()
+
+_subscribers: dict[str, queue.Queue] = {}
+_subscribers_lock = threading.Lock()
+_listener_registered = False
+
+
+def _route(task_id: str | None, item: object) -> None:
+    if task_id is None:
+        return
+    with _subscribers_lock:
+        chunks = _subscribers.get(task_id)
+    if chunks is not None:
+        chunks.put(item)
+
+
+def _ensure_listener() -> None:
+    """Registra uma única vez o handler que distribui os pedaços por id de tarefa."""
+    global _listener_registered  # noqa: PLW0603
+    with _subscribers_lock:
+        if _listener_registered:
+            return
+        _listener_registered = True
+
+    # Os handlers de LLMStreamChunkEvent rodam na thread que emitiu o evento, em ordem.
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def on_chunk(_source: Any, event: LLMStreamChunkEvent) -> None:
+        if event.tool_call is None:
+            _route(event.task_id, event.chunk)
+
+
+class FinalAnswerFilter:
+    """Deixa passar só o texto que vem depois de "Final Answer:" na resposta do agente."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._buffer = ""
+        self._emitted = 0
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        start = self._buffer.find(FINAL_ANSWER_MARKER)
+        if start == -1:
+            return ""
+        visible = self._visible(self._buffer[start + len(FINAL_ANSWER_MARKER) :].lstrip())
+        delta = visible[self._emitted :]
+        self._emitted = len(visible)
+        return delta
+
+    def _visible(self, answer: str) -> str:
+        return answer
+
+
+class JsonFieldFilter(FinalAnswerFilter):
+    """Mostra, à medida que chega, o valor de um campo texto do JSON da resposta final."""
+
+    def __init__(self, field: str):
+        self._field_start = re.compile(rf'"{re.escape(field)}"\s*:\s*"')
+        super().__init__()
+
+    def _visible(self, answer: str) -> str:
+        match = self._field_start.search(answer)
+        if match is None:
+            return ""
+        return _decode_partial_json_string(answer[match.end() :])
+
+
+def _decode_partial_json_string(raw: str) -> str:
+    """Decodifica o começo de uma string JSON ainda incompleta (sem as aspas iniciais)."""
+    end = 0
+    while end < len(raw) and raw[end] != '"':
+        end += 2 if raw[end] == "\\" else 1
+    body = raw[: min(end, len(raw))]
+    # Um escape pode ter chegado pela metade (ex.: "\\u00"); descarta-o até o próximo pedaço.
+    for cut in range(len(body), max(len(body) - 6, -1), -1):
+        try:
+            return json.loads(f'"{body[:cut]}"')
+        except json.JSONDecodeError:
+            continue
+    return ""
+
+
+class CrewTokenStream:
+    """
+    Executa uma crew com streaming e expõe o texto visível à medida que é gerado.
+
+    `run()` é a corrotina que executa a crew (ex.: no loop da sessão) e devolve o
+    `CrewOutput`; `visible_text()` é um gerador síncrono com o texto visível acumulado,
+    que termina quando a crew termina. Cada stream tem um único consumidor.
+    """
+
+    def __init__(self, stage: str, crew: Crew, visible: FinalAnswerFilter | None = None):
+        _ensure_listener()
+        self.stage = stage
+        self.crew = _streaming_copy(crew)
+        self.visible = visible or FinalAnswerFilter()
+        self._chunks: queue.Queue = queue.Queue()
+
+    async def run(self) -> Any:
+        task_ids = [str(task.id) for task in self.crew.tasks]
+        with _subscribers_lock:
+            for task_id in task_ids:
+                _subscribers[task_id] = self._chunks
+        try:
+            # Sem cópia em paralelo nem da tentativa principal: os pedaços delas não chegariam a este
+            # stream. A crew já é uma cópia exclusiva (`_streaming_copy`).
+            return await run_stage_async(self.stage, self.crew, hedge=False, copy_crew=False, streamed=True)
+        finally:
+            with _subscribers_lock:
+                for task_id in task_ids:
+                    _subscribers.pop(task_id, None)
+            self._chunks.put(_DONE)
+
+    def visible_text(self) -> Iterator[str]:
+        """Gera o texto visível inteiro a cada novo trecho; volta a "" quando uma nova chamada ao LLM começa."""
+        shown = ""
+        while (item := self._chunks.get()) is not _DONE:
+            if item is _NEW_CALL:
+                # Nova chamada ao LLM (ex.: nova tentativa do agente): descarta o texto da anterior.
+                self.visible.reset()
+                if shown:
+                    shown = ""
+                    yield shown
+            elif delta := self.visible.feed(item):
+                shown += delta
+                yield shown
+
+
+def _streaming_copy(crew: Crew) -> Crew:
+    """Cópia da crew com streaming ligado só nos LLMs das cópias dos agentes."""
+    crew = crew.copy()
+    for llm in {id(agent.llm): agent.llm for agent in crew.agents}.values():
+        llm.stream = True
+        _mark_new_calls(llm)
+    return crew
+
+
+def _mark_new_calls(llm: Any) -> None:
+    """Faz cada chamada do LLM pôr `_NEW_CALL` na fila da tarefa, na própria thread, antes dos pedaços."""
+    call = llm.call
+
+    def marked_call(*args: Any, from_task: Any = None, **kwargs: Any) -> Any:
+        _route(str(from_task.id) if from_task is not None else None, _NEW_CALL)
+        return call(*args, from_task=from_task, **kwargs)
+
+    llm.call = marked_call
@@ -0,0 +1,284 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script transcription_service.py
+===============================
+Serviço de transcrição fora da thread do script do Streamlit.
+
+`model.transcribe` é pesado para a CPU: rodá-lo dentro do script do Streamlit congela
+a sessão do usuário e várias sessões falando ao mesmo tempo disputam a CPU sem limite.
+Aqui a transcrição roda num pool de processos com workers "quentes" (cada um mantém
+seu modelo Whisper carregado no próprio registro) e uma fila limitada: quando ela está
+cheia, novos pedidos são recusados em vez de acumularem. Cada pedido devolve um
+`Future` que a interface consulta a cada rerun.
+
+Como cada worker tem o próprio registro, o orçamento de RAM é dividido entre eles, e as
+estatísticas de cada registro voltam junto com os resultados. Se um worker morre (por
+exemplo, falha ao carregar o modelo na inicialização), o pool de processos fica quebrado
+e é recriado no próximo pedido.
+
+Configuração
+------------
+WHISPER_WORKERS: número de processos (padrão: min(2, CPUs); 0 roda numa thread do próprio processo)
+WHISPER_MAX_PENDING: pedidos aceitos ao mesmo tempo, incluindo os em execução (padrão: 4 por worker)
+WHISPER_RAM_BUDGET_MB: orçamento TOTAL de RAM para os pesos, dividido igualmente entre os workers (padrão: 4096)
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from audio_decoding import decode_audio_bytes
+from voice_activity import trim_silence
+from whisper_model_registry import DEFAULT_RAM_BUDGET_MB, get_model_registry
+
+
+@dataclass
+class TranscriptionResult:
+    """Texto transcrito e quanto áudio (silêncio) deixou de passar pelo modelo."""
+
+    text: str
+    original_seconds: float
+    speech_seconds: float
+    transcribe_seconds: float
+    # Preenchido pelos workers de processo: (pid, estatísticas do registro do worker).
+    worker_stats: tuple[int, dict] | None = field(default=None, repr=False)
+
+    @property
+    def dropped_seconds(self) -> float:
+        return max(self.original_seconds - self.speech_seconds, 0.0)
+
+    @property
+    def dropped_ratio(self) -> float:
+        return self.dropped_seconds / self.original_seconds if self.original_seconds else 0.0
+
+
+class TranscriptionQueueFullError(RuntimeError):
+    """A fila de transcrição está cheia; o pedido deve ser refeito mais tarde."""
+
+
+def transcribe_audio(audio: bytes | np.ndarray, model_name: str = "base") -> TranscriptionResult:
+    """
+    Decodifica, remove o silêncio e transcreve o áudio com o modelo do registro do processo.
+
+    Args:
+        audio: Bytes gravados pelo `mic_recorder` ou amostras float32 a 16 kHz já decodificadas
+        model_name: Nome do modelo Whisper (tiny, base, small, medium, large)
+    """
+    start = time.perf_counter()
+    samples = decode_audio_bytes(audio) if isinstance(audio, bytes) else audio
+    speech = trim_silence(samples)
+    texts = []
+    if speech.chunks:
+        model = get_model_registry().get(model_name)
+        for chunk in speech.chunks:
+            result = model.transcribe(
+                chunk,
+                language="pt",  # Português (Brasil/Portugal)
+                fp16=False,  # Desabilita FP16 (necessário para CPU)
+                verbose=False,  # Não mostra progresso detalhado
+            )
+            texts.append(result["text"].strip())
+    return TranscriptionResult(
+        text=" ".join(text for text in texts if text),
+        original_seconds=speech.original_seconds,
+        speech_seconds=speech.speech_seconds,
+        transcribe_seconds=time.perf_counter() - start,
+    )
+
+
+def _init_worker(model_name: str, torch_threads: int, ram_budget_mb: float) -> None:
+    """Inicializa um worker: divide os núcleos e a RAM entre os processos e já carrega o modelo."""
+    import torch  # noqa: PLC0415  (só é necessário dentro dos workers)
+
+    torch.set_num_threads(torch_threads)
+    get_model_registry().ram_budget_mb = ram_budget_mb
+    get_model_registry().get(model_name)
+
+
+def _worker_stats() -> tuple[int, dict]:
+    return os.getpid(), get_model_registry().stats()
+
+
+def _transcribe_in_worker(audio: bytes | np.ndarray, model_name: str) -> TranscriptionResult:
+    result = transcribe_audio(audio, model_name)
+    result.worker_stats = _worker_stats()
+    return result
+
+
+def _warm_up(model_name: str) -> tuple[int, dict]:
+    get_model_registry().get(model_name)
+    return _worker_stats()
+
+
+class TranscriptionPool:
+    """Pool limitado de workers de transcrição com contrapressão (thread-safe)."""
+
+    def __init__(self, model_name: str, workers: int, max_pending: int, ram_budget_mb: float = DEFAULT_RAM_BUDGET_MB):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ram_budget_mb = ram_budget_mb
+        self._model_name = model_name
+        if workers > 0:
+            self._executor = self._new_process_executor()
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+            get_model_registry().preload(model_name)
+        self._executor_lock = threading.Lock()
+        # Último relato do registro de cada worker vivo, por pid:
+        self._worker_registries: dict[int, dict] = {}
+        self._rebuilds = 0
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+
+    def submit(self, audio: bytes | np.ndarray, model_name: str, timeout: float = 0.0) -> Future:
+        """
+        Enfileira uma transcrição e retorna um `Future[TranscriptionResult]`.
+
+        Raises:
+            TranscriptionQueueFullError: Se a fila continuar cheia após `timeout` segundos
+        """
+        if not self._slots.acquire(timeout=timeout):
+            with self._lock:
+                self._rejected += 1
+            raise TranscriptionQueueFullError(
+                f"Fila de transcrição cheia ({self.max_pending} pedidos em andamento). Tente novamente."
+            )
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._pending += 1
+            self._submitted += 1
+        try:
+            future = self._submit(_transcribe_in_worker if self.workers > 0 else transcribe_audio, audio, model_name)
+        except Exception:
+            self._release(failed=True, elapsed=0.0)
+            raise
+        future.add_done_callback(lambda f: self._on_done(f, time.perf_counter() - submitted_at))
+        return future
+
+    def preload(self, model_name: str) -> None:
+        """Pede a cada worker que carregue o modelo (sem ocupar vagas da fila)."""
+        if self.workers == 0:
+            get_model_registry().preload(model_name)
+            return
+        for _ in range(self.workers):
+            self._submit(_warm_up, model_name).add_done_callback(self._record_worker_stats)
+
+    def stats(self) -> dict:
+        """Estatísticas do pool: fila, pedidos atendidos/recusados e latência média."""
+        with self._lock:
+            stats = {
+                "workers": self.workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_seconds": round(self._total_seconds / self._completed, 3) if self._completed else None,
+            }
+            if self.workers > 0:
+                stats["rebuilds"] = self._rebuilds
+                stats["registry"] = {
+                    "ram_budget_mb": self.ram_budget_mb,
+                    "ram_budget_mb_per_worker": self.ram_budget_mb / self.workers,
+                    "memory_mb": round(sum(w["memory_mb"] for w in self._worker_registries.values()), 1),
+                    "workers": dict(self._worker_registries),
+                }
+        if self.workers == 0:
+            stats["registry"] = get_model_registry().stats()
+        return stats
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _new_process_executor(self) -> ProcessPoolExecutor:
+        # "spawn" evita herdar por fork as threads do servidor Streamlit.
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                self._model_name,
+                max((os.cpu_count() or 1) // self.workers, 1),
+                self.ram_budget_mb / self.workers,
+            ),
+        )
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Envia ao executor; se o pool de processos estiver quebrado, recria-o e tenta uma vez mais."""
+        with self._executor_lock:
+            try:
+                return self._executor.submit(fn, *args)
+            except BrokenProcessPool:
+                if self.workers == 0:
+                    raise
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_process_executor()
+                with self._lock:
+                    self._rebuilds += 1
+                    # Os workers antigos morreram junto com o pool quebrado:
+                    self._worker_registries.clear()
+                return self._executor.submit(fn, *args)
+
+    def _on_done(self, future: Future, elapsed: float) -> None:
+        failed = future.cancelled() or future.exception() is not None
+        if not failed:
+            self._record_worker_stats(future)
+        self._release(failed=failed, elapsed=elapsed)
+
+    def _record_worker_stats(self, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        worker_stats = result.worker_stats if isinstance(result, TranscriptionResult) else result
+        if worker_stats is not None:
+            pid, registry_stats = worker_stats
+            with self._lock:
+                self._worker_registries[pid] = registry_stats
+
+    def _release(self, failed: bool, elapsed: float) -> None:
+        with self._lock:
+            self._pending -= 1
+            if failed:
+                self._failed += 1
+            else:
+                self._completed += 1
+                self._total_seconds += elapsed
+        self._slots.release()
+
+
+_pool: TranscriptionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_transcription_pool(model_name: str = "base") -> TranscriptionPool:
+    """
+    Retorna o pool único do processo, criando-o na primeira chamada.
+
+    O pool atende qualquer modelo: `model_name` só define o modelo carregado de antemão
+    nos workers; outros modelos são carregados sob demanda pelo registro de cada worker.
+    """
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is None:
+            workers = int(os.getenv("WHISPER_WORKERS", min(2, os.cpu_count() or 1)))
+            max_pending = int(os.getenv("WHISPER_MAX_PENDING", 4 * max(workers, 1)))
+            ram_budget_mb = float(os.getenv("WHISPER_RAM_BUDGET_MB", DEFAULT_RAM_BUDGET_MB))
+            _pool = TranscriptionPool(model_name, workers=workers, max_pending=max_pending, ram_budget_mb=ram_budget_mb)
+        return _pool
@@ -0,0 +1,147 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script voice_activity.py
+========================
+Detecção de atividade de voz (VAD) por energia, implementada com NumPy.
+
+O custo do Whisper cresce com a duração do áudio, e as respostas gravadas costumam
+ter longos trechos de silêncio (no início, nas pausas e no fim). Aqui detectamos os
+trechos de fala, descartamos o silêncio e agrupamos a fala em blocos de até 30 s
+(a janela do Whisper), de modo que só a fala passa pelo modelo.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from audio_decoding import WHISPER_SAMPLE_RATE
+
+# Janela de contexto do Whisper: cada chamada processa o áudio em blocos de 30 s.
+WHISPER_WINDOW_SECONDS = 30.0
+
+
+@dataclass
+class VoiceActivityResult:
+    """Blocos de fala prontos para transcrição e quanto áudio foi descartado."""
+
+    chunks: list[np.ndarray] = field(default_factory=list)
+    original_seconds: float = 0.0
+    speech_seconds: float = 0.0
+
+    @property
+    def dropped_seconds(self) -> float:
+        return max(self.original_seconds - self.speech_seconds, 0.0)
+
+    @property
+    def dropped_ratio(self) -> float:
+        return self.dropped_seconds / self.original_seconds if self.original_seconds else 0.0
+
+
+@dataclass(frozen=True)
+class VadSettings:
+    """
+    Parâmetros do detector de voz.
+
+    O limiar é adaptativo: o ruído de fundo é estimado pelo 10º percentil da energia
+    dos quadros e um quadro é considerado fala quando fica `margin_db` acima dele (e
+    acima de `min_level_db`). Pausas menores que `min_silence_ms` não quebram o trecho,
+    e cada trecho recebe `padding_ms` de margem para não cortar o início/fim das palavras.
+    """
+
+    frame_ms: int = 30
+    margin_db: float = 12.0
+    min_level_db: float = -50.0
+    min_speech_ms: int = 200
+    min_silence_ms: int = 600
+    padding_ms: int = 200
+
+
+DEFAULT_VAD_SETTINGS = VadSettings()
+
+
+def detect_speech_segments(
+    audio: np.ndarray,
+    sample_rate: int = WHISPER_SAMPLE_RATE,
+    settings: VadSettings = DEFAULT_VAD_SETTINGS,
+) -> list[tuple[int, int]]:
+    """
+    Encontra os trechos de fala pela energia de cada quadro.
+
+    Returns:
+        list[tuple[int, int]]: Pares (início, fim) em amostras
+    """
+    frame_ms = settings.frame_ms
+    frame_length = max(int(sample_rate * frame_ms / 1000), 1)
+    num_frames = audio.size // frame_length
+    if num_frames == 0:
+        return []
+
+    frames = audio[: num_frames * frame_length].reshape(num_frames, frame_length)
+    energy_db = 10.0 * np.log10(np.mean(np.square(frames, dtype=np.float64), axis=1) + 1e-10)
+    noise_floor_db, loud_db = np.percentile(energy_db, [10, 90])
+    if loud_db - noise_floor_db < settings.margin_db:
+        # Sinal estacionário (fala contínua ou só ruído): vale apenas o nível absoluto.
+        threshold_db = settings.min_level_db
+    else:
+        threshold_db = max(float(noise_floor_db) + settings.margin_db, settings.min_level_db)
+    is_speech = energy_db > threshold_db
+
+    # Início e fim de cada sequência de quadros de fala:
+    edges = np.diff(np.concatenate(([0], is_speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if starts.size == 0:
+        return []
+
+    # Une trechos separados por pausas curtas:
+    long_gap = (starts[1:] - ends[:-1]) * frame_ms >= settings.min_silence_ms
+    starts = np.concatenate((starts[:1], starts[1:][long_gap]))
+    ends = np.concatenate((ends[:-1][long_gap], ends[-1:]))
+
+    # Descarta ruídos curtos (cliques, respiração) e aplica a margem:
+    long_enough = (ends - starts) * frame_ms >= settings.min_speech_ms
+    padding = int(sample_rate * settings.padding_ms / 1000)
+    starts = np.maximum(starts[long_enough] * frame_length - padding, 0)
+    ends = np.minimum(ends[long_enough] * frame_length + padding, audio.size)
+    return list(zip(starts.tolist(), ends.tolist(), strict=True))
+
+
+def trim_silence(
+    audio: np.ndarray,
+    sample_rate: int = WHISPER_SAMPLE_RATE,
+    max_chunk_seconds: float = WHISPER_WINDOW_SECONDS,
+    join_gap_ms: int = 100,
+    settings: VadSettings = DEFAULT_VAD_SETTINGS,
+) -> VoiceActivityResult:
+    """
+    Remove o silêncio e agrupa a fala em blocos de até `max_chunk_seconds`.
+
+    Trechos consecutivos são concatenados com uma pequena pausa (`join_gap_ms`) para
+    que palavras de trechos diferentes não se colem. Agrupar até 30 s minimiza o número
+    de janelas que o Whisper precisa processar.
+    """
+    result = VoiceActivityResult(original_seconds=audio.size / sample_rate)
+    segments = detect_speech_segments(audio, sample_rate, settings)
+    if not segments:
+        return result
+
+    gap = np.zeros(int(sample_rate * join_gap_ms / 1000), dtype=np.float32)
+    max_chunk_samples = int(max_chunk_seconds * sample_rate)
+    current: list[np.ndarray] = []
+    current_samples = 0
+    for start, end in segments:
+        segment = audio[start:end]
+        if current and current_samples + gap.size + segment.size > max_chunk_samples:
+            result.chunks.append(np.concatenate(current))
+            current, current_samples = [], 0
+        if current:
+            current.append(gap)
+            current_samples += gap.size
+        current.append(segment)
+        current_samples += segment.size
+    result.chunks.append(np.concatenate(current))
+
+    result.speech_seconds = sum(end - start for start, end in segments) / sample_rate
+    return result
@@ -0,0 +1,198 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist: Dr. Eddy Giusepe Chirinos Isidro
+
+Script whisper_model_registry.py
+================================
+Registro de modelos Whisper compartilhado por todo o processo.
+
+Carregar um modelo Whisper lê de centenas de MB a alguns GB de pesos do disco,
+por isso o modelo não deve ser recarregado a cada resposta de voz. Este registro
+mantém os modelos já carregados em memória (compartilhados entre sessões e reruns
+do Streamlit), permite pré-carregar o modelo escolhido na barra lateral e remove
+os modelos usados menos recentemente (LRU) quando o orçamento de RAM é excedido.
+
+Configuração
+------------
+WHISPER_RAM_BUDGET_MB: orçamento de RAM para os pesos carregados (padrão: 4096)
+"""
+
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+# O whisper importa o torch (segundos de inicialização): só entra no primeiro carregamento.
+if TYPE_CHECKING:
+    import whisper  # https://pypi.org/project/openai-whisper/
+
+# Tamanho aproximado dos pesos (fp32) de cada modelo, em MB. É usado para liberar
+# espaço ANTES de carregar; depois do carregamento usamos o tamanho medido.
+ESTIMATED_MODEL_SIZE_MB = {
+    "tiny": 150,
+    "base": 290,
+    "small": 970,
+    "medium": 3060,
+    "large": 6170,
+    "turbo": 3240,
+}
+DEFAULT_RAM_BUDGET_MB = 4096
+
+
+@dataclass
+class _LoadedModel:
+    model: "whisper.Whisper"
+    memory_mb: float
+    load_seconds: float
+    hits: int = 0
+
+
+def _model_memory_mb(model: "whisper.Whisper") -> float:
+    """Mede a memória ocupada pelos parâmetros e buffers do modelo."""
+    tensors = [*model.parameters(), *model.buffers()]
+    return sum(t.numel() * t.element_size() for t in tensors) / (1024 * 1024)
+
+
+def _estimate_memory_mb(model_name: str) -> float:
+    # "large-v3" -> "large", "base.en" -> "base"
+    base_name = model_name.split(".", maxsplit=1)[0].split("-", maxsplit=1)[0]
+    return ESTIMATED_MODEL_SIZE_MB.get(base_name, ESTIMATED_MODEL_SIZE_MB["medium"])
+
+
+class WhisperModelRegistry:
+    """Cache LRU de modelos Whisper limitado por um orçamento de RAM (thread-safe)."""
+
+    def __init__(self, ram_budget_mb: float = DEFAULT_RAM_BUDGET_MB, device: str | None = None):
+        self.ram_budget_mb = ram_budget_mb
+        self.device = device
+        self._models: OrderedDict[str, _LoadedModel] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: dict[str, threading.Lock] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._total_load_seconds = 0.0
+
+    def get(self, model_name: str) -> "whisper.Whisper":
+        """Retorna o modelo pedido, carregando-o apenas se ainda não estiver em memória."""
+        model = self._lookup(model_name)
+        if model is not None:
+            return model
+
+        # Um lock por modelo: duas sessões pedindo o mesmo modelo carregam-no só uma vez,
+        # enquanto modelos diferentes podem ser carregados em paralelo.
+        with self._lock:
+            load_lock = self._load_locks.setdefault(model_name, threading.Lock())
+        with load_lock:
+            model = self._lookup(model_name)
+            if model is not None:
+                return model
+
+            with self._lock:
+                self._misses += 1
+                evicted = self._evict_to_fit(_estimate_memory_mb(model_name))
+            if evicted:
+                gc.collect()
+
+            import whisper  # noqa: PLC0415  (importa o torch: só no primeiro carregamento)
+
+            start = time.perf_counter()
+            model = whisper.load_model(model_name, device=self.device)
+            load_seconds = time.perf_counter() - start
+
+            with self._lock:
+                self._models[model_name] = _LoadedModel(model, _model_memory_mb(model), load_seconds)
+                self._total_load_seconds += load_seconds
+                # Reavalia com o tamanho medido, sem remover o modelo recém-carregado:
+                evicted = self._evict_to_fit(0.0)
+            if evicted:
+                gc.collect()
+            return model
+
+    def preload(self, model_name: str, background: bool = True) -> None:
+        """Pré-carrega um modelo (por padrão numa thread, sem bloquear a interface)."""
+        if self.is_loaded(model_name):
+            return
+        if not background:
+            self.get(model_name)
+            return
+        threading.Thread(target=self.get, args=(model_name,), name=f"whisper-preload-{model_name}", daemon=True).start()
+
+    def is_loaded(self, model_name: str) -> bool:
+        with self._lock:
+            return model_name in self._models
+
+    def evict(self, model_name: str) -> bool:
+        """Remove manualmente um modelo do registro. Retorna True se ele estava carregado."""
+        with self._lock:
+            removed = self._models.pop(model_name, None) is not None
+            if removed:
+                self._evictions += 1
+        if removed:
+            gc.collect()
+        return removed
+
+    def stats(self) -> dict:
+        """Estatísticas do registro: acertos, carregamentos, evicções e memória usada."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "total_load_seconds": round(self._total_load_seconds, 3),
+                "memory_mb": round(self._used_memory_mb(), 1),
+                "ram_budget_mb": self.ram_budget_mb,
+                "models": {
+                    name: {
+                        "memory_mb": round(entry.memory_mb, 1),
+                        "load_seconds": round(entry.load_seconds, 3),
+                        "hits": entry.hits,
+                    }
+                    for name, entry in self._models.items()
+                },
+            }
+
+    def _lookup(self, model_name: str) -> "whisper.Whisper | None":
+        with self._lock:
+            entry = self._models.get(model_name)
+            if entry is None:
+                return None
+            self._models.move_to_end(model_name)
+            entry.hits += 1
+            self._hits += 1
+            return entry.model
+
+    def _used_memory_mb(self) -> float:
+        return sum(entry.memory_mb for entry in self._models.values())
+
+    def _evict_to_fit(self, incoming_mb: float) -> bool:
+        """Remove modelos LRU até caber `incoming_mb`. Deve ser chamado com o lock adquirido.
+
+        O modelo usado mais recentemente nunca é removido quando `incoming_mb` é zero,
+        de modo que um modelo maior que o orçamento ainda pode ser usado sozinho.
+        """
+        keep = 0 if incoming_mb > 0 else 1
+        evicted = False
+        while len(self._models) > keep and self._used_memory_mb() + incoming_mb > self.ram_budget_mb:
+            self._models.popitem(last=False)
+            self._evictions += 1
+            evicted = True
+        return evicted
+
+
+_registry: WhisperModelRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> WhisperModelRegistry:
+    """Retorna o registro único do processo (compartilhado entre sessões do Streamlit)."""
+    global _registry  # noqa: PLW0603
+    with _registry_lock:
+        if _registry is None:
+            _registry = WhisperModelRegistry(
+                ram_budget_mb=float(os.getenv("WHISPER_RAM_BUDGET_MB", DEFAULT_RAM_BUDGET_MB)),
+            )
+        return _registry